@@ -1,19 +1,310 @@
+import hashlib
+import json
+import os
+import sys
+
+import numpy as np
 import pandas as pd
 from temperature_charts import TemperatureCharts
+from weather_cube import WeatherCube
+from weather_indexes import ConditionIndex, PrefixIndex, SortedRangeIndex
+from weather_statistics import compute_statistics
+from weather_recommendations import RecommendationEngine
+
+try:
+    import pyarrow  # noqa: F401 - pandas needs it for the Parquet cache
+    HAS_PYARROW = True
+except ImportError:
+    HAS_PYARROW = False
+
+# Low-cardinality text columns: stored once per distinct value, rows keep small integer codes
+CATEGORY_COLUMNS = ('country', 'city', 'location_name', 'region', 'timezone', 'condition_text',
+                    'wind_direction', 'moon_phase', 'sunrise', 'sunset', 'moonrise', 'moonset')
+DATETIME_COLUMNS = ('last_updated',)
+# Integer partitions derived from last_updated, so date filters are plain integer comparisons
+DATE_PART_COLUMNS = ('year', 'month')
+# Columns the interactive menu works with; other columns are loaded on first use
+MENU_COLUMNS = ('country', 'city', 'last_updated', 'year', 'month', 'temperature_celsius', 'humidity',
+                'wind_kph', 'pressure_mb', 'condition_text')
+DETAIL_COLUMNS = ('feels_like_celsius', 'visibility_km', 'uv_index', 'precip_mm', 'gust_kph',
+                  'moon_phase', 'moon_illumination')
+# Bump when the dtype rules change so existing caches are rebuilt
+CACHE_VERSION = 2
+
+def file_digest(path):
+    sha = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b''):
+            sha.update(chunk)
+    return sha.hexdigest()
+
+def read_typed_csv(csv_path, columns=None):
+    """
+    Read the weather CSV into a compact frame: categoricals for repeated text, float32 and
+    downcast integers for measurements, parsed datetimes.
+    Returns (frame, {column: estimated bytes with plain read_csv dtypes}).
+    """
+    header = pd.read_csv(csv_path, nrows=0).columns
+    usecols = [col for col in header if col in columns] if columns is not None else None
+    df = pd.read_csv(csv_path, usecols=usecols,
+                     dtype={col: 'category' for col in CATEGORY_COLUMNS if col in header})
+
+    plain_bytes = {}
+    for col in df.columns:
+        series = df[col]
+        if isinstance(series.dtype, pd.CategoricalDtype):
+            # As object strings every row holds a pointer plus its own str object
+            sizes = np.array([sys.getsizeof(value) for value in series.cat.categories], dtype=np.int64)
+            codes = series.cat.codes.to_numpy()
+            counts = np.bincount(codes[codes >= 0], minlength=len(sizes))
+            plain_bytes[col] = 8 * len(series) + int(sizes @ counts)
+        elif col in DATETIME_COLUMNS:
+            plain_bytes[col] = 8 * len(series) + int(series.str.len().sum()) + sys.getsizeof("") * int(series.notna().sum())
+            df[col] = pd.to_datetime(series, errors='coerce')
+            if col == 'last_updated':
+                # 0 marks rows whose timestamp could not be parsed
+                df['year'] = df[col].dt.year.fillna(0).astype(np.int16)
+                df['month'] = df[col].dt.month.fillna(0).astype(np.int8)
+                plain_bytes['year'] = plain_bytes['month'] = 0
+        elif pd.api.types.is_float_dtype(series.dtype):
+            plain_bytes[col] = int(series.memory_usage(index=False))
+            df[col] = series.astype(np.float32)
+        elif pd.api.types.is_integer_dtype(series.dtype):
+            plain_bytes[col] = int(series.memory_usage(index=False))
+            df[col] = pd.to_numeric(series, downcast='integer')
+        else:
+            plain_bytes[col] = int(series.memory_usage(index=False, deep=True))
+    return df, plain_bytes
+
+def load_weather_csv(csv_path, columns=None, cache_dir=None, use_cache=True):
+    """
+    Typed weather frame, served from a Parquet copy of the CSV when one is up to date.
+
+    The cache lives in <csv folder>/.weather_cache and is keyed by the CSV's size and mtime; when only
+    the mtime changed (touched or copied file) the content hash decides. Only `columns` are read
+    from the cache (None = all of them).
+    Returns (frame, estimated bytes the same columns take with plain read_csv dtypes).
+    """
+    if columns is not None and {'last_updated', *DATE_PART_COLUMNS} & set(columns):
+        # The date parts are derived from last_updated and always travel with it
+        columns = list(columns) + [col for col in ('last_updated', *DATE_PART_COLUMNS) if col not in columns]
+    if not (use_cache and HAS_PYARROW):
+        df, plain_bytes = read_typed_csv(csv_path, columns)
+        return df, sum(plain_bytes.values())
+
+    cache_dir = cache_dir or os.path.join(os.path.dirname(os.path.abspath(csv_path)), '.weather_cache')
+    stem = os.path.splitext(os.path.basename(csv_path))[0]
+    cache_path = os.path.join(cache_dir, f"{stem}.parquet")
+    meta_path = os.path.join(cache_dir, f"{stem}.json")
+    st = os.stat(csv_path)
+
+    meta = None
+    if os.path.exists(cache_path) and os.path.exists(meta_path):
+        with open(meta_path, 'r', encoding='utf-8') as f:
+            meta = json.load(f)
+        if meta.get('version') != CACHE_VERSION or meta['size'] != st.st_size:
+            meta = None
+        elif meta['mtime_ns'] != st.st_mtime_ns:
+            if meta['sha256'] == file_digest(csv_path):
+                meta['mtime_ns'] = st.st_mtime_ns
+                with open(meta_path, 'w', encoding='utf-8') as f:
+                    json.dump(meta, f, indent=2)
+            else:
+                meta = None
+
+    if meta is not None:
+        wanted = meta['columns'] if columns is None else [col for col in meta['columns'] if col in columns]
+        df = pd.read_parquet(cache_path, columns=wanted)
+        return df, sum(meta['plain_bytes'][col] for col in df.columns)
+
+    # Build the cache from the full CSV, then hand back the requested projection
+    df, plain_bytes = read_typed_csv(csv_path)
+    try:
+        os.makedirs(cache_dir, exist_ok=True)
+        df.to_parquet(cache_path + ".tmp", index=False)
+        os.replace(cache_path + ".tmp", cache_path)
+        with open(meta_path, 'w', encoding='utf-8') as f:
+            json.dump({'version': CACHE_VERSION, 'source': os.path.abspath(csv_path), 'size': st.st_size,
+                       'mtime_ns': st.st_mtime_ns, 'sha256': file_digest(csv_path),
+                       'columns': list(df.columns), 'plain_bytes': plain_bytes}, f, indent=2)
+    except OSError as e:
+        print(f"Warning: could not write cache to {cache_dir}: {e}")
+
+    if columns is not None:
+        df = df[[col for col in df.columns if col in columns]]
+    return df, sum(plain_bytes[col] for col in df.columns)
+
+def display_frame(frame):
+    """Copy of a slice for printing, with float32 columns widened back to the values written in the CSV"""
+    frame = frame.copy()
+    for col in frame.columns[frame.dtypes == np.float32]:
+        # float32 -> str gives the shortest round-trip text ("26.6", not "26.600000381469727")
+        frame[col] = frame[col].astype(str).astype(np.float64)
+    return frame
+
+def display_value(value):
+    """A single float32 value as written in the CSV (f-strings would show 54.599998474121094 for 54.6)"""
+    return float(str(value)) if isinstance(value, np.float32) else value
+
+def append_typed(df, rows):
+    """df with raw rows (CSV-like values) appended, keeping df's compact dtypes and date parts"""
+    columns = {}
+    for col in df.columns:
+        old = df[col]
+        raw = rows[col] if col in rows.columns else pd.Series([None] * len(rows), dtype=object)
+        if isinstance(old.dtype, pd.CategoricalDtype):
+            # Existing categories keep their codes, new values are added at the end
+            categories = old.cat.categories
+            values = pd.Index(raw.dropna().unique())
+            categories = categories.append(values[~values.isin(categories)].astype(categories.dtype))
+            codes = np.concatenate([old.cat.codes.to_numpy(), categories.get_indexer(raw)])
+            columns[col] = pd.Categorical.from_codes(codes, categories)
+        elif col in DATE_PART_COLUMNS and 'last_updated' in df.columns:
+            continue
+        elif pd.api.types.is_datetime64_any_dtype(old.dtype):
+            columns[col] = pd.concat([old, pd.to_datetime(raw, errors='coerce')], ignore_index=True)
+        elif pd.api.types.is_float_dtype(old.dtype):
+            columns[col] = pd.concat([old, pd.to_numeric(raw, errors='coerce').astype(old.dtype)], ignore_index=True)
+        elif pd.api.types.is_integer_dtype(old.dtype):
+            combined = pd.concat([old, pd.to_numeric(raw, errors='coerce')], ignore_index=True)
+            columns[col] = pd.to_numeric(combined, downcast='integer' if combined.notna().all() else 'float')
+        else:
+            columns[col] = pd.concat([old, raw], ignore_index=True)
+
+    result = pd.DataFrame(columns)
+    if 'last_updated' in df.columns:
+        for col in DATE_PART_COLUMNS:
+            if col in df.columns:
+                part = getattr(result['last_updated'].iloc[len(df):].dt, col).fillna(0).astype(df[col].dtype)
+                result[col] = pd.concat([df[col], part], ignore_index=True)
+    return result[list(df.columns)]
 
 class GlobalWeatherRepository:
     
-    def __init__(self, csv_path):
+    def __init__(self, csv_path, columns=None, use_cache=True):
         try:
-            self.df = pd.read_csv(csv_path)
+            self.csv_path = csv_path
+            self.use_cache = use_cache
+            self.df, plain_bytes = load_weather_csv(csv_path, columns, use_cache=use_cache)
             self.required_columns = []
             if not all(col in self.df.columns for col in self.required_columns):
                 raise ValueError(f"CSV missing required columns: {self.required_columns}")
-            self.countries = self.df['country'].unique()
+            self.countries = np.asarray(self.df['country'].unique())
+            self._data_version = 0
+            self._statistics = None
+            self._recommendations = None
+            # Raw rows added by append_rows; columns loaded later are filled in for them too
+            self._appended_rows = []
+            self._build_indexes()
+            typed_bytes = self.df.memory_usage(index=False, deep=True).sum()
+            self.memory_usage = {'plain': int(plain_bytes), 'typed': int(typed_bytes)}
+            print(f"Loaded {len(self.df):,} rows: {typed_bytes / 1e6:.1f} MB in memory "
+                  f"(~{plain_bytes / 1e6:.1f} MB with plain CSV types, {plain_bytes / max(typed_bytes, 1):.1f}x smaller)")
         except FileNotFoundError:
             print(f"Error: CSV file not found at {csv_path}")
             raise
     
+    @property
+    def cube(self):
+        """Country x year x month aggregates, built on first use and kept in step by append_rows"""
+        if self._cube is None:
+            self._cube = WeatherCube(self.df)
+        return self._cube
+
+    def statistics(self):
+        """Global extremes/averages/condition counts, recomputed only after the data changes"""
+        if self._statistics is None or self._statistics.data_version != self._data_version:
+            self._statistics = compute_statistics(self.df, self._data_version)
+        return self._statistics
+
+    def recommendations(self):
+        """Profile scoring over per-country monthly climatology, rebuilt only after the data changes"""
+        if self._recommendations is None or self._recommendations.data_version != self._data_version:
+            self._recommendations = RecommendationEngine(self.cube, self.df, self.conditions,
+                                                         data_version=self._data_version)
+        return self._recommendations
+
+    def print_recommendations(self, profile, title, note, k=10):
+        """Ranked table of the top-k countries for a profile, each with its best month"""
+        results = self.recommendations().recommend(profile, k)
+        print(f"\n- {title}:")
+        print("-" * 78)
+        if not results:
+            print("No destinations found with suitable weather in current data.")
+            return results
+        print(f"{'Rank':<5} {'Country':<20} {'Best month':<11} {'Temp(°C)':<9} {'Humidity(%)':<12} {'Wind(kph)':<10} {'Clear'}")
+        print("-" * 78)
+        for i, rec in enumerate(results, 1):
+            marker = '' if rec.ideal else ' *'
+            print(f"{i:<5} {rec.country:<20} {rec.month_name:<11} {rec.temperature:<9.1f} {rec.humidity:<12.0f} "
+                  f"{rec.wind:<10.1f} {rec.clear_share:.0%}{marker}")
+        if not all(rec.ideal for rec in results):
+            print("* closest match; monthly averages fall partly outside the ideal range")
+        print(f"\n- Recommendation: {note}")
+        return results
+
+    def append_rows(self, rows):
+        """Add new observations (a DataFrame with the CSV's columns) and refresh lookups and aggregates"""
+        start = len(self.df)
+        self.df = append_typed(self.df, rows)
+        self._appended_rows.append(rows)
+        self.countries = np.asarray(self.df['country'].unique())
+        cube = self._cube
+        self._build_indexes()
+        if cube is not None:
+            cube.append(self.df.iloc[start:])
+            self._cube = cube
+        self._data_version += 1
+
+    def _monthly_breakdown(self, data, country, column, unit):
+        """Per-month mean/min/max for the months in data, read from the cube"""
+        if not {'year', 'month'} <= set(data.columns) or column not in self.cube.measures:
+            return
+        months = data[['year', 'month']].drop_duplicates()
+        if len(months) < 2:
+            return
+        keys = [(country, year, month) for year, month in months.itertuples(index=False)]
+        cells = self.cube.table[self.cube.table.index.isin(keys)][column]
+        print("\nMonthly breakdown:")
+        for (_, year, month), cell in cells.iterrows():
+            print(f"   {year}-{month:02d}: avg {cell['mean']:.1f}{unit}, min {cell['min']:.1f}{unit}, "
+                  f"max {cell['max']:.1f}{unit} ({int(cell['count'])} readings)")
+
+    def _build_indexes(self):
+        """Per-country row positions and a case-insensitive name lookup; rebuild whenever self.df changes"""
+        self._cube = None
+        self._country_positions = self.df.groupby('country', observed=True, sort=False).indices
+        self._country_names = {str(name).lower(): name for name in self._country_positions}
+        self.country_prefix = PrefixIndex(self._country_positions)
+        self.city_prefix = PrefixIndex(self.df['city'].unique() if 'city' in self.df.columns else [])
+        self.ranges = SortedRangeIndex(self.df)
+        self.conditions = ConditionIndex(self.df['condition_text']) if 'condition_text' in self.df.columns else None
+
+    def find_country(self, name):
+        """Country name as spelled in the data, matched case-insensitively (None if unknown)"""
+        return self._country_names.get(name.strip().lower())
+
+    def _suggest(self, index, name):
+        suggestions = index.fuzzy(name)
+        if suggestions:
+            print(f"Did you mean: {', '.join(suggestions)}?")
+
+    def country_rows(self, country):
+        """All rows of one country (any capitalisation), taken by position instead of scanning self.df"""
+        country = self.find_country(country)
+        return self.df.iloc[self._country_positions[country] if country is not None else []]
+
+    def _ensure_columns(self, columns):
+        """Load columns left out by the startup projection (a no-op once they are in self.df)"""
+        missing = [col for col in columns if col not in self.df.columns]
+        if missing:
+            extra, _ = load_weather_csv(self.csv_path, missing, use_cache=self.use_cache)
+            if self._appended_rows:
+                # The CSV only has the original rows; take appended rows' values from what append_rows got
+                extra = append_typed(extra, pd.concat(self._appended_rows, ignore_index=True))
+            for col in extra.columns:
+                self.df[col] = extra[col].values
+
     def display_menu(self):
         print("\n\n\033[1mWelcome to the Global Weather Repository!\033[0m")
         print("=" * 43, "\n")
@@ -45,10 +336,11 @@ class GlobalWeatherRepository:
         print("=" * 34)
         
         letter = input("\nEnter a letter to search for countries: ").lower()
-        filtered_countries = [c for c in self.countries if c.lower().startswith(letter)]
+        filtered_countries = self.country_prefix.prefix(letter)
         
         if not filtered_countries:
             print("No countries found starting with that letter.")
+            self._suggest(self.country_prefix, letter)
         else:
             print(f"\nCountries starting with '{letter}':")
             print(*filtered_countries, sep='\n')
@@ -62,19 +354,20 @@ class GlobalWeatherRepository:
         
         if choose == "letters" or choose == "1":
             letter = input("\nEnter a letter to search for capitals: ").lower()
-            filtered_capitals = self.df['city'][self.df['city'].str.lower().str.startswith(letter)].drop_duplicates()
-            if filtered_capitals.empty:
+            filtered_capitals = self.city_prefix.prefix(letter)
+            if not filtered_capitals:
                 print("No capitals found starting with that letter.")
+                self._suggest(self.city_prefix, letter)
             else:
-                i = 0
                 print(f"\nCapitals starting with '{letter}':\n")
                 print(*filtered_capitals, sep='\n')
 
         elif choose == "country" or choose == "2":
             country = input("\nEnter the country name to search for its capital: ").lower()
-            capitals = self.df[self.df['country'].str.lower() == country]['city'].drop_duplicates()
+            capitals = self.country_rows(country)['city'].drop_duplicates()
             if capitals.empty:
                 print("No capitals found for that country.")
+                self._suggest(self.country_prefix, country)
             else:
                 print(f"\nCapital of '{country}' is: ", end="")
                 print(capitals.iloc[0])
@@ -88,13 +381,15 @@ class GlobalWeatherRepository:
         print("=" * 34)
                 
         # Display each entry
-        for date, temp in zip(data['last_updated'], data['temperature_celsius']):
+        shown = display_frame(data[['last_updated', 'temperature_celsius']])
+        for date, temp in zip(shown['last_updated'].dt.strftime('%Y-%m-%d %H:%M'), shown['temperature_celsius']):
             print(f"\nDate: {date}")
             print(f"The temperature was {temp}°C")
         
         # Calculate and display average
         avg = data['temperature_celsius'].astype(float).mean()
         print(f"\nAverage temperature in {country} in {label}: {avg:.2f}°C")
+        self._monthly_breakdown(data, country, 'temperature_celsius', '°C')
         
         # Ask user if they want to see charts
         if len(data) >= 2:
@@ -108,13 +403,14 @@ class GlobalWeatherRepository:
         print("=" * 34)
         
         # Display each entry
-        for date, humidity in zip(data['last_updated'], data['humidity']):
+        for date, humidity in zip(data['last_updated'].dt.strftime('%Y-%m-%d %H:%M'), data['humidity']):
             print(f"\nDate: {date}")
             print(f"The humidity was {humidity}%")
         
         # Calculate and display average
         avg = data['humidity'].astype(float).mean()
         print(f"\nAverage humidity in {country} in {label}: {avg:.2f}%")
+        self._monthly_breakdown(data, country, 'humidity', '%')
         
         # Ask user if they want to see charts
         if len(data) >= 2:
@@ -127,22 +423,27 @@ class GlobalWeatherRepository:
         print("\n\033[1mCompare Weather Between Countries\033[0m")
         print("=" * 34)
 
-        country1 = input("\nEnter first country name: ").strip().title()
-        if country1 not in self.countries:
-            print(f"Country '{country1}' not found. Please try again.")
+        name1 = input("\nEnter first country name: ").strip().title()
+        country1 = self.find_country(name1)
+        if country1 is None:
+            print(f"Country '{name1}' not found. Please try again.")
+            self._suggest(self.country_prefix, name1)
             return
         
-        country2 = input("Enter second country name: ").strip().title()
-        if country2 not in self.countries:
-            print(f"Country '{country2}' not found. Please try again.")
+        name2 = input("Enter second country name: ").strip().title()
+        country2 = self.find_country(name2)
+        if country2 is None:
+            print(f"Country '{name2}' not found. Please try again.")
+            self._suggest(self.country_prefix, name2)
             return
         
         if country1 == country2:
             print("Please select two different countries.")
             return
         
-        data1 = self.df[self.df['country'] == country1].iloc[0]
-        data2 = self.df[self.df['country'] == country2].iloc[0]
+        row1 = self.df.index[self._country_positions[country1][0]]
+        row2 = self.df.index[self._country_positions[country2][0]]
+        data1, data2 = (row for _, row in display_frame(self.df.loc[[row1, row2]]).iterrows())
         
         print(f"\n\033[1m{country1} vs {country2} - Weather Comparison\033[0m")
         print("=" * 34)
@@ -244,108 +545,76 @@ class GlobalWeatherRepository:
         # additional details?
         show_details = input("\nWould you like to see additional weather details? (y/n): ").lower().strip()
         if show_details in ['y', 'yes']:
-            self.detailed_comparison(data1, data2, country1, country2)
+            self._ensure_columns(DETAIL_COLUMNS)
+            self.detailed_comparison(*(row for _, row in display_frame(self.df.loc[[row1, row2]]).iterrows()),
+                                     country1, country2)
      
     # Choice 7: Weather statistics
     def weather_statistics(self):
         print("\n\033[1mGlobal Weather Statistics\033[0m")
         print("=" * 50)
         
+        stats = self.statistics()
+        metrics = stats.metrics
+        
         # Temperature Statistics
         print("\n  \033[1mTemperature Analytics\033[0m")
         print("-" * 30)
         
-        hottest_idx = self.df['temperature_celsius'].idxmax()
-        coldest_idx = self.df['temperature_celsius'].idxmin()
-        avg_temp = self.df['temperature_celsius'].mean()
-        
-        hottest_country = self.df.loc[hottest_idx, 'country']
-        hottest_temp = self.df.loc[hottest_idx, 'temperature_celsius']
-        coldest_country = self.df.loc[coldest_idx, 'country']
-        coldest_temp = self.df.loc[coldest_idx, 'temperature_celsius']
-        
-        print(f"- Hottest: {hottest_country} - {hottest_temp}°C")
-        print(f"- Coldest: {coldest_country} - {coldest_temp}°C")
-        print(f"- Global Average: {avg_temp:.1f}°C")
+        temp = metrics['temperature_celsius']
+        print(f"- Hottest: {temp.maximum.country} - {temp.maximum.value}°C")
+        print(f"- Coldest: {temp.minimum.country} - {temp.minimum.value}°C")
+        print(f"- Global Average: {temp.mean:.1f}°C")
         
         # Humidity Statistics
         print("\n \033[1mHumidity Analytics\033[0m")
         print("-" * 30)
         
-        most_humid_idx = self.df['humidity'].idxmax()
-        least_humid_idx = self.df['humidity'].idxmin()
-        avg_humidity = self.df['humidity'].mean()
-        
-        most_humid_country = self.df.loc[most_humid_idx, 'country']
-        most_humid_val = self.df.loc[most_humid_idx, 'humidity']
-        least_humid_country = self.df.loc[least_humid_idx, 'country']
-        least_humid_val = self.df.loc[least_humid_idx, 'humidity']
-        
-        print(f"- Most Humid: {most_humid_country} - {most_humid_val}%")
-        print(f"-  Least Humid: {least_humid_country} - {least_humid_val}%")
-        print(f"- Global Average: {avg_humidity:.1f}%")
+        humidity = metrics['humidity']
+        print(f"- Most Humid: {humidity.maximum.country} - {humidity.maximum.value}%")
+        print(f"-  Least Humid: {humidity.minimum.country} - {humidity.minimum.value}%")
+        print(f"- Global Average: {humidity.mean:.1f}%")
         
         # Wind Statistics
         print("\n  \033[1mWind Analytics\033[0m")
         print("-" * 30)
         
-        windiest_idx = self.df['wind_kph'].idxmax()
-        calmest_idx = self.df['wind_kph'].idxmin()
-        avg_wind = self.df['wind_kph'].mean()
-        
-        windiest_country = self.df.loc[windiest_idx, 'country']
-        windiest_speed = self.df.loc[windiest_idx, 'wind_kph']
-        calmest_country = self.df.loc[calmest_idx, 'country']
-        calmest_speed = self.df.loc[calmest_idx, 'wind_kph']
-        
-        print(f"-  Windiest: {windiest_country} - {windiest_speed} km/h")
-        print(f"- Calmest: {calmest_country} - {calmest_speed} km/h")
-        print(f"- Global Average: {avg_wind:.1f} km/h")
+        wind = metrics['wind_kph']
+        print(f"-  Windiest: {wind.maximum.country} - {wind.maximum.value} km/h")
+        print(f"- Calmest: {wind.minimum.country} - {wind.minimum.value} km/h")
+        print(f"- Global Average: {wind.mean:.1f} km/h")
         
         # Pressure Statistics
-        print("\n  \033[1mPressure Analytics\033[0m")
-        print("-" * 30)
-        
-        highest_pressure_idx = self.df['pressure_mb'].idxmax()
-        lowest_pressure_idx = self.df['pressure_mb'].idxmin()
-        avg_pressure = self.df['pressure_mb'].mean()
-        
-        highest_pressure_country = self.df.loc[highest_pressure_idx, 'country']
-        highest_pressure_val = self.df.loc[highest_pressure_idx, 'pressure_mb']
-        lowest_pressure_country = self.df.loc[lowest_pressure_idx, 'country']
-        lowest_pressure_val = self.df.loc[lowest_pressure_idx, 'pressure_mb']
-        
-        print(f"- Highest Pressure: {highest_pressure_country} - {highest_pressure_val} mb")
-        print(f"- Lowest Pressure: {lowest_pressure_country} - {lowest_pressure_val} mb")
-        print(f"- Global Average: {avg_pressure:.1f} mb")
+        if 'pressure_mb' in metrics:
+            print("\n  \033[1mPressure Analytics\033[0m")
+            print("-" * 30)
+            
+            pressure = metrics['pressure_mb']
+            print(f"- Highest Pressure: {pressure.maximum.country} - {pressure.maximum.value} mb")
+            print(f"- Lowest Pressure: {pressure.minimum.country} - {pressure.minimum.value} mb")
+            print(f"- Global Average: {pressure.mean:.1f} mb")
         
         # Weather Conditions Analysis
         print("\n  \033[1mWeather Conditions\033[0m")
         print("-" * 30)
         
-        condition_counts = self.df['condition_text'].value_counts()
         print("Most Common Weather Conditions:")
-        for i, (condition, count) in enumerate(condition_counts.head(5).items(), 1):
-            percentage = (count / len(self.df)) * 100
+        for i, (condition, count) in enumerate(stats.top_conditions, 1):
+            percentage = (count / stats.rows) * 100
             print(f"{i}. {condition}: {count} times ({percentage:.1f}%)")
         
         # Temperature Categories
         print("\n  \033[1mTemperature Categories\033[0m")
         print("-" * 30)
         
-        very_hot = len(self.df[self.df['temperature_celsius'] > 35])
-        hot = len(self.df[(self.df['temperature_celsius'] > 25) & (self.df['temperature_celsius'] <= 35)])
-        mild = len(self.df[(self.df['temperature_celsius'] > 15) & (self.df['temperature_celsius'] <= 25)])
-        cool = len(self.df[(self.df['temperature_celsius'] > 5) & (self.df['temperature_celsius'] <= 15)])
-        cold = len(self.df[self.df['temperature_celsius'] <= 5])
+        bands = stats.temperature_bands
+        total_countries = stats.rows
         
-        total_countries = len(self.df)
-        
-        print(f"- Very Hot (>35°C): {very_hot} times ({(very_hot/total_countries)*100:.1f}%)")
-        print(f"- Hot (25-35°C): {hot} times ({(hot/total_countries)*100:.1f}%)")
-        print(f"-  Mild (15-25°C): {mild} times ({(mild/total_countries)*100:.1f}%)")
-        print(f"-  Cool (5-15°C): {cool} times ({(cool/total_countries)*100:.1f}%)")
-        print(f"-  Cold (≤5°C): {cold} times ({(cold/total_countries)*100:.1f}%)")
+        print(f"- Very Hot (>35°C): {bands['very_hot']} times ({(bands['very_hot']/total_countries)*100:.1f}%)")
+        print(f"- Hot (25-35°C): {bands['hot']} times ({(bands['hot']/total_countries)*100:.1f}%)")
+        print(f"-  Mild (15-25°C): {bands['mild']} times ({(bands['mild']/total_countries)*100:.1f}%)")
+        print(f"-  Cool (5-15°C): {bands['cool']} times ({(bands['cool']/total_countries)*100:.1f}%)")
+        print(f"-  Cold (≤5°C): {bands['cold']} times ({(bands['cold']/total_countries)*100:.1f}%)")
         
         # Interactive Options
         print("\n\033[1mDetailed Analytics Options:\033[0m")
@@ -462,7 +731,7 @@ class GlobalWeatherRepository:
                 print(f"   {country1}: {value1}{unit}")
                 print(f"   {country2}: {value2}{unit}")
                 
-                if isinstance(value1, (int, float)) and isinstance(value2, (int, float)):
+                if pd.api.types.is_number(value1) and pd.api.types.is_number(value2):
                     diff = abs(value1 - value2)
                     print(f"   Difference: {diff:.1f}{unit}")
 
@@ -487,9 +756,11 @@ class GlobalWeatherRepository:
     
     def get_inputs(self):
         # Get country input
-        co = input("\nEnter the country name: ").strip().title()
-        if co not in self.countries:
+        name = input("\nEnter the country name: ")
+        co = self.find_country(name)
+        if co is None:
             print("Country not found. Please try again.")
+            self._suggest(self.country_prefix, name)
             return None, None, None
         
         # Get year input
@@ -511,14 +782,14 @@ class GlobalWeatherRepository:
         """Filter data and return processed results."""
         
         # Filter by country
-        rows = self.df[self.df['country'] == country]
+        rows = self.country_rows(country)
         
         # Filter by year
         if year_input == 'both':
-            filtered = rows[rows['last_updated'].str[:4].isin(['2024', '2025'])]
+            filtered = rows[rows['year'].isin([2024, 2025])]
             label = "2024 and 2025"
         else:
-            filtered = rows[rows['last_updated'].str[:4] == year_input]
+            filtered = rows[rows['year'] == int(year_input)]
             label = year_input
         
         # Check if data exists
@@ -527,7 +798,7 @@ class GlobalWeatherRepository:
         
         # Filter by month if specified
         if month_input != 'all':
-            filtered = filtered[filtered['last_updated'].str[5:7] == month_input.zfill(2)]
+            filtered = filtered[filtered['month'] == int(month_input)]
             label += f" in month {month_input}"
         
         return filtered, label    
@@ -538,7 +809,7 @@ class GlobalWeatherRepository:
         
         sorted_data = self.df.nlargest(10, column) if not ascending else self.df.nsmallest(10, column)
         
-        for i, (_, row) in enumerate(sorted_data.iterrows(), 1):
+        for i, (_, row) in enumerate(display_frame(sorted_data).iterrows(), 1):
             print(f"{i:2d}. {row['country']:<20} {row[column]}{unit}")
 
     def extreme_weather(self):
@@ -582,7 +853,7 @@ class GlobalWeatherRepository:
                 # Sort and get top results
                 top_results = data.nlargest(max_results, column) if not ascending else data.nsmallest(max_results, column)
                 
-                for i, (_, row) in enumerate(top_results.iterrows(), 1):
+                for i, (_, row) in enumerate(display_frame(top_results).iterrows(), 1):
                     print(f"{i:2d}. {row['country']:<20} {row[column]}{unit}")
                 
                 if len(data) > max_results:
@@ -600,8 +871,7 @@ class GlobalWeatherRepository:
                 print("Minimum temperature cannot be greater than maximum temperature.")
                 return
             
-            results = self.df[(self.df['temperature_celsius'] >= min_temp) & 
-                             (self.df['temperature_celsius'] <= max_temp)]
+            results = self.df.iloc[self.ranges.rows('temperature_celsius', min_temp, max_temp)]
             
             if results.empty:
                 print(f"No countries found with temperature between {min_temp}°C and {max_temp}°C")
@@ -611,7 +881,7 @@ class GlobalWeatherRepository:
             print(f"Showing top 15 results out of {len(results)} total matches:")
             print("-" * 50)
             
-            for _, row in results.head(15).iterrows():
+            for _, row in display_frame(results.head(15)).iterrows():
                 print(f"{row['country']:<20} {row['temperature_celsius']}°C - {row['condition_text']}")
             
             if len(results) > 15:
@@ -632,8 +902,7 @@ class GlobalWeatherRepository:
                 print("Minimum humidity cannot be greater than maximum humidity.")
                 return
             
-            results = self.df[(self.df['humidity'] >= min_humidity) & 
-                             (self.df['humidity'] <= max_humidity)]
+            results = self.df.iloc[self.ranges.rows('humidity', min_humidity, max_humidity)]
             
             if results.empty:
                 print(f"No countries found with humidity between {min_humidity}% and {max_humidity}%")
@@ -643,7 +912,7 @@ class GlobalWeatherRepository:
             print(f"Showing top 15 results out of {len(results)} total matches:")
             print("-" * 50)
             
-            for _, row in results.head(15).iterrows():
+            for _, row in display_frame(results.head(15)).iterrows():
                 print(f"{row['country']:<20} {row['humidity']}% - {row['condition_text']}")
             
             if len(results) > 15:
@@ -664,8 +933,7 @@ class GlobalWeatherRepository:
                 print("Minimum wind speed cannot be greater than maximum wind speed.")
                 return
             
-            results = self.df[(self.df['wind_kph'] >= min_wind) & 
-                             (self.df['wind_kph'] <= max_wind)]
+            results = self.df.iloc[self.ranges.rows('wind_kph', min_wind, max_wind)]
             
             if results.empty:
                 print(f"No countries found with wind speed between {min_wind} km/h and {max_wind} km/h")
@@ -675,7 +943,7 @@ class GlobalWeatherRepository:
             print(f"Showing top 15 results out of {len(results)} total matches:")
             print("-" * 50)
             
-            for _, row in results.head(15).iterrows():
+            for _, row in display_frame(results.head(15)).iterrows():
                 print(f"{row['country']:<20} {row['wind_kph']} km/h - {row['condition_text']}")
             
             if len(results) > 15:
@@ -694,7 +962,7 @@ class GlobalWeatherRepository:
             print("Please enter a valid condition.")
             return
         
-        results = self.df[self.df['condition_text'].str.contains(condition, case=False, na=False)]
+        results = self.df.iloc[self.conditions.rows(condition)]
         
         if results.empty:
             print(f"No countries found with weather condition containing '{condition}'")
@@ -704,7 +972,7 @@ class GlobalWeatherRepository:
         print(f"Showing top 15 results out of {len(results)} total matches:")
         print("-" * 50)
         
-        for _, row in results.head(15).iterrows():
+        for _, row in display_frame(results.head(15)).iterrows():
             print(f"{row['country']:<20} {row['condition_text']} - {row['temperature_celsius']}°C")
         
         if len(results) > 15:
@@ -738,23 +1006,21 @@ class GlobalWeatherRepository:
             if use_condition:
                 condition = input("Weather condition contains: ").strip()
             
-            # Apply filters
-            results = self.df.copy()
-            
+            # Apply filters, starting from the most selective range
+            ranges = {}
             if use_temp:
-                results = results[(results['temperature_celsius'] >= min_temp) & 
-                                (results['temperature_celsius'] <= max_temp)]
-            
+                ranges['temperature_celsius'] = (min_temp, max_temp)
             if use_humidity:
-                results = results[(results['humidity'] >= min_humidity) & 
-                                (results['humidity'] <= max_humidity)]
-            
+                ranges['humidity'] = (min_humidity, max_humidity)
             if use_wind:
-                results = results[(results['wind_kph'] >= min_wind) & 
-                                (results['wind_kph'] <= max_wind)]
+                ranges['wind_kph'] = (min_wind, max_wind)
+            positions = self.ranges.query(ranges) if ranges else None
             
-            if use_condition:
-                results = results[results['condition_text'].str.contains(condition, case=False, na=False)]
+            if use_condition and condition:
+                matches = self.conditions.rows(condition)
+                positions = matches if positions is None else np.intersect1d(positions, matches, assume_unique=True)
+            
+            results = self.df if positions is None else self.df.iloc[positions]
             
             if results.empty:
                 print("No countries found matching all criteria.")
@@ -766,7 +1032,7 @@ class GlobalWeatherRepository:
             print(f"{'Country':<20} {'Temp(°C)':<10} {'Humidity(%)':<12} {'Wind(km/h)':<12} {'Condition'}")
             print("-" * 70)
             
-            for _, row in results.head(15).iterrows():
+            for _, row in display_frame(results.head(15)).iterrows():
                 print(f"{row['country']:<20} {row['temperature_celsius']:<10} {row['humidity']:<12} {row['wind_kph']:<12} {row['condition_text']}")
             
             if len(results) > 15:
@@ -779,53 +1045,9 @@ class GlobalWeatherRepository:
         print("\n\033[1mBest Weather Destinations\033[0m")
         print("-" * 40)
         
-        # Define ideal weather criteria
-        ideal_temp_min, ideal_temp_max = 20, 28
-        ideal_humidity_min, ideal_humidity_max = 40, 70
-        ideal_wind_max = 25
-        
-        # Filter for ideal conditions
-        ideal_weather = self.df[
-            (self.df['temperature_celsius'] >= ideal_temp_min) &
-            (self.df['temperature_celsius'] <= ideal_temp_max) &
-            (self.df['humidity'] >= ideal_humidity_min) &
-            (self.df['humidity'] <= ideal_humidity_max) &
-            (self.df['wind_kph'] <= ideal_wind_max)
-        ]
-        
-        # Prefer clear/sunny conditions
-        clear_conditions = ['sunny', 'clear', 'partly cloudy', 'fair']
-        ideal_weather = ideal_weather[
-            ideal_weather['condition_text'].str.lower().str.contains('|'.join(clear_conditions), na=False)
-        ]
-        
-        if ideal_weather.empty:
-            print("No destinations found with ideal weather conditions.")
-            # Show best available alternatives
-            print("\nBest available alternatives:")
-            alternatives = self.df[
-                (self.df['temperature_celsius'] >= 15) &
-                (self.df['temperature_celsius'] <= 32) &
-                (self.df['humidity'] <= 80)
-            ].head(10)
-            
-            for _, row in alternatives.iterrows():
-                print(f"{row['country']:<20} {row['temperature_celsius']}°C, {row['humidity']}%, {row['condition_text']}")
-            return
-        
-        print(f"Top destinations with ideal weather conditions:")
-        print("-" * 50)
-        print(f"{'Rank':<5} {'Country':<20} {'Temp(°C)':<10} {'Humidity(%)':<12} {'Condition'}")
-        print("-" * 50)
-        
-        # Sort by temperature preference (closer to 24°C is better)
-        ideal_weather['temp_score'] = abs(ideal_weather['temperature_celsius'] - 24)
-        best_destinations = ideal_weather.nsmallest(10, 'temp_score')
-        
-        for i, (_, row) in enumerate(best_destinations.iterrows(), 1):
-            print(f"{i:<5} {row['country']:<20} {row['temperature_celsius']:<10} {row['humidity']:<12} {row['condition_text']}")
-        
-        print(f"\n- Recommendation: These destinations offer perfect weather for sightseeing and outdoor activities!")
+        # Ideal: 20-28°C, 40-70% humidity, wind up to 25 kph, mostly clear skies
+        self.print_recommendations('best_weather', "Top destinations with ideal weather conditions",
+                                   "These destinations offer perfect weather for sightseeing and outdoor activities!")
     
     def seasonal_recommendations(self):
         print("\n\033[1mSeasonal Travel Recommendations\033[0m")
@@ -836,51 +1058,16 @@ class GlobalWeatherRepository:
         print("2. Fall/Winter (Cool weather)")
         print("3. All-year destinations")
         
+        seasons = {
+            1: ('warm_season', "Best Warm Weather Destinations", "Perfect for beach and outdoor activities"),
+            2: ('cool_season', "Best Cool Weather Destinations", "Great for hiking and cultural exploration"),
+            3: ('all_year', "Best All-Year Destinations", "Comfortable weather year-round"),
+        }
         try:
             season_choice = int(input("\nEnter your choice (1-3): "))
             
-            if season_choice == 1:
-                # Warm weather destinations
-                warm_weather = self.df[
-                    (self.df['temperature_celsius'] >= 22) &
-                    (self.df['temperature_celsius'] <= 35) &
-                    (self.df['humidity'] <= 75)
-                ]
-                
-                print(f"\n- Best Warm Weather Destinations:")
-                print("-" * 40)
-                
-                for _, row in warm_weather.head(10).iterrows():
-                    print(f"{row['country']:<20} {row['temperature_celsius']}°C - Perfect for beach and outdoor activities")
-                    
-            elif season_choice == 2:
-                # Cool weather destinations
-                cool_weather = self.df[
-                    (self.df['temperature_celsius'] >= 5) &
-                    (self.df['temperature_celsius'] <= 20) &
-                    (self.df['wind_kph'] <= 30)
-                ]
-                
-                print(f"\n- Best Cool Weather Destinations:")
-                print("-" * 40)
-                
-                for _, row in cool_weather.head(10).iterrows():
-                    print(f"{row['country']:<20} {row['temperature_celsius']}°C - Great for hiking and cultural exploration")
-                    
-            elif season_choice == 3:
-                # All-year destinations (mild temperatures)
-                all_year = self.df[
-                    (self.df['temperature_celsius'] >= 18) &
-                    (self.df['temperature_celsius'] <= 26) &
-                    (self.df['humidity'] >= 45) &
-                    (self.df['humidity'] <= 65)
-                ]
-                
-                print(f"\n- Best All-Year Destinations:")
-                print("-" * 40)
-                
-                for _, row in all_year.head(10).iterrows():
-                    print(f"{row['country']:<20} {row['temperature_celsius']}°C - Comfortable weather year-round")
+            if season_choice in seasons:
+                self.print_recommendations(*seasons[season_choice])
             else:
                 print("Invalid choice.")
                 
@@ -898,82 +1085,18 @@ class GlobalWeatherRepository:
         print("4. Photography and sightseeing")
         print("5. Winter sports")
         
+        activities = {
+            1: ('beach', "Best Beach Destinations", "Perfect for beach activities"),
+            2: ('hiking', "Best Hiking Destinations", "Ideal for outdoor adventures"),
+            3: ('city', "Best City Exploration Destinations", "Comfortable for walking and sightseeing"),
+            4: ('photography', "Best Photography Destinations", "Great visibility for photography"),
+            5: ('winter_sports', "Best Winter Sports Destinations", "Perfect for winter activities"),
+        }
         try:
             activity_choice = int(input("\nEnter your choice (1-5): "))
             
-            if activity_choice == 1:
-                # Beach weather: warm, not too humid, low wind
-                beach_weather = self.df[
-                    (self.df['temperature_celsius'] >= 25) &
-                    (self.df['temperature_celsius'] <= 35) &
-                    (self.df['humidity'] <= 70) &
-                    (self.df['wind_kph'] <= 20)
-                ]
-                
-                print(f"\n- Best Beach Destinations:")
-                print("-" * 40)
-                
-                for _, row in beach_weather.head(8).iterrows():
-                    print(f"{row['country']:<20} {row['temperature_celsius']}°C, {row['wind_kph']} km/h wind - Perfect for beach activities")
-                    
-            elif activity_choice == 2:
-                # Hiking weather: mild temperature, low humidity, moderate wind
-                hiking_weather = self.df[
-                    (self.df['temperature_celsius'] >= 15) &
-                    (self.df['temperature_celsius'] <= 25) &
-                    (self.df['humidity'] <= 60) &
-                    (self.df['wind_kph'] <= 25)
-                ]
-                
-                print(f"\n- Best Hiking Destinations:")
-                print("-" * 40)
-                
-                for _, row in hiking_weather.head(8).iterrows():
-                    print(f"{row['country']:<20} {row['temperature_celsius']}°C, {row['humidity']}% humidity - Ideal for outdoor adventures")
-                    
-            elif activity_choice == 3:
-                # City exploration: comfortable temperature, any weather mostly
-                city_weather = self.df[
-                    (self.df['temperature_celsius'] >= 10) &
-                    (self.df['temperature_celsius'] <= 30) &
-                    (self.df['wind_kph'] <= 35)
-                ]
-                
-                print(f"\n- Best City Exploration Destinations:")
-                print("-" * 40)
-                
-                for _, row in city_weather.head(8).iterrows():
-                    print(f"{row['country']:<20} {row['temperature_celsius']}°C - Comfortable for walking and sightseeing")
-                    
-            elif activity_choice == 4:
-                # Photography: clear conditions preferred
-                clear_conditions = ['sunny', 'clear', 'partly cloudy']
-                photo_weather = self.df[
-                    (self.df['temperature_celsius'] >= 12) &
-                    (self.df['temperature_celsius'] <= 28) &
-                    (self.df['condition_text'].str.lower().str.contains('|'.join(clear_conditions), na=False))
-                ]
-                
-                print(f"\n- Best Photography Destinations:")
-                print("-" * 40)
-                
-                for _, row in photo_weather.head(8).iterrows():
-                    print(f"{row['country']:<20} {row['condition_text']} - Great visibility for photography")
-                    
-            elif activity_choice == 5:
-                # Winter sports: cold temperature
-                winter_weather = self.df[
-                    (self.df['temperature_celsius'] <= 5)
-                ]
-
-                print(f"\n- Best Winter Sports Destinations:")
-                print("-" * 40)
-                
-                if winter_weather.empty:
-                    print("No destinations found with suitable winter sports weather in current data.")
-                else:
-                    for _, row in winter_weather.head(8).iterrows():
-                        print(f"{row['country']:<20} {row['temperature_celsius']}°C - Perfect for winter activities")
+            if activity_choice in activities:
+                self.print_recommendations(*activities[activity_choice], k=8)
             else:
                 print("Invalid choice.")
                 
@@ -1005,13 +1128,13 @@ class GlobalWeatherRepository:
         if budget_destinations.empty:
             print("No budget-friendly destinations found in current weather data.")
             print("\nShowing all destinations with pleasant weather:")
-            for _, row in budget_weather.head(10).iterrows():
+            for _, row in display_frame(budget_weather.head(10)).iterrows():
                 print(f"{row['country']:<20} {row['temperature_celsius']}°C, {row['humidity']}% - {row['condition_text']}")
         else:
             print(f"{'Country':<20} {'Temperature':<12} {'Humidity':<12} {'Condition'}")
             print("-" * 60)
             
-            for _, row in budget_destinations.iterrows():
+            for _, row in display_frame(budget_destinations).iterrows():
                 print(f"{row['country']:<20} {row['temperature_celsius']}°C{'':<7} {row['humidity']}%{'':<7} {row['condition_text']}")
         
         print(f"\n- Tip: Consider visiting during shoulder seasons for better prices and pleasant weather!")
@@ -1072,7 +1195,7 @@ class GlobalWeatherRepository:
 
 def main():
     csv_path = r'D:\Programming\Codes\datasets\GlobalWeatherRepository.csv'
-    weather_repo = GlobalWeatherRepository(csv_path)
+    weather_repo = GlobalWeatherRepository(csv_path, columns=MENU_COLUMNS)
     weather_repo.run()
 
 
@@ -2,7 +2,9 @@ import pytest
 import pandas as pd
 from unittest.mock import patch, MagicMock
 import io
+import os
 import sys
+import Python.Other.GlobalWeather as global_weather
 from Python.Other.GlobalWeather import GlobalWeatherRepository
 
 class TestGlobalWeatherRepository:
@@ -78,6 +80,177 @@ class TestGlobalWeatherRepository:
         repo = GlobalWeatherRepository(str(csv_file))
         assert len(repo.df) == 1
 
+    def test_init_compact_dtypes(self, weather_repo):
+        """Test that text, measurement and date columns load with compact dtypes"""
+        df = weather_repo.df
+        for col in ['country', 'city', 'condition_text', 'wind_direction', 'moon_phase']:
+            assert isinstance(df[col].dtype, pd.CategoricalDtype)
+        assert df['temperature_celsius'].dtype == 'float32'
+        assert df['humidity'].dtype == 'int8'
+        assert df['wind_degree'].dtype == 'int16'
+        assert pd.api.types.is_datetime64_any_dtype(df['last_updated'])
+        assert weather_repo.memory_usage['typed'] < weather_repo.memory_usage['plain']
+
+    def test_float32_values_print_as_written(self, weather_repo, capsys):
+        """Test that float32 storage does not leak into printed values"""
+        with patch('builtins.input', side_effect=['y', '10', '30', 'n', 'n', 'n']):
+            weather_repo.multi_criteria()
+        captured = capsys.readouterr()
+        assert "26.6" in captured.out
+        assert "26.600000" not in captured.out
+
+    @patch('builtins.input', side_effect=['Afghanistan', 'Bangladesh', 'n'])
+    def test_compare_countries_prints_values_as_written(self, mock_input, weather_repo, capsys):
+        """Test that single float32 values are printed without float noise"""
+        weather_repo.compare_countries()
+        captured = capsys.readouterr()
+        assert "Afghanistan: 26.6°C" in captured.out
+        assert "Bangladesh: 6.8 km/h" in captured.out
+
+    def test_cache_is_reused(self, temp_csv_file):
+        """Test that a second load reads the Parquet cache instead of the CSV"""
+        GlobalWeatherRepository(temp_csv_file)
+        with patch.object(global_weather, 'read_typed_csv', side_effect=AssertionError("CSV re-parsed")):
+            repo = GlobalWeatherRepository(temp_csv_file)
+        assert len(repo.df) == 5
+        assert isinstance(repo.df['country'].dtype, pd.CategoricalDtype)
+        assert repo.df['temperature_celsius'].dtype == 'float32'
+
+    def test_cache_survives_touch(self, temp_csv_file):
+        """Test that a new mtime with unchanged content keeps the cache"""
+        GlobalWeatherRepository(temp_csv_file)
+        st = os.stat(temp_csv_file)
+        os.utime(temp_csv_file, ns=(st.st_atime_ns, st.st_mtime_ns + 10**9))
+        with patch.object(global_weather, 'read_typed_csv', side_effect=AssertionError("CSV re-parsed")):
+            GlobalWeatherRepository(temp_csv_file)
+
+    def test_cache_invalidated_on_change(self, temp_csv_file, sample_weather_data):
+        """Test that editing the CSV rebuilds the cache"""
+        GlobalWeatherRepository(temp_csv_file)
+        sample_weather_data.loc[0, 'temperature_celsius'] = 30.5
+        sample_weather_data.to_csv(temp_csv_file, index=False)
+        repo = GlobalWeatherRepository(temp_csv_file)
+        assert repo.df.loc[0, 'temperature_celsius'] == pytest.approx(30.5)
+
+    def test_column_projection(self, temp_csv_file):
+        """Test that only the requested columns load, and others load on demand"""
+        GlobalWeatherRepository(temp_csv_file)
+        repo = GlobalWeatherRepository(temp_csv_file, columns=['country', 'temperature_celsius'])
+        assert list(repo.df.columns) == ['country', 'temperature_celsius']
+        repo._ensure_columns(['uv_index', 'moon_phase'])
+        assert repo.df['uv_index'].tolist() == [7.0, 5.0, 5.0, 9.0, 1.0]
+        assert isinstance(repo.df['moon_phase'].dtype, pd.CategoricalDtype)
+
+    @patch('builtins.input', side_effect=['Albania', 'Atlantis', 'y'])
+    def test_detailed_comparison_after_append(self, mock_input, temp_csv_file, capsys):
+        """Test that detail columns load on demand after rows were appended"""
+        repo = GlobalWeatherRepository(temp_csv_file, columns=global_weather.MENU_COLUMNS)
+        repo.append_rows(pd.DataFrame({
+            'country': ['Atlantis'], 'city': ['Poseidonia'], 'last_updated': ['2024-06-01 12:00'],
+            'temperature_celsius': [17.5], 'condition_text': ['Light rain'], 'humidity': [85],
+            'wind_kph': [30.0], 'uv_index': [3.0]
+        }))
+        repo.compare_countries()
+        captured = capsys.readouterr()
+        assert "Detailed Weather Comparison" in captured.out
+        assert repo.df['uv_index'].tolist() == [7.0, 5.0, 5.0, 9.0, 1.0, 3.0]
+        assert pd.isna(repo.df['moon_phase'].iloc[-1])
+
+    def test_range_index_matches_masks(self, weather_repo):
+        """Test that range lookups return the same rows as boolean masks"""
+        df = weather_repo.df
+        rows = weather_repo.ranges.rows('temperature_celsius', 23.0, 26.6)
+        expected = df.index[(df['temperature_celsius'] >= 23.0) & (df['temperature_celsius'] <= 26.6)]
+        assert df.index[rows].tolist() == expected.tolist() == [0, 2, 4]
+        rows = weather_repo.ranges.query({'temperature_celsius': (20.0, 40.0), 'humidity': (25.0, 35.0)})
+        assert df['country'].iloc[rows].tolist() == ['Algeria', 'Bangladesh']
+
+    def test_multi_criteria_no_filters(self, weather_repo, capsys):
+        """Test multi-criteria search with every filter skipped"""
+        with patch('builtins.input', side_effect=['n', 'n', 'n', 'n']):
+            weather_repo.multi_criteria()
+        assert "Countries matching all criteria (5 found)" in capsys.readouterr().out
+
+    def test_condition_index(self, weather_repo):
+        """Test substring and multi-term condition lookups without string scans"""
+        conditions = weather_repo.conditions
+        df = weather_repo.df
+        assert df['country'].iloc[conditions.rows('CLOUD')].tolist() == ['Afghanistan', 'Albania', 'Bangladesh']
+        assert df['country'].iloc[conditions.rows('cloudy partly')].tolist() == ['Afghanistan', 'Albania', 'Bangladesh']
+        assert df['country'].iloc[conditions.rows('sun')].tolist() == ['Algeria']
+        assert len(conditions.rows('sunny fog')) == 0
+
+    @patch('builtins.input', side_effect=['y', '20', '30', 'n', 'n', 'y', 'partly'])
+    def test_multi_criteria_with_condition(self, mock_input, weather_repo, capsys):
+        """Test multi-criteria search combining a range and a condition"""
+        weather_repo.multi_criteria()
+        captured = capsys.readouterr()
+        assert "(1 found)" in captured.out
+        assert "Afghanistan" in captured.out
+
+    def test_cube_matches_groupby(self, weather_repo):
+        """Test that cube cells and rollups agree with aggregating the raw rows"""
+        cube = weather_repo.cube
+        temp = weather_repo.df['temperature_celsius'].astype(float)
+        assert len(cube.table) == 5
+        total = cube.total('temperature_celsius')
+        assert total['count'] == 5
+        assert total['mean'] == pytest.approx(temp.mean())
+        assert total['std'] == pytest.approx(temp.std())
+        assert total['max'] == pytest.approx(38.4)
+        assert cube.total('humidity', country='Albania')['mean'] == 94
+
+    def test_append_rows_refreshes_cube(self, weather_repo):
+        """Test that appended rows update the cube incrementally along with the lookups"""
+        weather_repo.cube
+        version = weather_repo._data_version
+        new_rows = pd.DataFrame({
+            'country': ['Albania', 'Atlantis'],
+            'city': ['Tirana', 'Poseidonia'],
+            'last_updated': ['2024-06-01 12:00', '2025-01-01 08:30'],
+            'temperature_celsius': [29.0, 17.5],
+            'condition_text': ['Sunny', 'Light rain'],
+            'humidity': [40, 85],
+            'wind_kph': [9.0, 30.0]
+        })
+        weather_repo.append_rows(new_rows)
+        assert weather_repo._data_version == version + 1
+        assert len(weather_repo.df) == 7
+        assert weather_repo.df['month'].tolist()[-2:] == [6, 1]
+        assert weather_repo.find_country('atlantis') == 'Atlantis'
+        assert weather_repo.country_prefix.prefix('at') == ['Atlantis']
+
+        cube = weather_repo.cube
+        assert len(cube.table) == 7
+        assert cube.total('temperature_celsius', country='Albania')['mean'] == pytest.approx(24.0)
+        assert cube.total('temperature_celsius')['count'] == 7
+        monthly = cube.rollup(('country', 'month'), country='Albania')
+        assert monthly['humidity']['mean'].tolist() == [94, 40]
+
+    def test_filtered_rollup_has_only_matching_cells(self, weather_repo):
+        """Test that a rollup filtered to one country has no empty cells for the other countries"""
+        weather_repo.append_rows(pd.DataFrame({
+            'country': ['Albania'], 'city': ['Tirana'], 'last_updated': ['2024-06-01 12:00'],
+            'temperature_celsius': [29.0], 'condition_text': ['Sunny'], 'humidity': [40], 'wind_kph': [9.0]
+        }))
+        monthly = weather_repo.cube.rollup(('country', 'month'), country='Albania')
+        assert list(monthly.index) == [('Albania', 5), ('Albania', 6)]
+        assert (monthly['humidity']['count'] > 0).all()
+
+    def test_report_monthly_breakdown(self, weather_repo, capsys):
+        """Test that a report spanning several months prints per-month figures from the cube"""
+        weather_repo.append_rows(pd.DataFrame({
+            'country': ['Brazil'], 'city': ['Brasilia'], 'last_updated': ['2024-07-02 10:00'],
+            'temperature_celsius': [18.5], 'condition_text': ['Sunny'], 'humidity': [60], 'wind_kph': [5.0]
+        }))
+        data, label = weather_repo.data_handling('Brazil', '2024', 'all')
+        with patch('builtins.input', return_value='n'):
+            weather_repo.temperature_report(data, 'Brazil', label)
+        captured = capsys.readouterr()
+        assert "Monthly breakdown:" in captured.out
+        assert "2024-05: avg 23.1°C" in captured.out
+        assert "2024-07: avg 18.5°C" in captured.out
+
     def test_display_menu(self, weather_repo, capsys):
         """Test menu display"""
         weather_repo.display_menu()
@@ -111,6 +284,27 @@ class TestGlobalWeatherRepository:
         captured = capsys.readouterr()
         assert "No countries found starting with that letter." in captured.out
 
+    @patch('builtins.input', return_value='al')
+    def test_search_letter_multi_char_prefix(self, mock_input, weather_repo, capsys):
+        """Test country search with a longer prefix"""
+        weather_repo.search_letter()
+        captured = capsys.readouterr()
+        assert "Albania" in captured.out and "Algeria" in captured.out
+        assert "Afghanistan" not in captured.out
+
+    def test_prefix_index_fuzzy(self, weather_repo):
+        """Test typo-tolerant suggestions for countries and cities"""
+        assert weather_repo.country_prefix.prefix('BA') == ['Bangladesh']
+        assert weather_repo.country_prefix.fuzzy('Brazl') == ['Brazil']
+        assert weather_repo.city_prefix.fuzzy('Tirna') == ['Tirana']
+        assert weather_repo.city_prefix.fuzzy('xyz') == []
+
+    @patch('builtins.input', side_effect=['Brasil', '2024', 'all'])
+    def test_get_inputs_suggests_country(self, mock_input, weather_repo, capsys):
+        """Test that an unknown country name gets a suggestion"""
+        assert weather_repo.get_inputs() == (None, None, None)
+        assert "Did you mean: Brazil?" in capsys.readouterr().out
+
     @patch('builtins.input', side_effect=['1', 'k'])
     def test_search_capitals_by_letter(self, mock_input, weather_repo, capsys):
         """Test search capitals by letter"""
@@ -157,6 +351,35 @@ class TestGlobalWeatherRepository:
         filtered_data, label = weather_repo.data_handling('NonExistent', '2024', 'all')
         assert filtered_data is None
 
+    def test_date_partitions(self, weather_repo):
+        """Test that last_updated is parsed once into integer year/month columns"""
+        df = weather_repo.df
+        assert df['year'].dtype == 'int16' and df['year'].tolist() == [2024] * 5
+        assert df['month'].dtype == 'int8' and df['month'].tolist() == [5] * 5
+        filtered_data, _ = weather_repo.data_handling('Brazil', 'both', '05')
+        assert len(filtered_data) == 1
+        filtered_data, _ = weather_repo.data_handling('Brazil', '2024', '6')
+        assert filtered_data.empty
+
+    def test_projection_keeps_date_partitions(self, temp_csv_file):
+        """Test that projecting last_updated also brings its year/month columns"""
+        repo = GlobalWeatherRepository(temp_csv_file, columns=['country', 'last_updated'])
+        assert {'year', 'month'} <= set(repo.df.columns)
+
+    def test_country_index(self, weather_repo):
+        """Test per-country lookups by position and case-insensitive names"""
+        assert weather_repo.find_country('  bangladesh ') == 'Bangladesh'
+        assert weather_repo.find_country('Atlantis') is None
+        rows = weather_repo.country_rows('BRAZIL')
+        assert rows['city'].tolist() == ['Brasilia']
+        assert weather_repo.country_rows('Atlantis').empty
+
+    @patch('builtins.input', side_effect=['bRaZiL', '2024', 'all'])
+    def test_get_inputs_any_case(self, mock_input, weather_repo):
+        """Test that get_inputs returns the country as spelled in the data"""
+        country, _, _ = weather_repo.get_inputs()
+        assert country == 'Brazil'
+
     def test_get_inputs_valid(self, weather_repo):
         """Test get_inputs with valid inputs"""
         with patch('builtins.input', side_effect=['Afghanistan', '2024', 'all']):
@@ -190,6 +413,7 @@ class TestGlobalWeatherRepository:
         captured = capsys.readouterr()
         assert "Temperature Report in: Afghanistan" in captured.out
         assert "26.6°C" in captured.out
+        assert "Date: 2024-05-16 13:15" in captured.out
         assert "Average temperature in Afghanistan" in captured.out
 
     def test_humidity_report(self, weather_repo, capsys):
@@ -246,6 +470,52 @@ class TestGlobalWeatherRepository:
         assert "Coldest:" in captured.out
         assert "Bangladesh" in captured.out  # Should be hottest at 38.4°C
 
+    def test_statistics_result(self, weather_repo):
+        """Test the structured statistics result"""
+        stats = weather_repo.statistics()
+        temp = stats.metrics['temperature_celsius']
+        assert (temp.maximum.country, temp.maximum.value) == ('Bangladesh', 38.4)
+        assert (temp.minimum.country, temp.minimum.value) == ('Albania', 19.0)
+        assert temp.mean == pytest.approx(26.02)
+        assert stats.metrics['humidity'].maximum.value == 98
+        assert stats.top_conditions[0] == ('Partly Cloudy', 2)
+        assert stats.temperature_bands == {'cold': 0, 'cool': 0, 'mild': 3, 'hot': 1, 'very_hot': 1}
+        assert stats.to_dict()['metrics']['wind_kph']['maximum']['country'] == 'Algeria'
+
+    def test_statistics_cached_until_data_changes(self, weather_repo):
+        """Test that statistics are reused until rows are appended"""
+        stats = weather_repo.statistics()
+        assert weather_repo.statistics() is stats
+        weather_repo.append_rows(pd.DataFrame({'country': ['Chad'], 'city': ["N'Djamena"],
+                                               'last_updated': ['2024-05-17 12:00'], 'temperature_celsius': [44.0],
+                                               'humidity': [10], 'wind_kph': [12.0], 'condition_text': ['Sunny']}))
+        fresh = weather_repo.statistics()
+        assert fresh is not stats
+        assert fresh.metrics['temperature_celsius'].maximum.country == 'Chad'
+        assert fresh.rows == 6
+
+    def test_recommendations_ranking(self, weather_repo):
+        """Test profile scoring over the per-country climatology"""
+        best = weather_repo.recommendations().recommend('best_weather', k=3)
+        assert [rec.country for rec in best] == ['Algeria', 'Afghanistan', 'Albania']
+        assert best[0].month == 5 and best[0].clear_share == 1.0
+        beach = weather_repo.recommendations().recommend('beach', k=1)[0]
+        assert beach.country == 'Afghanistan' and beach.ideal
+
+    def test_recommendations_one_entry_per_country(self, weather_repo):
+        """Test that top-k is deduplicated by country and rebuilt after new rows"""
+        engine = weather_repo.recommendations()
+        assert engine.recommend('city') is engine.recommend('city')
+        weather_repo.append_rows(pd.DataFrame({'country': ['Algeria'] * 2, 'city': ['Oran'] * 2,
+                                               'last_updated': ['2024-06-16 12:00'] * 2, 'temperature_celsius': [24.0] * 2,
+                                               'humidity': [55] * 2, 'wind_kph': [10.0] * 2, 'condition_text': ['Sunny'] * 2}))
+        fresh = weather_repo.recommendations()
+        assert fresh is not engine
+        results = fresh.recommend('best_weather', k=10)
+        assert len(results) == 5
+        assert len({rec.country for rec in results}) == 5
+        assert results[0].country == 'Algeria' and results[0].month == 6 and results[0].ideal
+
     def test_top_countries_hottest(self, weather_repo, capsys):
         """Test top countries functionality for hottest"""
         weather_repo.top_countries('temperature_celsius', 'Hottest', '°C', ascending=False)
@@ -22,6 +22,13 @@ class TemperatureCharts:
         plt.rcParams['axes.grid'] = True
         plt.rcParams['grid.alpha'] = 0.3
     
+    @staticmethod
+    def dates(data):
+        """The last_updated column as datetimes (the repository already loads it parsed)."""
+        if pd.api.types.is_datetime64_any_dtype(data['last_updated']):
+            return data['last_updated']
+        return pd.to_datetime(data['last_updated'])
+    
     @staticmethod
     def line_chart(data, country, label):
         """Create a line chart showing temperature trends over time."""
@@ -33,7 +40,7 @@ class TemperatureCharts:
         
         # Prepare data
         df = data.copy()
-        df['date'] = pd.to_datetime(df['last_updated'])
+        df['date'] = TemperatureCharts.dates(df)
         df['temp'] = df['temperature_celsius'].astype(float)
         df = df.sort_values('date')
         
@@ -79,7 +86,7 @@ class TemperatureCharts:
         
         # Prepare data
         df = data.copy()
-        df['date'] = pd.to_datetime(df['last_updated'])
+        df['date'] = TemperatureCharts.dates(df)
         df['temp'] = df['temperature_celsius'].astype(float)
         df = df.sort_values('date')
         
@@ -206,11 +213,12 @@ class TemperatureCharts:
         
         # Prepare data
         df = data.copy()
-        df['date'] = pd.to_datetime(df['last_updated'])
+        df['date'] = TemperatureCharts.dates(df)
         df['temp'] = df['temperature_celsius'].astype(float)
         
         # Create month-day combinations
-        df['month'] = df['date'].dt.month
+        if 'month' not in df.columns:
+            df['month'] = df['date'].dt.month
         df['day'] = df['date'].dt.day
         
         # Create pivot table for heatmap
@@ -0,0 +1,94 @@
+"""
+Pre-aggregated country x year x month statistics for GlobalWeatherRepository.
+"""
+
+import numpy as np
+import pandas as pd
+
+CUBE_KEYS = ('country', 'year', 'month')
+CUBE_MEASURES = ('temperature_celsius', 'humidity', 'wind_kph')
+# Stored per cell; mean and std are derived from them so cells can be merged and rolled up exactly
+ADDITIVE_STATS = ('count', 'sum', 'sumsq', 'min', 'max')
+
+class WeatherCube:
+    """
+    count/sum/sumsq/min/max (plus derived mean/std) per (country, year, month) cell, for every
+    measure, built in one groupby pass. New rows are merged into the affected cells only.
+    """
+
+    def __init__(self, frame, measures=CUBE_MEASURES):
+        self.measures = [m for m in measures if m in frame.columns]
+        self.table = self._finalize(self._aggregate(frame))
+
+    def _aggregate(self, frame):
+        work = pd.DataFrame({measure: frame[measure].astype(np.float64) for measure in self.measures}, index=frame.index)
+        squares = [f"{measure} squared" for measure in self.measures]
+        for measure, square in zip(self.measures, squares):
+            work[square] = work[measure] * work[measure]
+        grouped = work.groupby([frame[key] for key in CUBE_KEYS], observed=True, sort=True)
+
+        values = grouped[self.measures]
+        table = pd.concat({'count': values.count(), 'sum': values.sum(),
+                           'sumsq': grouped[squares].sum().set_axis(self.measures, axis=1),
+                           'min': values.min(), 'max': values.max()}, axis=1)
+        table.index.names = list(CUBE_KEYS)
+        return table.swaplevel(axis=1)
+
+    def _finalize(self, table):
+        """Add mean/std columns to a frame of additive stats"""
+        table = table[[(m, s) for m in self.measures for s in ADDITIVE_STATS]].copy()
+        for measure in self.measures:
+            count = table[(measure, 'count')]
+            total = table[(measure, 'sum')]
+            table[(measure, 'mean')] = total / count.where(count > 0)
+            # Sample variance (ddof=1, like Series.std); clip float noise below zero
+            var = (table[(measure, 'sumsq')] - total * total / count.where(count > 0)) / (count - 1).where(count > 1)
+            table[(measure, 'std')] = np.sqrt(var.clip(lower=0))
+        return table.sort_index(axis=1, level=0, sort_remaining=False)
+
+    def _combine(self, table, by):
+        """Merge cells that share the `by` keys (an empty `by` collapses everything into one row)"""
+        grouper = [table.index.get_level_values(key) for key in by] if by else np.zeros(len(table), dtype=int)
+        grouped = table.groupby(grouper, observed=True, sort=True)
+        combined = pd.concat([
+            grouped[[(m, s) for m in self.measures for s in ('count', 'sum', 'sumsq')]].sum(),
+            grouped[[(m, 'min') for m in self.measures]].min(),
+            grouped[[(m, 'max') for m in self.measures]].max()
+        ], axis=1)
+        if by:
+            combined.index.names = list(by)
+        return combined
+
+    def append(self, rows):
+        """Fold new rows into the cube; only the cells they touch are recomputed"""
+        if rows.empty:
+            return
+        delta = self._aggregate(rows)
+        additive = [(m, s) for m in self.measures for s in ADDITIVE_STATS]
+        touched = self.table.index.intersection(delta.index)
+        merged = self._combine(pd.concat([self.table.loc[touched, additive], delta.loc[touched]]), CUBE_KEYS)
+        fresh = delta.loc[delta.index.difference(self.table.index)]
+        updates = self._finalize(pd.concat([merged, fresh]))
+        self.table = pd.concat([self.table.drop(touched), updates]).sort_index()
+
+    def select(self, country=None, years=None, months=None):
+        """Cells for one country and/or a set of years/months"""
+        table = self.table
+        if country is not None:
+            table = table[table.index.get_level_values('country') == country]
+        if years is not None:
+            table = table[table.index.get_level_values('year').isin(list(years))]
+        if months is not None:
+            table = table[table.index.get_level_values('month').isin(list(months))]
+        return table
+
+    def rollup(self, by=('country',), country=None, years=None, months=None):
+        """Stats at a coarser grain, e.g. by=('country',) or by=('country', 'month'), or by=() for a grand total"""
+        return self._finalize(self._combine(self.select(country, years, months), tuple(by)))
+
+    def total(self, measure, country=None, years=None, months=None):
+        """{'count', 'sum', 'sumsq', 'min', 'max', 'mean', 'std'} over the selected cells"""
+        row = self.rollup((), country, years, months)
+        if row.empty:
+            return None
+        return row[measure].iloc[0].to_dict()
@@ -0,0 +1,144 @@
+"""
+Lookup structures GlobalWeatherRepository builds once at load time, so interactive
+searches don't scan the whole frame.
+"""
+
+import difflib
+import re
+from bisect import bisect_left
+
+import numpy as np
+import pandas as pd
+
+class PrefixIndex:
+    """Sorted unique names for bisect prefix lookups, with a difflib fallback for typos."""
+
+    def __init__(self, names):
+        spelling = {}
+        for name in names:
+            if isinstance(name, str):
+                spelling.setdefault(name.lower(), name)
+        self.keys = sorted(spelling)
+        self.names = [spelling[key] for key in self.keys]
+
+    def __len__(self):
+        return len(self.keys)
+
+    def prefix(self, prefix, limit=None):
+        """Names starting with prefix (case-insensitive), alphabetically"""
+        prefix = prefix.lower()
+        lo = bisect_left(self.keys, prefix)
+        hi = bisect_left(self.keys, prefix + chr(0x10FFFF), lo)
+        return self.names[lo:hi if limit is None else min(hi, lo + limit)]
+
+    def fuzzy(self, query, limit=5, cutoff=0.75):
+        """Closest names to a mistyped name or prefix"""
+        query = query.strip().lower()
+        if not query:
+            return []
+        # Compare against name beginnings of the same length, so "brazl" and "brzi" both find Brazil
+        heads = list(dict.fromkeys(key[:len(query)] for key in self.keys))
+        results = []
+        for head in difflib.get_close_matches(query, heads, n=limit, cutoff=cutoff):
+            results.extend(self.prefix(head, limit - len(results)))
+            if len(results) >= limit:
+                break
+        return results
+
+class SortedRangeIndex:
+    """
+    Per-column argsort permutations for range queries: a [lo, hi] range is two searchsorted calls
+    on the sorted values instead of a boolean mask over every row. Columns are sorted on first use.
+    """
+
+    def __init__(self, frame):
+        self.frame = frame
+        self._order = {}
+        self._sorted = {}
+
+    def _column(self, column):
+        if column not in self._order:
+            values = self.frame[column].to_numpy()
+            order = np.argsort(values, kind='stable')  # NaN sorts last, outside every range
+            self._order[column] = order
+            self._sorted[column] = values[order]
+        return self._order[column], self._sorted[column]
+
+    def _bounds(self, column, lo, hi):
+        order, values = self._column(column)
+        if values.dtype.kind == 'f':
+            # Compare in the column's precision, like a mask on the column would
+            lo, hi = values.dtype.type(lo), values.dtype.type(hi)
+        return order, np.searchsorted(values, lo, 'left'), np.searchsorted(values, hi, 'right')
+
+    def count(self, column, lo, hi):
+        _, start, stop = self._bounds(column, lo, hi)
+        return int(stop - start)
+
+    def rows(self, column, lo, hi):
+        """Row positions with lo <= value <= hi, in frame order"""
+        order, start, stop = self._bounds(column, lo, hi)
+        return np.sort(order[start:stop])
+
+    def query(self, ranges):
+        """
+        Row positions (in frame order) matching every {column: (lo, hi)} range.
+        Starts from the most selective range and checks the remaining ones on those candidates only.
+        """
+        if not ranges:
+            return np.arange(len(self.frame))
+        counts = {column: self.count(column, lo, hi) for column, (lo, hi) in ranges.items()}
+        first = min(counts, key=counts.get)
+        candidates = self.rows(first, *ranges[first])
+        for column, (lo, hi) in ranges.items():
+            if column == first or not len(candidates):
+                continue
+            values = self.frame[column].to_numpy()[candidates]
+            candidates = candidates[(values >= lo) & (values <= hi)]
+        return candidates
+
+def tokenize(text):
+    """Lowercase word tokens; punctuation, case and extra spaces don't matter"""
+    return re.findall(r"[a-z0-9]+", str(text).lower())
+
+class ConditionIndex:
+    """
+    Inverted index over a low-cardinality text column (condition_text).
+
+    Tokens map to the categorical codes whose text contains them, and each code maps to its rows
+    (one argsort, sliced by offsets), so a query only ever looks at the few dozen distinct texts.
+    """
+
+    def __init__(self, series):
+        if not isinstance(series.dtype, pd.CategoricalDtype):
+            series = series.astype('category')
+        self.labels = list(series.cat.categories)
+        codes = series.cat.codes.to_numpy()
+        counts = np.bincount(codes[codes >= 0], minlength=len(self.labels))
+        self._rows = np.argsort(codes, kind='stable')[len(codes) - int(counts.sum()):]  # Drop missing (-1) first
+        self._offsets = np.concatenate([[0], np.cumsum(counts)])
+
+        self.postings = {}
+        for code, label in enumerate(self.labels):
+            for token in tokenize(label):
+                self.postings.setdefault(token, set()).add(code)
+
+    def codes(self, query):
+        """Codes whose text contains every query term (each term may be part of a word)"""
+        matched = None
+        for term in tokenize(query):
+            term_codes = set()
+            for token, codes in self.postings.items():
+                if term in token:
+                    term_codes |= codes
+            matched = term_codes if matched is None else matched & term_codes
+            if not matched:
+                return []
+        return sorted(matched or [])
+
+    def rows(self, query):
+        """Row positions (in frame order) whose condition matches query"""
+        codes = self.codes(query)
+        if not codes:
+            return np.array([], dtype=np.intp)
+        return np.sort(np.concatenate([self._rows[self._offsets[code]:self._offsets[code + 1]] for code in codes]))
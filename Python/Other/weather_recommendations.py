@@ -0,0 +1,131 @@
+"""
+Travel recommendations scored over per-country monthly climatology.
+"""
+
+import calendar
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+
+FEATURES = ('temperature_celsius', 'humidity', 'wind_kph')
+# How far outside an ideal range counts as one penalty point, per feature
+FEATURE_SCALES = np.array([5.0, 15.0, 10.0])
+CLEAR_TERMS = ('sunny', 'clear', 'partly cloudy', 'fair')
+
+# name: ideal (lo, hi) per feature (None = no preference), bonus per unit of clear-sky share, and how
+# a country's months are combined: 'best' = its best month, 'mean' = good all year round
+PROFILES = {
+    'best_weather': {'temperature_celsius': (20, 28), 'humidity': (40, 70), 'wind_kph': (0, 25), 'clear': 1.0, 'months': 'best'},
+    'warm_season': {'temperature_celsius': (22, 35), 'humidity': (0, 75), 'clear': 0.5, 'months': 'best'},
+    'cool_season': {'temperature_celsius': (5, 20), 'wind_kph': (0, 30), 'clear': 0.5, 'months': 'best'},
+    'all_year': {'temperature_celsius': (18, 26), 'humidity': (45, 65), 'clear': 0.5, 'months': 'mean'},
+    'beach': {'temperature_celsius': (25, 35), 'humidity': (0, 70), 'wind_kph': (0, 20), 'clear': 1.0, 'months': 'best'},
+    'hiking': {'temperature_celsius': (15, 25), 'humidity': (0, 60), 'wind_kph': (0, 25), 'clear': 0.5, 'months': 'best'},
+    'city': {'temperature_celsius': (10, 30), 'wind_kph': (0, 35), 'clear': 0.25, 'months': 'best'},
+    'photography': {'temperature_celsius': (12, 28), 'clear': 2.0, 'months': 'best'},
+    'winter_sports': {'temperature_celsius': (-25, 5), 'clear': 0.25, 'months': 'best'},
+}
+
+@dataclass
+class Recommendation:
+    country: str
+    month: int  # best month (1-12)
+    score: float
+    temperature: float
+    humidity: float
+    wind: float
+    clear_share: float
+    ideal: bool  # every range satisfied in that month
+
+    @property
+    def month_name(self):
+        return calendar.month_name[self.month]
+
+class RecommendationEngine:
+    """
+    Per-country monthly climatology (mean temperature/humidity/wind and share of clear readings)
+    as a countries x 12 x features array. Every profile is scored for every country and month in one
+    broadcast, and top-k results are cached per profile.
+    """
+
+    def __init__(self, cube, df, conditions=None, profiles=PROFILES, data_version=0):
+        self.data_version = data_version
+        climate = cube.rollup(('country', 'month'))
+        months = climate.index.get_level_values('month').to_numpy().astype(int)
+        climate = climate[(months >= 1) & (months <= 12)]
+        country_codes, self.countries = pd.factorize(climate.index.get_level_values('country'), sort=True)
+        month_idx = climate.index.get_level_values('month').to_numpy().astype(int) - 1
+
+        self.features = np.full((len(self.countries), 12, len(FEATURES)), np.nan)
+        for f, measure in enumerate(FEATURES):
+            if measure in cube.measures:
+                self.features[country_codes, month_idx, f] = climate[(measure, 'mean')].to_numpy()
+
+        self.clear_share = np.zeros((len(self.countries), 12))
+        if conditions is not None and 'month' in df.columns:
+            clear_codes = sorted({code for term in CLEAR_TERMS for code in conditions.codes(term)})
+            is_clear = pd.Series(np.isin(df['condition_text'].cat.codes.to_numpy(), clear_codes), index=df.index)
+            share = is_clear.groupby([df['country'], df['month']], observed=True).mean().reindex(climate.index)
+            self.clear_share[country_codes, month_idx] = share.fillna(0).to_numpy()
+
+        self.profile_names = list(profiles)
+        lo = np.full((len(profiles), len(FEATURES)), -np.inf)
+        hi = np.full((len(profiles), len(FEATURES)), np.inf)
+        for p, spec in enumerate(profiles.values()):
+            for f, measure in enumerate(FEATURES):
+                if spec.get(measure) is not None:
+                    lo[p, f], hi[p, f] = spec[measure]
+        self._lo, self._hi = lo, hi
+        self._clear_weight = np.array([spec.get('clear', 0.0) for spec in profiles.values()])
+        self._use_mean = np.array([spec.get('months') == 'mean' for spec in profiles.values()])
+        self._scores = None
+        self._cache = {}
+
+    def scores(self):
+        """(profiles, countries, months) scores, computed once: 0 is ideal, minus one per scaled unit outside a range"""
+        if self._scores is None:
+            x = self.features[None]  # (1, C, 12, F)
+            lo, hi = self._lo[:, None, None, :], self._hi[:, None, None, :]  # (P, 1, 1, F)
+            outside = (np.maximum(lo - x, 0) + np.maximum(x - hi, 0)) / FEATURE_SCALES
+            # A feature with no data only matters if the profile has a range for it
+            outside = np.where(np.isnan(x) & np.isinf(lo) & np.isinf(hi), 0, outside)
+            self._penalty = outside.sum(axis=-1)  # NaN where a ranged feature has no data
+            self._scores = -self._penalty + self._clear_weight[:, None, None] * self.clear_share[None]
+        return self._scores
+
+    def recommend(self, profile, k=10):
+        """Top-k countries for a profile, one entry per country, best first"""
+        key = (profile, k)
+        if key in self._cache:
+            return self._cache[key]
+        p = self.profile_names.index(profile)
+        scores = self.scores()[p]  # (C, 12)
+        valid = ~np.isnan(scores)
+        masked = np.where(valid, scores, -np.inf)
+        best_month = masked.argmax(axis=1)
+        if self._use_mean[p]:
+            counts = valid.sum(axis=1)
+            country_scores = np.where(counts > 0, np.where(valid, scores, 0).sum(axis=1) / np.maximum(counts, 1), -np.inf)
+        else:
+            country_scores = masked.max(axis=1)
+
+        candidates = np.flatnonzero(np.isfinite(country_scores))
+        k = min(k, len(candidates))
+        if k == 0:
+            self._cache[key] = []
+            return []
+        top = candidates[np.argpartition(-country_scores[candidates], k - 1)[:k]]
+        top = top[np.argsort(-country_scores[top], kind='stable')]
+
+        results = []
+        for c in top:
+            m = best_month[c]
+            temperature, humidity, wind = self.features[c, m]
+            results.append(Recommendation(
+                country=self.countries[c], month=int(m) + 1, score=float(country_scores[c]),
+                temperature=float(temperature), humidity=float(humidity), wind=float(wind),
+                clear_share=float(self.clear_share[c, m]), ideal=bool(self._penalty[p, c, m] == 0)
+            ))
+        self._cache[key] = results
+        return results
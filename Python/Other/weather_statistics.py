@@ -0,0 +1,66 @@
+"""
+Global weather statistics computed in one aggregation pass and cached per data version.
+"""
+
+from dataclasses import asdict, dataclass, field
+
+import numpy as np
+
+STATISTIC_COLUMNS = ('temperature_celsius', 'humidity', 'wind_kph', 'pressure_mb')
+# Upper edges (inclusive) of the cold / cool / mild / hot bands; anything above the last is very hot
+TEMPERATURE_BANDS = (5, 15, 25, 35)
+TEMPERATURE_BAND_NAMES = ('cold', 'cool', 'mild', 'hot', 'very_hot')
+
+@dataclass
+class Extreme:
+    country: str
+    value: float
+
+@dataclass
+class MetricSummary:
+    maximum: Extreme
+    minimum: Extreme
+    mean: float
+
+@dataclass
+class WeatherStatistics:
+    rows: int
+    data_version: int
+    metrics: dict = field(default_factory=dict)  # column -> MetricSummary
+    top_conditions: list = field(default_factory=list)  # [(condition, count)], most common first
+    temperature_bands: dict = field(default_factory=dict)  # band name -> count
+
+    def to_dict(self):
+        return asdict(self)
+
+def _value(value):
+    # float32 -> the number as written in the CSV, NumPy ints -> int
+    return float(str(value)) if isinstance(value, np.float32) else value.item() if isinstance(value, np.generic) else value
+
+def compute_statistics(df, data_version=0, top=5):
+    """Extremes, averages, condition counts and temperature bands for the whole frame"""
+    columns = [col for col in STATISTIC_COLUMNS if col in df.columns]
+    summary = df[columns].agg(['idxmax', 'idxmin', 'mean']) if len(df) else None
+
+    stats = WeatherStatistics(rows=len(df), data_version=data_version)
+    for col in columns:
+        if summary is None or summary[col].isna().all():
+            continue
+        hi, lo = summary.loc['idxmax', col], summary.loc['idxmin', col]
+        stats.metrics[col] = MetricSummary(
+            maximum=Extreme(df.at[hi, 'country'], _value(df.at[hi, col])),
+            minimum=Extreme(df.at[lo, 'country'], _value(df.at[lo, col])),
+            mean=float(summary.loc['mean', col])
+        )
+
+    if 'condition_text' in df.columns:
+        stats.top_conditions = [(condition, int(count)) for condition, count
+                                in df['condition_text'].value_counts().head(top).items()]
+
+    if 'temperature_celsius' in df.columns:
+        temps = df['temperature_celsius'].to_numpy()
+        temps = temps[~np.isnan(temps)]
+        counts = np.bincount(np.searchsorted(TEMPERATURE_BANDS, temps, side='left'),
+                             minlength=len(TEMPERATURE_BAND_NAMES))
+        stats.temperature_bands = dict(zip(TEMPERATURE_BAND_NAMES, counts.tolist()))
+    return stats
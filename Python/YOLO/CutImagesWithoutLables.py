@@ -1,26 +1,15 @@
+import argparse
 import os
-import shutil
+import sys
 from pathlib import Path
 
-def get_file_stems(directory, extensions):
-    """Get file stems (names without extensions) from directory"""
-    stems = set()
-    if os.path.exists(directory):
-        for file_path in Path(directory).iterdir():
-            if file_path.suffix.lower() in extensions:
-                stems.add(file_path.stem)
-    return stems
+from YOLO_PLAN import apply_plan, default_plan_path, plan_restore, plan_unmatched_images, print_result
 
-def cut_unlabeled_images():
-    # Configuration
-    images_folder = r"D:\.IMLA\FacialExpression_yolov11\archive\train\happy\train\images"
-    labels_folder = r"D:\.IMLA\FacialExpression_yolov11\archive\train\happy\train\labels"
-    output_folder = r"D:\.IMLA\FacialExpression_yolov11\archive\train\happy\train\unlabeled_images"
-    
-    # Supported file extensions
-    image_extensions = {'.jpg', '.jpeg', '.png', '.bmp', '.tiff', '.webp'}
-    label_extensions = {'.txt'}
-    
+def cut_unlabeled_images(images_folder=r"D:\.IMLA\FacialExpression_yolov11\archive\train\happy\train\images",
+                         labels_folder=r"D:\.IMLA\FacialExpression_yolov11\archive\train\happy\train\labels",
+                         output_folder=r"D:\.IMLA\FacialExpression_yolov11\archive\train\happy\train\unlabeled_images",
+                         assume_yes=False, plan_file=None):
+    """Move images without labels; plan_file only writes the reviewable plan, assume_yes skips the prompt"""
     print("🔍 FINDING IMAGES WITHOUT LABELS")
     print("="*50)
     
@@ -33,42 +22,32 @@ def cut_unlabeled_images():
         print(f"❌ Labels folder not found: {labels_folder}")
         return
     
-    # Create output directory
-    os.makedirs(output_folder, exist_ok=True)
-    print(f"📁 Created output folder: {output_folder}")
-    
-    # Get all image and label file stems
+    # Scan images and labels together and plan the moves
     print(f"\n📸 Scanning images in: {images_folder}")
-    image_stems = get_file_stems(images_folder, image_extensions)
-    print(f"   Found {len(image_stems)} image files")
-    
-    print(f"\n🏷️  Scanning labels in: {labels_folder}")
-    label_stems = get_file_stems(labels_folder, label_extensions)
-    print(f"   Found {len(label_stems)} label files")
-    
-    # Find images without corresponding labels
-    unlabeled_stems = image_stems - label_stems
-    labeled_stems = image_stems & label_stems
+    print(f"🏷️  Scanning labels in: {labels_folder}")
+    plan, image_count, labeled_count = plan_unmatched_images(images_folder, labels_folder, output_folder)
+    print(f"   Found {image_count} images")
     
     print(f"\n📊 ANALYSIS RESULTS:")
-    print(f"   ✅ Images with labels: {len(labeled_stems)}")
-    print(f"   ❌ Images without labels: {len(unlabeled_stems)}")
-    print(f"   📈 Label coverage: {(len(labeled_stems)/len(image_stems)*100):.1f}%")
+    print(f"   ✅ Images with labels: {labeled_count}")
+    print(f"   ❌ Images without labels: {image_count - labeled_count}")
+    print(f"   📈 Label coverage: {(labeled_count/image_count*100) if image_count else 0:.1f}%")
     
-    if not unlabeled_stems:
+    if not len(plan):
         print(f"\n🎉 All images have corresponding labels! Nothing to cut.")
         return
     
     # Show which images will be moved
-    print(f"\n📋 IMAGES TO BE MOVED ({len(unlabeled_stems)}):")
-    for i, stem in enumerate(sorted(unlabeled_stems), 1):
-        print(f"   {i:3d}. {stem}")
-        if i == 10 and len(unlabeled_stems) > 10:
-            print(f"   ... and {len(unlabeled_stems) - 10} more")
-            break
+    print(f"\n📋 IMAGES TO BE MOVED ({len(plan)}):")
+    plan.print_preview()
+    
+    if plan_file:
+        print(f"\n💾 Plan written (not applied): {plan.write(plan_file)}")
+        print(f"   Apply it with: python YOLO_PLAN.py apply {plan_file}")
+        return
     
     # Confirm action
-    confirm = input(f"\n❓ Move {len(unlabeled_stems)} images to '{output_folder}'? (y/n): ").strip().lower()
+    confirm = 'y' if assume_yes else input(f"\n❓ Move {len(plan)} images to '{output_folder}'? (y/n): ").strip().lower()
     
     if confirm != 'y':
         print("🛑 Operation cancelled.")
@@ -76,55 +55,29 @@ def cut_unlabeled_images():
     
     # Move unlabeled images
     print(f"\n✂️  CUTTING UNLABELED IMAGES...")
-    moved_count = 0
-    failed_moves = []
-    
-    for stem in unlabeled_stems:
-        # Find the actual image file (could have different extensions)
-        source_file = None
-        for ext in image_extensions:
-            potential_path = os.path.join(images_folder, f"{stem}{ext}")
-            if os.path.exists(potential_path):
-                source_file = potential_path
-                break
-        
-        if source_file:
-            try:
-                # Determine destination path
-                file_ext = Path(source_file).suffix
-                dest_file = os.path.join(output_folder, f"{stem}{file_ext}")
-                
-                # Move file (cut)
-                shutil.move(source_file, dest_file)
-                moved_count += 1
-                print(f"   ✂️  Moved: {stem}{file_ext}")
-                
-            except Exception as e:
-                failed_moves.append((stem, str(e)))
-                print(f"   ❌ Failed to move {stem}: {e}")
-        else:
-            failed_moves.append((stem, "File not found"))
-            print(f"   ⚠️  File not found: {stem}")
+    plan_path = plan.write(default_plan_path(plan, output_folder))
+    print(f"   💾 Plan and journal: {plan_path}")
+    result = apply_plan(plan, plan_path)
+    moved_count = result['done']
     
     # Final report
     print(f"\n" + "="*50)
     print(f"📊 FINAL REPORT")
     print(f"="*50)
-    print(f"✅ Successfully moved: {moved_count}/{len(unlabeled_stems)} images")
+    print(f"✅ Successfully moved: {moved_count}/{len(plan)} images")
     print(f"📁 Moved to: {output_folder}")
     
-    if failed_moves:
-        print(f"\n❌ FAILED MOVES ({len(failed_moves)}):")
-        for stem, error in failed_moves:
-            print(f"   - {stem}: {error}")
+    if result['failed']:
+        print(f"\n❌ FAILED MOVES ({result['failed']}):")
+        print_result(result, plan_path)
     
     # Show updated statistics
-    remaining_images = len(image_stems) - moved_count
+    remaining_images = image_count - moved_count
     if remaining_images > 0:
-        coverage = (len(labeled_stems) / remaining_images) * 100
+        coverage = (labeled_count / remaining_images) * 100
         print(f"\n📈 UPDATED STATISTICS:")
         print(f"   Images remaining in source: {remaining_images}")
-        print(f"   Images with labels: {len(labeled_stems)}")
+        print(f"   Images with labels: {labeled_count}")
         print(f"   Label coverage: {coverage:.1f}%")
     
     print(f"\n🎯 Operation completed!")
@@ -138,7 +91,7 @@ def restore_unlabeled_images():
         print(f"❌ Unlabeled images folder not found: {output_folder}")
         return
     
-    unlabeled_files = list(Path(output_folder).iterdir())
+    unlabeled_files = [p for p in Path(output_folder).iterdir() if p.is_file()]
     if not unlabeled_files:
         print(f"📁 No files to restore in: {output_folder}")
         return
@@ -152,19 +105,24 @@ def restore_unlabeled_images():
         print("🛑 Restore cancelled.")
         return
     
-    restored_count = 0
-    for file_path in unlabeled_files:
-        try:
-            dest_path = os.path.join(images_folder, file_path.name)
-            shutil.move(str(file_path), dest_path)
-            restored_count += 1
-            print(f"   🔄 Restored: {file_path.name}")
-        except Exception as e:
-            print(f"   ❌ Failed to restore {file_path.name}: {e}")
-    
-    print(f"\n✅ Restored {restored_count}/{len(unlabeled_files)} files")
+    plan = plan_restore(output_folder, images_folder)
+    plan_path = plan.write(default_plan_path(plan, output_folder))
+    result = apply_plan(plan, plan_path)
+    if result['failed']:
+        print_result(result, plan_path)
+    
+    print(f"\n✅ Restored {result['done']}/{len(unlabeled_files)} files")
 
 if __name__ == "__main__":
+    # Non-interactive use (nightly jobs): --yes applies directly, --plan FILE only writes the plan
+    parser = argparse.ArgumentParser(description="Move images without labels out of the dataset")
+    parser.add_argument('--yes', action='store_true', help="Cut without prompting")
+    parser.add_argument('--plan', metavar='FILE', help="Only write the plan to FILE (apply it with YOLO_PLAN.py apply)")
+    args = parser.parse_args()
+    if args.yes or args.plan:
+        cut_unlabeled_images(assume_yes=True, plan_file=args.plan)
+        sys.exit(0)
+    
     print("📂 IMAGE-LABEL MATCHING TOOL")
     print("="*50)
     print("1. Cut unlabeled images")
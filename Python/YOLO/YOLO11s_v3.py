@@ -1,15 +1,22 @@
-from ultralytics import YOLO
 import os
 import time
 import cv2
 import torch
-import shutil
+import json
+import queue
+import threading
 from pathlib import Path
 from concurrent.futures import ThreadPoolExecutor, as_completed
 import numpy as np
+from PIL import Image
+from torchvision.ops import batched_nms
+from YOLO_SHARDS import ShardReader
+from YOLO_MODEL_POOL import get_model, get_pool
+from YOLO_PLAN import apply_plan, default_plan_path, plan_unmatched_images, print_result
+from YOLO_ACTIVE import ActiveLearningSelector
 
 class OptimizedYOLOProcessor:
-    def __init__(self, model_path, class_id=2, device='auto', batch_size=32):
+    def __init__(self, model_path, class_id=2, device='auto', batch_size=32, variant=None):
         self.class_id = class_id
         self.batch_size = batch_size
         
@@ -24,18 +31,12 @@ class OptimizedYOLOProcessor:
         else:
             self.device = device
         
-        # Load and optimize model
-        self.model = YOLO(model_path)
-        self.model.to(self.device)
+        # Optionally swap the checkpoint for a cached exported variant (e.g. 'torchscript', 'engine')
+        if variant and Path(model_path).suffix == '.pt':
+            model_path = get_pool().variant(model_path, variant, half=self.device == 'cuda', device=self.device)
         
-        if hasattr(self.model.model, 'half') and self.device == 'cuda':
-            self.model.model.half()
-            print("⚡ FP16 enabled")
-        
-        # Warm up
-        print("🔥 Warming up...")
-        dummy = np.random.randint(0, 255, (640, 640, 3), dtype=np.uint8)
-        self.model.predict(dummy, verbose=False, save=False)
+        # Loaded, moved to the device, FP16-converted and warmed up once per process (see YOLO_MODEL_POOL)
+        self.model = get_model(model_path, self.device, half=True)
     
     def process_batch(self, image_paths, conf=0.4):
         """Process batch of images"""
@@ -44,32 +45,290 @@ class OptimizedYOLOProcessor:
             device=self.device, batch=min(self.batch_size, len(image_paths))
         )
     
-    def save_labels_parallel(self, results, label_dir):
-        """Save labels using threading"""
-        def save_label(result):
-            name = Path(result.path).stem
+    def save_labels_parallel(self, results, label_dir, names=None, min_conf=None):
+        """
+        Save labels using threading (pass names when predicting on in-memory arrays).
+        min_conf keeps only boxes at or above it, so one low-threshold prediction can serve several thresholds.
+        """
+        def save_label(item):
+            result, name = item
+            name = Path(name or result.path).stem
             label_path = os.path.join(label_dir, f"{name}.txt")
             
-            if len(result.boxes) > 0:
+            boxes = result.boxes.xywhn
+            if min_conf is not None and len(boxes) > 0:
+                boxes = boxes[result.boxes.conf >= min_conf]
+            if len(boxes) > 0:
                 with open(label_path, "w") as f:
-                    for box in result.boxes:
-                        x, y, w, h = box.xywh[0].tolist()
+                    for x, y, w, h in boxes.tolist():
                         f.write(f"{self.class_id} {x:.6f} {y:.6f} {w:.6f} {h:.6f}\n")
                 return name, True
             return name, False
         
         with ThreadPoolExecutor(max_workers=8) as executor:
-            results_data = list(executor.map(save_label, results))
+            results_data = list(executor.map(save_label, zip(results, names or [None] * len(results))))
         
         success = [name for name, ok in results_data if ok]
         failed = [name for name, ok in results_data if not ok]
         return len(success), failed
+    
+    def process_shard(self, reader, label_dir, split=None, conf=0.4, skip_labeled=True):
+        """
+        Label images straight from packed shards (see YOLO_SHARDS).
+        
+        Images are read sequentially from the memory-mapped shards and decoded on a thread pool,
+        so there is no per-image file open. Returns (success count, failed names).
+        """
+        os.makedirs(label_dir, exist_ok=True)
+        total_success, failed = 0, []
+        
+        def batches():
+            batch = []
+            for name, image, label in reader.iter_split(split, decode=True):
+                if (skip_labeled and label is not None) or image is None:
+                    continue
+                batch.append((name, image))
+                if len(batch) == self.batch_size:
+                    yield batch
+                    batch = []
+            if batch:
+                yield batch
+        
+        for batch in batches():
+            names = [name for name, _ in batch]
+            results = self.model.predict(
+                source=[image for _, image in batch], conf=conf, save=False, verbose=False,
+                device=self.device, batch=len(batch)
+            )
+            success_count, batch_failed = self.save_labels_parallel(results, label_dir, names)
+            total_success += success_count
+            failed.extend(batch_failed)
+        
+        return total_success, failed
+    
+    def process_tiled(self, image_paths, conf=0.4, tile_size=640, overlap=0.2, iou_threshold=0.5):
+        """
+        Tiled inference for high-resolution images.
+        
+        Each image is split into overlapping tiles in memory (plus one full-image pass for large
+        objects); tiles from all images are batched together, and the detections are shifted back
+        and merged with NMS. Returns {path: (normalized xywh boxes, scores)}.
+        """
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            images = dict(zip(image_paths, executor.map(cv2.imread, image_paths)))
+        
+        # (path, x offset, y offset, array) - tiles are views into the decoded image, not copies
+        jobs = []
+        for path, img in images.items():
+            if img is None:
+                continue
+            jobs.append((path, 0, 0, img))
+            for x0, y0, tile in iter_tiles(img, tile_size, overlap):
+                jobs.append((path, x0, y0, tile))
+        
+        detections = {path: [] for path, img in images.items() if img is not None}
+        for batch in chunk_list(jobs, self.batch_size):
+            results = self.model.predict(
+                source=[job[3] for job in batch], conf=conf, save=False, verbose=False,
+                device=self.device, batch=len(batch)
+            )
+            for (path, x0, y0, _), result in zip(batch, results):
+                if len(result.boxes) > 0:
+                    xyxy = result.boxes.xyxy.cpu() + torch.tensor([x0, y0, x0, y0], dtype=torch.float32)
+                    detections[path].append((xyxy, result.boxes.conf.cpu(), result.boxes.cls.cpu()))
+        
+        merged = {}
+        for path, parts in detections.items():
+            if not parts:
+                merged[path] = (np.zeros((0, 4), dtype=np.float32), np.zeros(0, dtype=np.float32))
+                continue
+            
+            xyxy = torch.cat([p[0] for p in parts])
+            scores = torch.cat([p[1] for p in parts])
+            classes = torch.cat([p[2] for p in parts])
+            keep = batched_nms(xyxy, scores, classes, iou_threshold)
+            xyxy, scores = xyxy[keep].numpy(), scores[keep].numpy()
+            
+            h, w = images[path].shape[:2]
+            xywhn = np.stack([
+                (xyxy[:, 0] + xyxy[:, 2]) / 2 / w,
+                (xyxy[:, 1] + xyxy[:, 3]) / 2 / h,
+                (xyxy[:, 2] - xyxy[:, 0]) / w,
+                (xyxy[:, 3] - xyxy[:, 1]) / h
+            ], axis=1).clip(0, 1)
+            merged[path] = (xywhn, scores)
+        
+        return merged
+    
+    def save_tiled_labels(self, merged, label_dir):
+        """Save merged tiled detections, same contract as save_labels_parallel"""
+        def save_label(item):
+            path, (boxes, _) = item
+            name = Path(path).stem
+            if len(boxes) == 0:
+                return name, False
+            with open(os.path.join(label_dir, f"{name}.txt"), "w") as f:
+                for x, y, w, h in boxes:
+                    f.write(f"{self.class_id} {x:.6f} {y:.6f} {w:.6f} {h:.6f}\n")
+            return name, True
+        
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            results_data = list(executor.map(save_label, merged.items()))
+        
+        success = [name for name, ok in results_data if ok]
+        failed = [name for name, ok in results_data if not ok]
+        return len(success), failed
+    
+    def process_video(self, video_path, image_dir, label_dir, conf=0.4, stride=5, scene_threshold=None,
+                      diff_threshold=2.0, reuse_threshold=6.0):
+        """Label sampled video frames directly from the stream - only kept frames are written to disk"""
+        video_path = Path(video_path)
+        os.makedirs(image_dir, exist_ok=True)
+        os.makedirs(label_dir, exist_ok=True)
+        
+        stats = {'sampled': 0, 'labeled': 0, 'reused': 0, 'failed': 0}
+        last_labeled = None  # (thumbnail, normalized boxes) of the last frame that got labels
+        
+        def write_frame(name, frame, boxes):
+            cv2.imwrite(os.path.join(image_dir, f"{name}.jpg"), frame)
+            with open(os.path.join(label_dir, f"{name}.txt"), "w") as f:
+                for x, y, w, h in boxes:
+                    f.write(f"{self.class_id} {x:.6f} {y:.6f} {w:.6f} {h:.6f}\n")
+        
+        print(f"🎬 {video_path.name}: stride={stride}, scene_threshold={scene_threshold}")
+        
+        with ThreadPoolExecutor(max_workers=8) as writer:
+            frames = iter_video_frames(video_path, stride, scene_threshold, diff_threshold)
+            
+            while True:
+                batch = [item for _, item in zip(range(self.batch_size), frames)]
+                if not batch:
+                    break
+                
+                results = self.model.predict(
+                    source=[item[1] for item in batch], conf=conf, save=False, verbose=False,
+                    device=self.device, batch=len(batch)
+                )
+                
+                for (frame_idx, frame, thumb), result in zip(batch, results):
+                    stats['sampled'] += 1
+                    name = f"{video_path.stem}_{frame_idx:06d}"
+                    
+                    if len(result.boxes) > 0:
+                        boxes = result.boxes.xywhn.cpu().numpy()
+                        stats['labeled'] += 1
+                    elif last_labeled is not None and frame_difference(thumb, last_labeled[0]) < reuse_threshold:
+                        # Temporal reuse: the scene barely moved since the last labeled frame
+                        boxes = last_labeled[1]
+                        stats['reused'] += 1
+                    else:
+                        stats['failed'] += 1
+                        continue
+                    
+                    last_labeled = (thumb, boxes)
+                    writer.submit(write_frame, name, frame, boxes)
+        
+        print(f"   Sampled: {stats['sampled']} | Labeled: {stats['labeled']} | "
+              f"Reused: {stats['reused']} | No detection: {stats['failed']}")
+        return stats
 
-def get_file_stems(directory, extensions):
-    """Get file stems from directory"""
-    if not os.path.exists(directory):
-        return set()
-    return {p.stem for p in Path(directory).iterdir() if p.suffix.lower() in extensions}
+def iter_tiles(img, tile_size=640, overlap=0.2):
+    """Yield (x0, y0, view) overlapping tiles covering the image; the last row/column is edge-aligned"""
+    h, w = img.shape[:2]
+    step = max(1, int(tile_size * (1 - overlap)))
+    
+    def starts(length):
+        if length <= tile_size:
+            return [0]
+        positions = list(range(0, length - tile_size, step))
+        return positions + [length - tile_size]
+    
+    for y0 in starts(h):
+        for x0 in starts(w):
+            yield x0, y0, img[y0:y0 + tile_size, x0:x0 + tile_size]
+
+def needs_tiling(image_path, threshold=1920):
+    """True when the image's longer side exceeds threshold (reads the header only)"""
+    try:
+        with Image.open(image_path) as img:
+            return max(img.size) > threshold
+    except Exception:
+        return False
+
+def frame_thumbnail(frame, size=(64, 36)):
+    """Small grayscale copy used for cheap frame differencing"""
+    return cv2.resize(cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY), size, interpolation=cv2.INTER_AREA).astype(np.float32)
+
+def frame_difference(thumb_a, thumb_b):
+    """Mean absolute pixel difference between two thumbnails (0-255)"""
+    return float(np.abs(thumb_a - thumb_b).mean())
+
+def iter_video_frames(video_path, stride=5, scene_threshold=None, diff_threshold=2.0, queue_size=64):
+    """
+    Yield (frame_index, frame, thumbnail) for sampled frames, decoded in a reader thread.
+    
+    stride mode keeps every stride-th frame (skipped frames are grabbed but never decoded);
+    scene mode (scene_threshold set) keeps frames that differ enough from the last kept one.
+    Near-identical frames (difference below diff_threshold) are dropped in both modes.
+    """
+    frames = queue.Queue(maxsize=queue_size)
+    stop = threading.Event()
+    
+    def reader():
+        cap = cv2.VideoCapture(str(video_path))
+        last_thumb = None
+        frame_idx = -1
+        try:
+            while not stop.is_set():
+                frame_idx += 1
+                if scene_threshold is None and frame_idx % stride != 0:
+                    if not cap.grab():
+                        break
+                    continue
+                
+                ok, frame = cap.read()
+                if not ok:
+                    break
+                
+                thumb = frame_thumbnail(frame)
+                if last_thumb is not None:
+                    diff = frame_difference(thumb, last_thumb)
+                    if diff < diff_threshold or (scene_threshold is not None and diff < scene_threshold):
+                        continue
+                
+                last_thumb = thumb
+                frames.put((frame_idx, frame, thumb))
+        finally:
+            cap.release()
+            frames.put(None)
+    
+    thread = threading.Thread(target=reader, daemon=True)
+    thread.start()
+    try:
+        while True:
+            item = frames.get()
+            if item is None:
+                break
+            yield item
+    finally:
+        stop.set()
+        # Unblock the reader if it is waiting on a full queue
+        while thread.is_alive():
+            try:
+                frames.get_nowait()
+            except queue.Empty:
+                thread.join(timeout=0.1)
+
+def resolve_model_path(model_path, manifest_path=None):
+    """Use the artifact published by the trainer's export stage when its manifest exists"""
+    if manifest_path and os.path.exists(manifest_path):
+        with open(manifest_path, 'r') as f:
+            manifest = json.load(f)
+        if os.path.exists(manifest['path']):
+            print(f"📦 Using published {manifest['format']} model ({manifest['latency_ms_p50']:.1f} ms/img on CPU)")
+            return manifest['path']
+        print(f"⚠️  Published model missing: {manifest['path']} - falling back to {model_path}")
+    return model_path
 
 def chunk_list(lst, size):
     """Split list into chunks"""
@@ -83,51 +342,44 @@ def get_optimal_batch_size():
         return 64 if gpu_mem >= 8 else 32 if gpu_mem >= 4 else 16
     return 16
 
-def cleanup_unmatched_images(image_dir, label_dir, cleanup_dir):
-    """Remove images without corresponding labels"""
-    image_exts = {'.jpg', '.jpeg', '.png', '.bmp', '.tiff', '.webp'}
+def cleanup_unmatched_images(image_dir, label_dir, cleanup_dir, assume_yes=False, plan_file=None):
+    """
+    Move images without corresponding labels to cleanup_dir.
     
+    With plan_file the moves are only written out as a reviewable plan (apply it later with
+    YOLO_PLAN.py apply); assume_yes skips the prompt for batch jobs.
+    """
     print(f"\n🧹 CHECKING FOR UNMATCHED IMAGES...")
     
-    image_stems = get_file_stems(image_dir, image_exts)
-    label_stems = get_file_stems(label_dir, {'.txt'})
-    
-    unmatched = image_stems - label_stems
-    matched = len(image_stems & label_stems)
+    plan, total, matched = plan_unmatched_images(image_dir, label_dir, cleanup_dir)
+    print(f"   ✅ Matched: {matched} | ❌ Unmatched: {total - matched}")
     
-    print(f"   ✅ Matched: {matched} | ❌ Unmatched: {len(unmatched)}")
-    
-    if not unmatched:
+    if not len(plan):
         print("   🎉 All images have labels!")
         return 0
     
     # Show some examples
-    examples = list(unmatched)[:5]
-    print(f"   Examples: {', '.join(examples)}{' ...' if len(unmatched) > 5 else ''}")
+    examples = [Path(op['src']).name for op in plan.ops[:5]]
+    print(f"   Examples: {', '.join(examples)}{' ...' if len(plan) > 5 else ''}")
+    
+    if plan_file:
+        print(f"   💾 Plan written (not applied): {plan.write(plan_file)}")
+        return 0
     
-    choice = input(f"   ❓ Move {len(unmatched)} unmatched images to cleanup folder? (y/n): ").strip().lower()
+    choice = 'y' if assume_yes else input(f"   ❓ Move {len(plan)} unmatched images to cleanup folder? (y/n): ").strip().lower()
     
     if choice != 'y':
         print("   🛑 Keeping unmatched images")
         return 0
     
-    os.makedirs(cleanup_dir, exist_ok=True)
-    moved = 0
-    
-    for stem in unmatched:
-        for ext in image_exts:
-            src = os.path.join(image_dir, f"{stem}{ext}")
-            if os.path.exists(src):
-                dst = os.path.join(cleanup_dir, f"{stem}{ext}")
-                try:
-                    shutil.move(src, dst)
-                    moved += 1
-                    break
-                except Exception as e:
-                    print(f"   ❌ Failed to move {stem}: {e}")
+    # Applied from a file so the journal next to it makes an interrupted run resumable
+    plan_path = plan.write(default_plan_path(plan, cleanup_dir))
+    result = apply_plan(plan, plan_path)
+    if result['failed']:
+        print_result(result, plan_path)
     
-    print(f"   ✂️  Moved {moved} unmatched images to: {cleanup_dir}")
-    return moved
+    print(f"   ✂️  Moved {result['done']} unmatched images to: {cleanup_dir}")
+    return result['done']
 
 def main():
     # Configuration
@@ -136,15 +388,28 @@ def main():
     label_dir = r"D:\.IMLA\FacialExpression_yolov11\archive\train\happy\vaild\labels"
     failed_dir = r"D:\.IMLA\FacialExpression_yolov11\archive\train\happy\vaild\failed_detection"
     cleanup_dir = r"D:\.IMLA\FacialExpression_yolov11\archive\train\happy\vaild\unmatched_images"
+    published_manifest = r"D:\.IMLA\FacialExpression_yolov11\models\class_models_happy\labeling_model.json"
+    review_file = r"D:\.IMLA\FacialExpression_yolov11\archive\train\happy\vaild\review_tasks.json"
+    video_dir = r"D:\.IMLA\FacialExpression_yolov11\archive\train\happy\vaild\videos"
+    shard_dir = None           # Packed shards (YOLO_SHARDS.py) to label in addition to image_dir
     
     # Settings
     batch_size = get_optimal_batch_size()
     initial_conf = 0.4
     retry_confs = [0.25, 0.15, 0.08]
+    review_budget = 500        # Max images sent to annotators
+    review_max_mb = 1024       # Max total size of the review subset
+    tiling_threshold = 1920    # Images with a longer side above this use tiled inference
+    tile_size = 640
+    video_stride = 5           # Keep every Nth video frame
+    video_scene_threshold = None  # Set (e.g. 12.0) to sample on scene changes instead of stride
     
     print("🚀 INTEGRATED YOLO PROCESSING PIPELINE")
     print(f"⚙️  Batch size: {batch_size}")
     
+    # Prefer the fastest exported model published by the trainer
+    model_path = resolve_model_path(model_path, published_manifest)
+    
     # Validate inputs
     if not os.path.exists(model_path):
         print(f"❌ Model not found: {model_path}")
@@ -184,32 +449,71 @@ def main():
     total_images = len(image_files)
     total_success = 0
     retry_count = 0
+    # Uncertainty signals are collected from the labeling passes below, no extra inference
+    selector = ActiveLearningSelector(initial_conf, min(retry_confs))
     
     start_time = time.time()
     
-    # Initial batch processing
-    print(f"\n🔍 Batch processing (conf={initial_conf})...")
-    failed_images = []
+    # High-resolution images go through tiled inference so small faces survive
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        large_flags = list(executor.map(lambda p: needs_tiling(p, tiling_threshold), image_files))
+    large_images = [p for p, large in zip(image_files, large_flags) if large]
+    regular_images = [p for p, large in zip(image_files, large_flags) if not large]
     
-    for batch_idx, batch in enumerate(chunk_list(image_files, batch_size)):
-        print(f"⚡ Batch {batch_idx + 1}/{(len(image_files) + batch_size - 1) // batch_size}")
-        
-        results = processor.process_batch(batch, initial_conf)
-        success_count, batch_failed = processor.save_labels_parallel(results, label_dir)
+    failed_images = []
+    processed = 0
+    
+    if large_images:
+        print(f"\n🧩 Tiled processing for {len(large_images)} images above {tiling_threshold}px (tile={tile_size})...")
+        for batch in chunk_list(large_images, max(1, batch_size // 8)):
+            merged = processor.process_tiled(batch, initial_conf, tile_size=tile_size)
+            success_count, batch_failed = processor.save_tiled_labels(merged, label_dir)
+            total_success += success_count
+            failed_images.extend([os.path.join(image_dir, f"{name}.png") for name in batch_failed])
+            processed += len(batch)
+        print(f"   Progress: {processed}/{total_images} | Success: {(total_success / processed) * 100:.1f}%")
+    
+    # Initial batch processing: one prediction at the lowest retry threshold per image. Labels use the
+    # boxes at initial_conf, failed images fall back to the retry thresholds on the same predictions,
+    # and the selector sees every box, so all images are ranked on the same footing.
+    print(f"\n🔍 Batch processing (conf={initial_conf}, retries {retry_confs} from the same pass)...")
+    recovered_at = {conf: 0 for conf in retry_confs}
+    regular_failed = []
+    
+    for batch_idx, batch in enumerate(chunk_list(regular_images, batch_size)):
+        print(f"⚡ Batch {batch_idx + 1}/{(len(regular_images) + batch_size - 1) // batch_size}")
         
+        results = processor.process_batch(batch, min(retry_confs))
+        success_count, batch_failed = processor.save_labels_parallel(results, label_dir, min_conf=initial_conf)
+        for result in results:
+            selector.record(result)
         total_success += success_count
-        failed_images.extend([os.path.join(image_dir, f"{name}.png") for name in batch_failed])
+        
+        failed_stems = set(batch_failed)
+        remaining_results = [r for r in results if Path(r.path).stem in failed_stems]
+        for conf in retry_confs:
+            if not remaining_results:
+                break
+            success_count, batch_failed = processor.save_labels_parallel(remaining_results, label_dir, min_conf=conf)
+            recovered_at[conf] += success_count
+            total_success += success_count
+            retry_count += success_count
+            failed_stems = set(batch_failed)
+            remaining_results = [r for r in remaining_results if Path(r.path).stem in failed_stems]
+        regular_failed.extend(r.path for r in remaining_results)
         
         # Progress
-        processed = (batch_idx + 1) * len(batch)
-        if processed > total_images:
-            processed = total_images
+        processed += len(batch)
         success_rate = (total_success / processed) * 100
         print(f"   Progress: {processed}/{total_images} | Success: {success_rate:.1f}%")
     
-    # Retry failed images
+    if retry_count:
+        print("🔄 Recovered at lower thresholds: " + ", ".join(f"conf={c}: {n}" for c, n in recovered_at.items()))
+    
+    # Retry failed tiled images (regular images were retried from their own predictions above)
+    remaining = []
     if failed_images:
-        print(f"\n🔄 Retrying {len(failed_images)} failed images...")
+        print(f"\n🔄 Retrying {len(failed_images)} failed tiled images...")
         remaining = failed_images.copy()
         
         for conf in retry_confs:
@@ -230,25 +534,26 @@ def main():
             recovered = len(remaining) - len(current_failed)
             print(f"   Recovered: {recovered} images")
             remaining = current_failed
+    
+    # Save permanently failed images
+    remaining = regular_failed + remaining
+    if remaining:
+        print(f"📁 Saving {len(remaining)} failed images...")
         
-        # Save permanently failed images
-        if remaining:
-            print(f"📁 Saving {len(remaining)} failed images...")
-            
-            def save_failed(img_path):
-                name = Path(img_path).stem
-                img = cv2.imread(img_path)
-                if img is not None:
-                    cv2.imwrite(os.path.join(failed_dir, f"{name}.jpg"), img)
-                return name
-            
-            with ThreadPoolExecutor(max_workers=8) as executor:
-                final_failed = list(executor.map(save_failed, remaining))
+        def save_failed(img_path):
+            name = Path(img_path).stem
+            img = cv2.imread(img_path)
+            if img is not None:
+                cv2.imwrite(os.path.join(failed_dir, f"{name}.jpg"), img)
+            return name
+        
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            final_failed = list(executor.map(save_failed, remaining))
     
     # Final statistics
     end_time = time.time()
     total_time = end_time - start_time
-    final_failed_count = len(remaining) if failed_images else 0
+    final_failed_count = len(remaining)
     success_rate = (total_success / total_images) * 100
     
     # Final report
@@ -264,6 +569,29 @@ def main():
     if final_failed_count == 0:
         print("🎉 ALL IMAGES SUCCESSFULLY PROCESSED!")
     
+    # Optional: Video ingestion - label sampled frames straight from the stream
+    video_exts = {'.mp4', '.avi', '.mov', '.mkv', '.webm'}
+    videos = [p for p in Path(video_dir).iterdir() if p.suffix.lower() in video_exts] if os.path.exists(video_dir) else []
+    if videos:
+        video_choice = input(f"\n🎬 Found {len(videos)} videos. Label sampled frames? (y/n): ").strip().lower()
+        if video_choice == 'y':
+            for video in videos:
+                processor.process_video(video, image_dir, label_dir, conf=initial_conf,
+                                        stride=video_stride, scene_threshold=video_scene_threshold)
+    
+    # Optional: Label images stored in packed shards
+    if shard_dir and os.path.exists(shard_dir):
+        with ShardReader(shard_dir) as reader:
+            shard_choice = input(f"\n📦 Label unlabeled images from {len(reader)} packed images? (y/n): ").strip().lower()
+            if shard_choice == 'y':
+                shard_success, shard_failed = processor.process_shard(reader, label_dir, conf=initial_conf)
+                print(f"✅ Shards: {shard_success} labeled, {len(shard_failed)} without detections")
+    
+    # Optional: Active learning - rank images for human review in Label Studio
+    review_choice = input(f"\n🧠 Rank images for human review (active learning)? (y/n): ").strip().lower()
+    if review_choice == 'y':
+        selector.export_label_studio(review_file, budget=review_budget, max_megabytes=review_max_mb)
+    
     # Optional: Final cleanup of unmatched images
     final_cleanup = input(f"\n🧹 Final cleanup of unmatched images? (y/n): ").strip().lower()
     if final_cleanup == 'y':
@@ -0,0 +1,107 @@
+import json
+import os
+
+import numpy as np
+
+def box_count_entropy(confs):
+    """
+    Entropy of the number of objects in an image, treating each box as present with its score.
+    The count follows a Poisson-binomial distribution; the entropy is normalized to [0, 1].
+    """
+    pmf = np.ones(1)
+    for p in np.clip(confs, 0.0, 1.0):
+        pmf = np.append(pmf * (1 - p), 0.0) + np.append(0.0, pmf * p)
+    pmf = pmf[pmf > 0]
+    return max(0.0, float(-(pmf * np.log2(pmf)).sum() / np.log2(len(confs) + 1))) if len(confs) else 0.0
+
+class ActiveLearningSelector:
+    """Rank images by how uncertain the model is about them and export the top ones for review"""
+    
+    def __init__(self, initial_conf, retry_conf, weights=(0.4, 0.3, 0.3)):
+        self.initial_conf = initial_conf
+        self.retry_conf = retry_conf
+        self.weights = np.array(weights, dtype=np.float32)
+        self.records = {}
+    
+    def record(self, result):
+        """Score one prediction made at the retry (lowest) threshold; recording an image again replaces its entry"""
+        boxes = result.boxes
+        confs = boxes.conf.cpu().numpy() if boxes is not None and len(boxes) > 0 else np.zeros(0, dtype=np.float32)
+        
+        # Boxes seen at the initial threshold vs. only at the retry threshold
+        n_initial = int((confs >= self.initial_conf).sum())
+        n_retry = len(confs)
+        disagreement = (n_retry - n_initial) / n_retry if n_retry else 0.0
+        
+        # No detection even at the lowest threshold counts as maximally uncertain
+        entropy = box_count_entropy(confs) if n_retry else 1.0
+        
+        max_conf = float(confs.max()) if n_retry else 0.0
+        self.records[result.path] = {
+            'path': result.path,
+            'max_conf': max_conf,
+            'entropy': entropy,
+            'disagreement': disagreement,
+            'boxes_initial': n_initial,
+            'boxes_retry': n_retry,
+            'boxes': boxes.xywhn.cpu().numpy().tolist() if n_retry else [],
+            'scores': confs.tolist()
+        }
+    
+    def rank(self):
+        """Records sorted by a weighted uncertainty score, most informative first"""
+        records = list(self.records.values())
+        if not records:
+            return []
+        features = np.array([[1 - r['max_conf'], r['entropy'], r['disagreement']] for r in records], dtype=np.float32)
+        scores = features @ self.weights
+        for record, score in zip(records, scores):
+            record['score'] = float(score)
+        return [records[i] for i in np.argsort(-scores, kind='stable')]
+    
+    def export_label_studio(self, output_file, budget=500, max_megabytes=None, label_name="face"):
+        """Write the top-ranked images as Label Studio tasks with the model's boxes as pre-annotations"""
+        ranked = self.rank()
+        selected = []
+        total_bytes = 0
+        
+        for record in ranked:
+            if len(selected) >= budget:
+                break
+            size = os.path.getsize(record['path'])
+            if max_megabytes and total_bytes + size > max_megabytes * 1024 * 1024:
+                continue
+            total_bytes += size
+            selected.append(record)
+        
+        tasks = []
+        for record in selected:
+            results = [{
+                "value": {
+                    "rectanglelabels": [label_name],
+                    "x": (x - w / 2) * 100,
+                    "y": (y - h / 2) * 100,
+                    "width": w * 100,
+                    "height": h * 100
+                },
+                "score": score,
+                "from_name": "label",
+                "to_name": "image",
+                "type": "rectanglelabels"
+            } for (x, y, w, h), score in zip(record['boxes'], record['scores'])]
+            
+            tasks.append({
+                "data": {
+                    "image": f"/data/local-files/?d={record['path']}",
+                    "al_score": record['score'],
+                    "max_conf": record['max_conf'],
+                    "disagreement": record['disagreement']
+                },
+                "predictions": [{"model_version": "active_learning", "result": results}]
+            })
+        
+        with open(output_file, "w") as f:
+            json.dump(tasks, f, indent=2)
+        
+        print(f"   🧠 Exported {len(tasks)}/{len(ranked)} images for review ({total_bytes / (1024 * 1024):.1f} MB): {output_file}")
+        return len(tasks)
@@ -0,0 +1,291 @@
+"""
+One entry point for the YOLO dataset tools.
+
+Only the standard library (plus yaml) is imported at startup; numpy, torch, ultralytics, cv2 and
+matplotlib are imported inside the subcommands that need them, so file-only commands start instantly.
+"""
+import argparse
+import os
+import sys
+import time
+from pathlib import Path
+
+# Heavy modules that file-only subcommands must never import (checked by test_yolo_cli.py)
+HEAVY_MODULES = ('torch', 'ultralytics', 'cv2', 'matplotlib', 'numpy', 'PIL')
+
+def _load_yaml(path):
+    import yaml
+    with open(path, 'r') as f:
+        return yaml.safe_load(f)
+
+def _confirm(question, assume_yes):
+    return assume_yes or input(f"❓ {question} (y/n): ").strip().lower() == 'y'
+
+def _run_plan(plan, plan_file, assume_yes, question, plan_dir):
+    """
+    Shared tail of the destructive commands: preview, then write the plan or apply it.
+    Applied plans are written under plan_dir/.plans first, so their journal makes an interrupted run resumable.
+    """
+    from YOLO_PLAN import apply_plan, default_plan_path, print_result
+
+    plan.print_preview()
+    if not len(plan):
+        return 0
+    if plan_file:
+        print(f"💾 Plan written (not applied): {plan.write(plan_file)}")
+        return 0
+    if not _confirm(question, assume_yes):
+        print("🛑 Cancelled")
+        return 0
+    plan_path = plan.write(default_plan_path(plan, plan_dir))
+    result = apply_plan(plan, plan_path)
+    print_result(result, plan_path)
+    return 1 if result['failed'] else 0
+
+def cmd_index(args):
+    from YOLO_DATASET import dataset_fingerprint
+
+    info = dataset_fingerprint(args.data_yaml)
+    print(f"🔑 Fingerprint: {info['fingerprint']}")
+    for split, node in info['splits'].items():
+        print(f"   📁 {split}: {node['images']} images, {node['labels']} labels ({node['hash'][:12]})")
+
+    if args.stats:
+        from YOLO_STATS import DatasetStatistics, print_summary
+        stats = DatasetStatistics(args.data_yaml)
+        results = stats.compute(refresh=args.refresh)
+        print()
+        print_summary(results)
+        if args.report:
+            print(f"🖼️  Report saved: {stats.render_report(results, args.report)}")
+    return 0
+
+def cmd_validate(args):
+    from concurrent.futures import ThreadPoolExecutor
+    from YOLO_DATASET import IMAGE_EXTENSIONS, split_dirs, validate_label_lines
+
+    data_config = _load_yaml(args.data_yaml)
+    missing = [field for field in ('train', 'nc', 'names') if field not in data_config]
+    if missing:
+        print(f"❌ Missing fields in data.yaml: {', '.join(missing)}")
+        return 1
+
+    def check(label_path):
+        try:
+            with open(label_path, 'r') as f:
+                return validate_label_lines(os.path.basename(label_path), f.readlines(), data_config['nc'])
+        except OSError as e:
+            return [f"{os.path.basename(label_path)} - Error reading file: {e}"]
+
+    failed = False
+    for split, split_dir in split_dirs(data_config).items():
+        image_dir, label_dir = split_dir / "images", split_dir / "labels"
+        images = [n for n in os.listdir(image_dir) if os.path.splitext(n)[1].lower() in IMAGE_EXTENSIONS] \
+            if image_dir.is_dir() else []
+        labels = set(os.listdir(label_dir)) if label_dir.is_dir() else set()
+
+        stems = [os.path.splitext(n)[0] for n in images]
+        missing_labels = [stem for stem in stems if f"{stem}.txt" not in labels]
+        present = [label_dir / f"{stem}.txt" for stem in stems if f"{stem}.txt" in labels]
+        with ThreadPoolExecutor(max_workers=16) as executor:
+            errors = [e for file_errors in executor.map(check, present) for e in file_errors]
+
+        status = "✅" if images and not missing_labels and not errors else "❌"
+        print(f"{status} {split}: {len(images)} images | {len(missing_labels)} missing labels | {len(errors)} invalid entries")
+        for error in errors[:args.show]:
+            print(f"   - {error}")
+        failed |= status == "❌"
+
+    if args.leakage:
+        from YOLO_LEAKAGE import find_leakage
+        pairs = find_leakage(args.data_yaml, args.radius, data_config=data_config)
+        print(f"{'❌' if pairs else '✅'} Cross-split near-duplicates: {len(pairs)}")
+        for pair in pairs[:args.show]:
+            print(f"   - {pair['split_a']}/{pair['image_a']} ~ {pair['split_b']}/{pair['image_b']} ({pair['distance']})")
+        failed |= bool(pairs)
+
+    return 1 if failed else 0
+
+def cmd_normalize(args):
+    from YOLO_COO import clear_yolo_cache, normalize_yolo_labels, validate_normalized_labels
+
+    clear_yolo_cache(args.dataset)
+    normalize_yolo_labels(args.dataset)
+    validate_normalized_labels(args.dataset)
+    clear_yolo_cache(args.dataset)
+    return 0
+
+def cmd_split(args):
+    from YOLO_PLAN import plan_validation_split
+
+    plan = plan_validation_split(args.train, args.val, args.fraction, args.seed)
+    return _run_plan(plan, args.plan, args.yes, f"Move {len(plan)} files into {args.val}?", args.val)
+
+def cmd_cut(args):
+    from YOLO_PLAN import plan_unmatched_images
+
+    plan, total, matched = plan_unmatched_images(args.images, args.labels, args.dest)
+    print(f"📊 {total} images, {matched} with labels")
+    return _run_plan(plan, args.plan, args.yes, f"Move {len(plan)} unlabeled images to {args.dest}?", args.dest)
+
+def cmd_merge(args):
+    from Folders_Into_Folder import merge_folders
+
+    copied, skipped = merge_folders(args.folders, args.output, tuple(args.ext))
+    print(f"✅ Copied {copied} files ({skipped} already present) -> {args.output}")
+    return 0
+
+def cmd_export(args):
+    from YOLO_TRAIN_v2 import OptimizedYOLOTrainer
+
+    trainer = OptimizedYOLOTrainer(args.model, args.project_root, args.target_class)
+    if args.benchmark_images:
+        trainer.export_and_benchmark(args.model, args.benchmark_images, tuple(args.formats), imgsz=args.imgsz,
+                                     int8=args.int8, data_yaml_path=args.data)
+    else:
+        trainer.export_model(args.model, tuple(args.formats), imgsz=args.imgsz, int8=args.int8, data_yaml_path=args.data)
+    return 0
+
+def cmd_label(args):
+    from YOLO11s_v3 import OptimizedYOLOProcessor, chunk_list, get_optimal_batch_size, needs_tiling
+    from YOLO_DATASET import IMAGE_EXTENSIONS
+
+    os.makedirs(args.labels, exist_ok=True)
+    images = sorted(str(p) for p in Path(args.images).iterdir() if p.suffix.lower() in IMAGE_EXTENSIONS)
+    if args.skip_labeled:
+        images = [p for p in images if not os.path.exists(os.path.join(args.labels, f"{Path(p).stem}.txt"))]
+    print(f"📸 {len(images)} images to label")
+
+    batch_size = args.batch_size or get_optimal_batch_size()
+    processor = OptimizedYOLOProcessor(args.model, class_id=args.class_id, device=args.device, batch_size=batch_size)
+
+    large = {p for p in images if args.tile_threshold and needs_tiling(p, args.tile_threshold)}
+    regular = [p for p in images if p not in large]
+    large = sorted(large)
+
+    success, failed = 0, []
+    for batch in chunk_list(large, max(1, batch_size // 8)):
+        count, batch_failed = processor.save_tiled_labels(processor.process_tiled(batch, args.conf), args.labels)
+        success, failed = success + count, failed + batch_failed
+    for batch in chunk_list(regular, batch_size):
+        count, batch_failed = processor.save_labels_parallel(processor.process_batch(batch, args.conf), args.labels)
+        success, failed = success + count, failed + batch_failed
+
+    print(f"✅ Labeled {success}/{len(images)} images ({len(failed)} without detections)")
+    return 0
+
+def cmd_train(args):
+    from YOLO_TRAIN_v2 import OptimizedYOLOTrainer
+
+    settings = {key: value for key, value in (('epochs', args.epochs), ('imgsz', args.imgsz), ('batch', args.batch))
+                if value is not None}
+    trainer = OptimizedYOLOTrainer(args.model, args.project_root, args.target_class, auto_fix=args.auto_fix)
+    _, run_name = trainer.train_model(args.data_yaml, custom_settings=settings or None,
+                                      reuse_duplicates=False if args.retrain else None)
+
+    best_model_path = trainer.save_best_model(run_name)
+    if not best_model_path:
+        return 1
+
+    test_stats = None
+    if args.test_images:
+        test_stats, _ = trainer.test_model(best_model_path, args.test_images)
+    trainer.generate_comprehensive_report(test_stats)
+    return 0
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog="yolo-tools", description="YOLO dataset and model tools")
+    sub = parser.add_subparsers(dest='command', required=True)
+
+    p = sub.add_parser('index', help="Fingerprint a dataset and count files per split")
+    p.add_argument('data_yaml')
+    p.add_argument('--stats', action='store_true', help="Also compute label statistics (class balance, box sizes)")
+    p.add_argument('--refresh', action='store_true', help="Recompute statistics even if cached")
+    p.add_argument('--report', help="Save the one-page statistics PNG here")
+    p.set_defaults(func=cmd_index)
+
+    p = sub.add_parser('validate', help="Check label format, missing labels and (optionally) split leakage")
+    p.add_argument('data_yaml')
+    p.add_argument('--leakage', action='store_true', help="Also look for near-duplicates across splits")
+    p.add_argument('--radius', type=int, default=4)
+    p.add_argument('--show', type=int, default=10, help="How many problems to list per split")
+    p.set_defaults(func=cmd_validate)
+
+    p = sub.add_parser('normalize', help="Convert pixel labels to normalized YOLO format")
+    p.add_argument('dataset', help="Dataset folder with train/ and val/")
+    p.set_defaults(func=cmd_normalize)
+
+    p = sub.add_parser('split', help="Move a fraction of train into a val split")
+    p.add_argument('--train', required=True)
+    p.add_argument('--val', required=True)
+    p.add_argument('--fraction', type=float, default=0.2)
+    p.add_argument('--seed', type=int, default=0)
+    p.add_argument('--plan', help="Only write the plan to this file")
+    p.add_argument('--yes', action='store_true', help="Apply without asking")
+    p.set_defaults(func=cmd_split)
+
+    p = sub.add_parser('cut', help="Move images without labels out of the dataset")
+    p.add_argument('--images', required=True)
+    p.add_argument('--labels', required=True)
+    p.add_argument('--dest', required=True)
+    p.add_argument('--plan', help="Only write the plan to this file")
+    p.add_argument('--yes', action='store_true', help="Apply without asking")
+    p.set_defaults(func=cmd_cut)
+
+    p = sub.add_parser('merge', help="Copy images from several folders into one")
+    p.add_argument('output')
+    p.add_argument('folders', nargs='+')
+    p.add_argument('--ext', nargs='+', default=['.jpg', '.jpeg', '.png'])
+    p.set_defaults(func=cmd_merge)
+
+    p = sub.add_parser('export', help="Export a model to deployment formats (optionally benchmark them)")
+    p.add_argument('model')
+    p.add_argument('--project-root', required=True)
+    p.add_argument('--class', dest='target_class')
+    p.add_argument('--formats', nargs='+', default=['onnx', 'openvino', 'torchscript'])
+    p.add_argument('--imgsz', type=int, default=640)
+    p.add_argument('--int8', action='store_true')
+    p.add_argument('--data', help="data.yaml for INT8 calibration")
+    p.add_argument('--benchmark-images', help="Benchmark on CPU and publish the fastest format")
+    p.set_defaults(func=cmd_export)
+
+    p = sub.add_parser('label', help="Auto-label a folder of images")
+    p.add_argument('model')
+    p.add_argument('images')
+    p.add_argument('labels')
+    p.add_argument('--conf', type=float, default=0.4)
+    p.add_argument('--class-id', type=int, default=2)
+    p.add_argument('--device', default='auto')
+    p.add_argument('--batch-size', type=int)
+    p.add_argument('--tile-threshold', type=int, default=1920, help="Use tiled inference above this size (0 = never)")
+    p.add_argument('--skip-labeled', action='store_true')
+    p.set_defaults(func=cmd_label)
+
+    p = sub.add_parser('train', help="Fine-tune a model")
+    p.add_argument('model')
+    p.add_argument('data_yaml')
+    p.add_argument('--project-root', required=True)
+    p.add_argument('--class', dest='target_class')
+    p.add_argument('--epochs', type=int)
+    p.add_argument('--imgsz', type=int)
+    p.add_argument('--batch', type=int)
+    p.add_argument('--test-images')
+    fix = p.add_mutually_exclusive_group()
+    fix.add_argument('--auto-fix', dest='auto_fix', action='store_true', default=None, help="Fix dataset issues without asking")
+    fix.add_argument('--no-fix', dest='auto_fix', action='store_false', help="Never fix dataset issues")
+    p.add_argument('--retrain', action='store_true',
+                   help="Train even if an identical run exists (by default it is reused when --auto-fix/--no-fix is given)")
+    p.set_defaults(func=cmd_train)
+
+    return parser
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    start = time.perf_counter()
+    code = args.func(args)
+    if os.environ.get('YOLO_CLI_TIMING'):
+        print(f"⏱️  {args.command}: {(time.perf_counter() - start) * 1000:.0f} ms", file=sys.stderr)
+    return code
+
+if __name__ == "__main__":
+    raise SystemExit(main())
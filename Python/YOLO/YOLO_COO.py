@@ -1,8 +1,6 @@
 import os
 import shutil
 from pathlib import Path
-from PIL import Image
-import cv2
 
 def normalize_yolo_labels(dataset_path):
     """
@@ -12,6 +10,8 @@ def normalize_yolo_labels(dataset_path):
         dataset_path: Path to your dataset directory containing train/val folders
     """
     
+    from PIL import Image  # Imported here so the CLI can load this module without the imaging stack
+    
     dataset_path = Path(dataset_path)
     print(f"🔧 NORMALIZING YOLO LABELS")
     print("=" * 60)
@@ -70,6 +70,7 @@ def normalize_yolo_labels(dataset_path):
                         img_width, img_height = img.size
                 except:
                     # Fallback to OpenCV
+                    import cv2
                     img = cv2.imread(str(img_file))
                     if img is None:
                         print(f"   ❌ Cannot read image: {img_file.name}")
@@ -0,0 +1,169 @@
+import hashlib
+import os
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+IMAGE_EXTENSIONS = {'.jpg', '.jpeg', '.png', '.bmp', '.tiff', '.webp'}
+LABEL_EXTENSIONS = {'.txt'}
+SPLITS = ('train', 'val', 'test')
+
+def split_dirs(data_config):
+    """Split name -> split directory, using the trainer's convention (parent of the path in data.yaml)"""
+    dirs = {}
+    for split in SPLITS:
+        if split in data_config and data_config[split]:
+            dirs[split] = Path(data_config[split]).parent
+    return dirs
+
+def directory_digest(directory, extensions):
+    """Hash of (name, size, mtime) for every matching file in a directory - content is never read"""
+    digest = hashlib.sha256()
+    count = 0
+    if not os.path.isdir(directory):
+        return digest.hexdigest(), 0
+
+    entries = []
+    with os.scandir(directory) as it:
+        for entry in it:
+            if os.path.splitext(entry.name)[1].lower() in extensions and entry.is_file():
+                st = entry.stat()
+                entries.append(f"{entry.name}\0{st.st_size}\0{st.st_mtime_ns}\n")
+
+    for line in sorted(entries):
+        digest.update(line.encode('utf-8', 'surrogateescape'))
+        count += 1
+    return digest.hexdigest(), count
+
+def dataset_fingerprint(data_yaml_path, data_config=None):
+    """
+    Merkle-style dataset fingerprint.
+
+    Leaves are per-directory digests of image and label metadata, each split hashes its
+    images/labels leaves, and the root hashes data.yaml plus every split node. Any added,
+    removed, resized or touched file changes the root, and the split nodes show where.
+    """
+    if data_config is None:
+        import yaml
+        with open(data_yaml_path, 'r') as f:
+            data_config = yaml.safe_load(f)
+
+    dirs = split_dirs(data_config)
+    jobs = []
+    for split, split_dir in dirs.items():
+        jobs.append((split, 'images', split_dir / "images", IMAGE_EXTENSIONS))
+        jobs.append((split, 'labels', split_dir / "labels", LABEL_EXTENSIONS))
+
+    # Directory scans are I/O bound - run them concurrently (helps a lot on network shares)
+    with ThreadPoolExecutor(max_workers=max(1, min(8, len(jobs)))) as executor:
+        leaves = list(executor.map(lambda job: directory_digest(job[2], job[3]), jobs))
+
+    splits = {}
+    for (split, kind, _, _), (digest, count) in zip(jobs, leaves):
+        node = splits.setdefault(split, {'images': 0, 'labels': 0, 'leaves': {}})
+        node[kind] = count
+        node['leaves'][kind] = digest
+
+    root = hashlib.sha256()
+    with open(data_yaml_path, 'rb') as f:
+        root.update(hashlib.sha256(f.read()).digest())
+    for split in sorted(splits):
+        node = splits[split]
+        node['hash'] = hashlib.sha256(f"{node['leaves']['images']}:{node['leaves']['labels']}".encode()).hexdigest()
+        root.update(f"{split}={node['hash']}".encode())
+
+    return {
+        'fingerprint': root.hexdigest(),
+        'splits': {split: {'hash': node['hash'], 'images': node['images'], 'labels': node['labels']}
+                   for split, node in splits.items()}
+    }
+
+def validate_label_lines(label_name, lines, num_classes):
+    """Format errors in the lines of one YOLO label file (empty list = valid)"""
+    errors = []
+    for line_num, line in enumerate(lines, 1):
+        line = line.strip()
+        if not line:
+            continue
+
+        parts = line.split()
+        if len(parts) != 5:
+            errors.append(f"{label_name}:L{line_num} - Expected 5 values, got {len(parts)}")
+            continue
+
+        # Check if all parts are numbers
+        try:
+            class_id = int(parts[0])
+            x, y, w, h = map(float, parts[1:5])
+
+            # Check if values are in valid ranges
+            if not (0 <= x <= 1 and 0 <= y <= 1 and 0 <= w <= 1 and 0 <= h <= 1):
+                errors.append(f"{label_name}:L{line_num} - Coordinates out of range [0,1]")
+
+            if class_id >= num_classes:
+                errors.append(f"{label_name}:L{line_num} - Class ID {class_id} >= num_classes {num_classes}")
+
+        except ValueError:
+            errors.append(f"{label_name}:L{line_num} - Non-numeric values")
+    return errors
+
+def _parse_label_file(label_path):
+    """Rows of a YOLO label file as a flat list of floats (class x y w h), skipping malformed lines"""
+    with open(label_path, 'r') as f:
+        text = f.read()
+    tokens = text.split()
+    if len(tokens) % 5 == 0:
+        try:
+            return [float(t) for t in tokens]
+        except ValueError:
+            pass
+    rows = []
+    for line in text.splitlines():
+        parts = line.split()
+        if len(parts) == 5:
+            try:
+                rows.extend(float(p) for p in parts)
+            except ValueError:
+                continue
+    return rows
+
+def load_split_labels(split_dir, cache_dir=None, split_hash=None):
+    """
+    Parse every label of a split into flat arrays.
+
+    Returns {'stems': (I,) image stems, 'image_index': (N,) row -> image, 'labels': (N, 5) float32}.
+    Images without a label file count as empty. With cache_dir and split_hash the arrays are kept
+    in an .npz keyed by the split hash, so unchanged splits are never re-parsed.
+    """
+    import numpy as np
+
+    cache_file = None
+    if cache_dir and split_hash:
+        cache_file = Path(cache_dir) / f"labels_{split_hash}.npz"
+        if cache_file.exists():
+            with np.load(cache_file) as cached:
+                return {key: cached[key] for key in cached.files}
+
+    split_dir = Path(split_dir)
+    image_dir, label_dir = split_dir / "images", split_dir / "labels"
+    stems = []
+    if image_dir.is_dir():
+        with os.scandir(image_dir) as it:
+            stems = sorted(os.path.splitext(e.name)[0] for e in it
+                           if os.path.splitext(e.name)[1].lower() in IMAGE_EXTENSIONS)
+
+    label_paths = [label_dir / f"{stem}.txt" for stem in stems]
+    with ThreadPoolExecutor(max_workers=16) as executor:
+        parsed = list(executor.map(lambda p: _parse_label_file(p) if p.exists() else [], label_paths))
+
+    counts = np.array([len(rows) // 5 for rows in parsed], dtype=np.int64)
+    flat = np.fromiter((v for rows in parsed for v in rows), dtype=np.float32, count=int(counts.sum()) * 5)
+    arrays = {
+        'stems': np.array(stems, dtype=str),
+        'image_index': np.repeat(np.arange(len(stems), dtype=np.int64), counts),
+        'labels': flat.reshape(-1, 5)
+    }
+
+    if cache_file is not None:
+        cache_file.parent.mkdir(parents=True, exist_ok=True)
+        np.savez(cache_file, **arrays)
+    return arrays
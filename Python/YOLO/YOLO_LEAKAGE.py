@@ -0,0 +1,214 @@
+import argparse
+import csv
+import os
+from concurrent.futures import ProcessPoolExecutor
+from itertools import combinations
+from pathlib import Path
+
+import numpy as np
+import yaml
+from PIL import Image
+
+from YOLO_DATASET import IMAGE_EXTENSIONS, split_dirs
+
+HASH_BITS = 64
+
+def dhash(image_path, hash_size=8):
+    """64-bit difference hash (None if the image can't be read)"""
+    try:
+        with Image.open(image_path) as img:
+            img.draft('L', (hash_size * 8, hash_size * 8))  # JPEG: decode at reduced scale, much faster
+            small = img.convert('L').resize((hash_size + 1, hash_size), Image.BILINEAR)
+        pixels = np.asarray(small, dtype=np.int16)
+        bits = (pixels[:, 1:] > pixels[:, :-1]).ravel()
+        return int(np.packbits(bits).view('>u8')[0])
+    except Exception:
+        return None
+
+def popcount64(values):
+    """Number of set bits for each uint64"""
+    values = np.ascontiguousarray(values, dtype=np.uint64)
+    if hasattr(np, 'bitwise_count'):
+        return np.bitwise_count(values).astype(np.int64)
+    table = np.array([bin(i).count('1') for i in range(256)], dtype=np.int64)
+    return table[values.view(np.uint8).reshape(-1, 8)].sum(axis=1)
+
+class HashCache:
+    """Perceptual hashes keyed by (file name, size, mtime) - survives files being moved between splits"""
+
+    def __init__(self, cache_file=None):
+        self.cache_file = Path(cache_file) if cache_file else None
+        self.hashes = {}
+        if self.cache_file and self.cache_file.exists():
+            with np.load(self.cache_file) as cached:
+                readable = cached['readable'].tolist()
+                self.hashes = {k: (h if ok else None) for k, h, ok in
+                               zip(cached['keys'].tolist(), cached['hashes'].tolist(), readable)}
+
+    @staticmethod
+    def key(entry):
+        st = entry.stat()
+        return f"{entry.name}\0{st.st_size}\0{st.st_mtime_ns}"
+
+    def hash_directory(self, image_dir, workers=None):
+        """(names, uint64 hashes) for every readable image in a directory, hashing only new/changed files"""
+        entries = []
+        if os.path.isdir(image_dir):
+            with os.scandir(image_dir) as it:
+                entries = sorted((e for e in it if os.path.splitext(e.name)[1].lower() in IMAGE_EXTENSIONS),
+                                 key=lambda e: e.name)
+        keys = [self.key(e) for e in entries]
+
+        missing = [i for i, k in enumerate(keys) if k not in self.hashes]
+        if missing:
+            print(f"   🔑 Hashing {len(missing)} images in {image_dir}...")
+            with ProcessPoolExecutor(max_workers=workers) as executor:
+                paths = [entries[i].path for i in missing]
+                for i, value in zip(missing, executor.map(dhash, paths, chunksize=256)):
+                    self.hashes[keys[i]] = value
+
+        names, hashes = [], []
+        for entry, k in zip(entries, keys):
+            if self.hashes[k] is not None:
+                names.append(entry.name)
+                hashes.append(self.hashes[k])
+        return names, np.array(hashes, dtype=np.uint64)
+
+    def save(self):
+        if not self.cache_file:
+            return
+        self.cache_file.parent.mkdir(parents=True, exist_ok=True)
+        keys = list(self.hashes)
+        np.savez(self.cache_file, keys=np.array(keys, dtype=str),
+                 hashes=np.array([self.hashes[k] or 0 for k in keys], dtype=np.uint64),
+                 readable=np.array([self.hashes[k] is not None for k in keys], dtype=bool))
+
+class MultiIndexHash:
+    """
+    Multi-index hashing for Hamming range search.
+
+    The 64-bit codes are split into `chunks` substrings, each kept as a sorted array. If two codes are
+    within distance r, at least one substring is within r // chunks (pigeonhole), so a query only
+    probes a handful of buckets per substring instead of comparing against every code.
+    """
+
+    def __init__(self, hashes, chunks=4):
+        self.hashes = np.asarray(hashes, dtype=np.uint64)
+        self.chunks = chunks
+        self.chunk_bits = HASH_BITS // chunks
+        self.mask = np.uint64((1 << self.chunk_bits) - 1)
+        self.sorted_chunks = []
+        for c in range(chunks):
+            values = self._chunk(self.hashes, c)
+            order = np.argsort(values, kind='stable')
+            self.sorted_chunks.append((values[order], order))
+
+    def _chunk(self, hashes, c):
+        return (hashes >> np.uint64(c * self.chunk_bits)) & self.mask
+
+    def _probe_masks(self, radius):
+        flips = [0]
+        for d in range(1, radius // self.chunks + 1):
+            flips.extend(sum(1 << b for b in bits) for bits in combinations(range(self.chunk_bits), d))
+        return np.array(flips, dtype=np.uint64)
+
+    def query(self, queries, radius, batch_size=100_000):
+        """All (query index, indexed index, distance) pairs within `radius` bits"""
+        queries = np.asarray(queries, dtype=np.uint64)
+        masks = self._probe_masks(radius)
+        results = []
+
+        for start in range(0, len(queries), batch_size):
+            batch = queries[start:start + batch_size]
+            q_all, t_all = [], []
+            for c, (sorted_values, order) in enumerate(self.sorted_chunks):
+                probes = (self._chunk(batch, c)[:, None] ^ masks[None, :]).ravel()
+                left = np.searchsorted(sorted_values, probes, side='left')
+                counts = np.searchsorted(sorted_values, probes, side='right') - left
+                total = int(counts.sum())
+                if total == 0:
+                    continue
+                # Expand each [left, right) bucket into individual candidate positions
+                offsets = np.arange(total) - np.repeat(np.cumsum(counts) - counts, counts)
+                q_all.append(np.repeat(np.arange(len(probes)) // len(masks), counts))
+                t_all.append(order[np.repeat(left, counts) + offsets])
+            if not q_all:
+                continue
+
+            # Verify full distances first - most candidates are far apart, so dedupe only the survivors
+            q_idx, t_idx = np.concatenate(q_all), np.concatenate(t_all)
+            keep = popcount64(batch[q_idx] ^ self.hashes[t_idx]) <= radius
+            pair_keys = np.unique(q_idx[keep] * len(self.hashes) + t_idx[keep])
+            q_idx, t_idx = pair_keys // len(self.hashes), pair_keys % len(self.hashes)
+            distance = popcount64(batch[q_idx] ^ self.hashes[t_idx])
+            results.append((q_idx + start, t_idx, distance))
+
+        if not results:
+            empty = np.zeros(0, dtype=np.int64)
+            return empty, empty, empty
+        return tuple(np.concatenate(parts) for parts in zip(*results))
+
+def find_leakage(data_yaml_path, radius=4, cache_dir=None, data_config=None, workers=None):
+    """Near-duplicate image pairs that sit in different splits"""
+    if data_config is None:
+        with open(data_yaml_path, 'r') as f:
+            data_config = yaml.safe_load(f)
+    cache_dir = Path(cache_dir) if cache_dir else Path(data_yaml_path).parent / ".dataset_cache"
+
+    cache = HashCache(cache_dir / "dhash_cache.npz")
+    split_hashes = {}
+    for split, split_dir in split_dirs(data_config).items():
+        split_hashes[split] = cache.hash_directory(split_dir / "images", workers)
+    cache.save()
+
+    pairs = []
+    splits = list(split_hashes)
+    for i, split_a in enumerate(splits):
+        names_a, hashes_a = split_hashes[split_a]
+        if len(hashes_a) == 0:
+            continue
+        index = MultiIndexHash(hashes_a)
+        for split_b in splits[i + 1:]:
+            names_b, hashes_b = split_hashes[split_b]
+            q_idx, t_idx, distance = index.query(hashes_b, radius)
+            for q, t, d in zip(q_idx.tolist(), t_idx.tolist(), distance.tolist()):
+                pairs.append({'split_a': split_a, 'image_a': names_a[t],
+                              'split_b': split_b, 'image_b': names_b[q], 'distance': d})
+
+    pairs.sort(key=lambda p: (p['distance'], p['split_a'], p['image_a']))
+    return pairs
+
+def write_report(pairs, output_file):
+    output_file = Path(output_file)
+    output_file.parent.mkdir(parents=True, exist_ok=True)
+    with open(output_file, 'w', newline='') as f:
+        writer = csv.DictWriter(f, fieldnames=['split_a', 'image_a', 'split_b', 'image_b', 'distance'])
+        writer.writeheader()
+        writer.writerows(pairs)
+    return output_file
+
+def main():
+    parser = argparse.ArgumentParser(description="Find near-duplicate images shared between dataset splits")
+    parser.add_argument('data_yaml')
+    parser.add_argument('--radius', type=int, default=4, help="Max Hamming distance between 64-bit dHashes")
+    parser.add_argument('--cache-dir', help="Hash cache location (default: <dataset>/.dataset_cache)")
+    parser.add_argument('--report', help="CSV output (default: <dataset>/leakage_report.csv)")
+    parser.add_argument('--workers', type=int)
+    args = parser.parse_args()
+
+    print("🔍 Checking for cross-split leakage...")
+    pairs = find_leakage(args.data_yaml, args.radius, args.cache_dir, workers=args.workers)
+    if not pairs:
+        print("✅ No near-duplicates across splits")
+        return 0
+
+    for pair in pairs[:20]:
+        print(f"   ❌ {pair['split_a']}/{pair['image_a']} ~ {pair['split_b']}/{pair['image_b']} (distance {pair['distance']})")
+    if len(pairs) > 20:
+        print(f"   ... and {len(pairs) - 20} more")
+    report = write_report(pairs, args.report or Path(args.data_yaml).parent / "leakage_report.csv")
+    print(f"\n⚠️  {len(pairs)} leaked pairs - report saved: {report}")
+    return 1
+
+if __name__ == "__main__":
+    raise SystemExit(main())
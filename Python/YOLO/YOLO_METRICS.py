@@ -0,0 +1,66 @@
+import numpy as np
+
+def box_iou(boxes1, boxes2):
+    """Vectorized IoU matrix (N, M) between two sets of xyxy boxes"""
+    boxes1 = np.asarray(boxes1, dtype=np.float32).reshape(-1, 4)
+    boxes2 = np.asarray(boxes2, dtype=np.float32).reshape(-1, 4)
+    
+    top_left = np.maximum(boxes1[:, None, :2], boxes2[None, :, :2])
+    bottom_right = np.minimum(boxes1[:, None, 2:], boxes2[None, :, 2:])
+    inter = np.clip(bottom_right - top_left, 0, None).prod(axis=2)
+    
+    area1 = (boxes1[:, 2] - boxes1[:, 0]) * (boxes1[:, 3] - boxes1[:, 1])
+    area2 = (boxes2[:, 2] - boxes2[:, 0]) * (boxes2[:, 3] - boxes2[:, 1])
+    union = area1[:, None] + area2[None, :] - inter
+    return np.where(union > 0, inter / np.maximum(union, 1e-9), 0.0)
+
+def match_boxes(iou, iou_threshold):
+    """Greedy one-to-one matching on an IoU matrix, best pairs first. Returns (K, 2) index pairs"""
+    pairs = np.argwhere(iou >= iou_threshold)
+    if len(pairs) == 0:
+        return pairs
+    pairs = pairs[np.argsort(-iou[pairs[:, 0], pairs[:, 1]], kind='stable')]
+    used_rows, used_cols, keep = set(), set(), []
+    for k, (i, j) in enumerate(pairs.tolist()):
+        if i not in used_rows and j not in used_cols:
+            used_rows.add(i)
+            used_cols.add(j)
+            keep.append(k)
+    return pairs[keep]
+
+def compute_detection_metrics(tp, conf, pred_cls, target_cls, conf_threshold):
+    """Precision/recall at conf_threshold and COCO-style mAP@.5 / mAP@.5:.95 (101-point interpolation)"""
+    order = np.argsort(-conf, kind='stable')
+    tp, conf, pred_cls = tp[order], conf[order], pred_cls[order]
+    
+    classes = np.unique(target_cls)
+    ap = np.zeros((len(classes), tp.shape[1]))
+    recall_points = np.linspace(0, 1, 101)
+    
+    for ci, c in enumerate(classes):
+        is_class = pred_cls == c
+        n_gt = (target_cls == c).sum()
+        if is_class.sum() == 0 or n_gt == 0:
+            continue
+        
+        tpc = tp[is_class].cumsum(axis=0)
+        fpc = (~tp[is_class]).cumsum(axis=0)
+        recall = tpc / n_gt
+        precision = tpc / (tpc + fpc)
+        
+        for j in range(tp.shape[1]):
+            # Precision envelope sampled at fixed recall points (0 past the max recall reached)
+            envelope = np.flip(np.maximum.accumulate(np.flip(precision[:, j])))
+            idx = np.searchsorted(recall[:, j], recall_points, side='left')
+            sampled = np.where(idx < len(envelope), envelope[np.minimum(idx, len(envelope) - 1)], 0.0)
+            ap[ci, j] = sampled.mean()
+    
+    confident = conf >= conf_threshold
+    true_positives = tp[confident, 0].sum()
+    return {
+        'precision': float(true_positives / confident.sum()) if confident.sum() else 0.0,
+        'recall': float(true_positives / len(target_cls)) if len(target_cls) else 0.0,
+        'map50': float(ap[:, 0].mean()) if len(classes) else 0.0,
+        'map50_95': float(ap.mean()) if len(classes) else 0.0,
+        'ground_truth_boxes': int(len(target_cls))
+    }
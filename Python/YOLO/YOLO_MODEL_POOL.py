@@ -0,0 +1,223 @@
+import hashlib
+import json
+import os
+import shutil
+import threading
+from collections import OrderedDict
+from concurrent.futures import Future
+from pathlib import Path
+
+import numpy as np
+import torch
+from ultralytics import YOLO
+
+# Export format -> file/dir suffix ultralytics produces
+VARIANT_SUFFIXES = {'torchscript': '.torchscript', 'onnx': '.onnx', 'openvino': '_openvino_model', 'engine': '.engine'}
+
+_hash_lock = threading.Lock()
+_hash_cache = {}
+
+def resolve_device(device='auto'):
+    if device == 'auto':
+        return 'cuda' if torch.cuda.is_available() else 'cpu'
+    return str(device)
+
+def weights_hash(model_path):
+    """sha256 of a weights file, remembered per (path, size, mtime) so each file is read once"""
+    path = Path(model_path).resolve()
+    if path.is_dir():  # Exported model folders (e.g. OpenVINO) - hash the file listing instead
+        st = path.stat()
+        key = (str(path), 0, st.st_mtime_ns)
+        content = "\n".join(f"{p.name}:{p.stat().st_size}" for p in sorted(path.iterdir())).encode()
+    else:
+        st = path.stat()
+        key = (str(path), st.st_size, st.st_mtime_ns)
+        content = None
+
+    with _hash_lock:
+        if key in _hash_cache:
+            return _hash_cache[key]
+
+    if content is not None:
+        digest = hashlib.sha256(content).hexdigest()
+    else:
+        sha = hashlib.sha256()
+        with open(path, 'rb') as f:
+            for chunk in iter(lambda: f.read(1024 * 1024), b''):
+                sha.update(chunk)
+        digest = sha.hexdigest()
+
+    with _hash_lock:
+        _hash_cache[key] = digest
+    return digest
+
+class PooledModel:
+    """
+    A pooled YOLO model shared by every caller in the process.
+
+    ultralytics keeps per-call state on the model's predictor, so concurrent predict() calls on one
+    instance are not safe; they are serialized here (streamed predictions hold the lock until the
+    generator is exhausted or closed). Any other attribute is passed through to the YOLO model.
+    """
+
+    def __init__(self, yolo):
+        self.yolo = yolo
+        self.lock = threading.RLock()
+
+    def predict(self, *args, **kwargs):
+        if kwargs.get('stream'):
+            return self._predict_stream(*args, **kwargs)
+        with self.lock:
+            return self.yolo.predict(*args, **kwargs)
+
+    __call__ = predict
+
+    def _predict_stream(self, *args, **kwargs):
+        with self.lock:
+            yield from self.yolo.predict(*args, **kwargs)
+
+    def __getattr__(self, name):
+        return getattr(self.yolo, name)
+
+class ModelPool:
+    """
+    Process-wide cache of loaded, warmed-up YOLO models.
+
+    Models are keyed by (weights hash, device, precision), so the same checkpoint under two paths is
+    loaded once, and a retrained checkpoint at the same path is picked up as a new entry. At most
+    max_models stay loaded; the least recently used one is dropped when another is loaded.
+    """
+
+    def __init__(self, cache_dir=None, max_models=4):
+        self.cache_dir = Path(cache_dir) if cache_dir else Path.home() / ".cache" / "yolo_model_pool"
+        self.max_models = max_models
+        self.models = OrderedDict()
+        self.loading = {}  # key -> Future of a load in progress
+        self.lock = threading.Lock()
+        self.stats = {'hits': 0, 'misses': 0, 'evictions': 0}
+
+    def _key(self, model_path, device, half):
+        device = resolve_device(device)
+        is_pt = Path(model_path).suffix == '.pt'
+        precision = 'fp16' if half and is_pt and device.startswith('cuda') else 'fp32'
+        return weights_hash(model_path), device, precision
+
+    def get(self, model_path, device='auto', half=False, warmup=True, imgsz=640):
+        """A ready-to-use PooledModel; the first call per key loads, moves, converts and warms it up"""
+        key = self._key(model_path, device, half)
+
+        # The pool lock only guards the lookup and the insert/evict; loading happens outside it so a
+        # slow load never blocks lookups of other models. Concurrent callers for the same key wait on
+        # the loader's future instead of loading a second copy.
+        with self.lock:
+            if key in self.models:
+                self.stats['hits'] += 1
+                self.models.move_to_end(key)
+                return self.models[key]
+            pending = self.loading.get(key)
+            if pending is None:
+                self.stats['misses'] += 1
+                self.loading[key] = future = Future()
+        if pending is not None:
+            return pending.result()
+
+        try:
+            pooled = PooledModel(self._load(model_path, key, warmup, imgsz))
+        except BaseException as e:
+            with self.lock:
+                del self.loading[key]
+            future.set_exception(e)
+            raise
+
+        with self.lock:
+            del self.loading[key]
+            self.models[key] = pooled
+            evicted = False
+            while self.max_models and len(self.models) > self.max_models:
+                self.models.popitem(last=False)
+                self.stats['evictions'] += 1
+                evicted = True
+        future.set_result(pooled)
+        if evicted:
+            _empty_cuda_cache()
+        return pooled
+
+    def _load(self, model_path, key, warmup, imgsz):
+        _, device, precision = key
+        # Exported ONNX/OpenVINO/TorchScript models manage their own device
+        model = YOLO(str(model_path), task='detect')
+        if Path(model_path).suffix == '.pt':
+            model.to(device)
+            if precision == 'fp16' and hasattr(model.model, 'half'):
+                model.model.half()
+                print("⚡ FP16 enabled")
+
+        if warmup:
+            print("🔥 Warming up...")
+            dummy = np.random.randint(0, 255, (imgsz, imgsz, 3), dtype=np.uint8)
+            model.predict(dummy, imgsz=imgsz, device=device, verbose=False, save=False)
+        return model
+
+    def release(self, model_path, device='auto', half=False):
+        """Drop one model from the pool (callers still holding it keep it alive until they let go)"""
+        key = self._key(model_path, device, half)
+        with self.lock:
+            removed = self.models.pop(key, None) is not None
+        if removed:
+            _empty_cuda_cache()
+        return removed
+
+    def variant(self, model_path, format='torchscript', imgsz=640, half=False, device='auto'):
+        """
+        Path of an exported (fused) variant of a checkpoint, exported once and kept on disk.
+
+        Variants are stored under cache_dir by weights hash, so later runs - in any process - reuse the
+        export instead of paying for it again.
+        """
+        device = resolve_device(device)
+        precision = 'fp16' if half else 'fp32'
+        digest = weights_hash(model_path)
+        suffix = VARIANT_SUFFIXES[format]
+        target = self.cache_dir / f"{digest[:16]}_{imgsz}_{precision}{suffix}"
+        if target.exists():
+            return target
+
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        print(f"📦 Exporting {Path(model_path).name} to {format} (cached for next time)...")
+        exported = Path(YOLO(str(model_path)).export(format=format, imgsz=imgsz, half=half, device=device))
+
+        # Move the artifact into the cache; write atomically so a crash never leaves half a variant
+        staging = target.with_name(target.name + ".tmp")
+        if exported.is_dir():
+            shutil.move(str(exported), str(staging))
+        else:
+            shutil.copy2(exported, staging)
+        os.replace(staging, target)
+        with open(target.with_name(target.name + ".json"), 'w') as f:
+            json.dump({'source': str(model_path), 'sha256': digest, 'format': format,
+                       'imgsz': imgsz, 'precision': precision}, f, indent=2)
+        return target
+
+    def clear(self):
+        with self.lock:
+            self.models.clear()
+        _empty_cuda_cache()
+
+def _empty_cuda_cache():
+    if torch.cuda.is_available():
+        torch.cuda.empty_cache()
+
+_default_pool = None
+_default_pool_lock = threading.Lock()
+
+def get_pool():
+    """The shared pool for this process"""
+    global _default_pool
+    with _default_pool_lock:
+        if _default_pool is None:
+            _default_pool = ModelPool()
+        return _default_pool
+
+def get_model(model_path, device='auto', half=False, warmup=True, imgsz=640):
+    """Shortcut for get_pool().get(...)"""
+    return get_pool().get(model_path, device, half, warmup, imgsz)
@@ -0,0 +1,265 @@
+import argparse
+import json
+import os
+import random
+import shutil
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+from YOLO_DATASET import IMAGE_EXTENSIONS, LABEL_EXTENSIONS
+
+OPERATIONS = ('move', 'rename', 'delete')
+
+def scan_stems(directory, extensions):
+    """{stem: [file names]} for matching files in a directory (one scandir call, no per-file stat)"""
+    stems = {}
+    if os.path.isdir(directory):
+        with os.scandir(directory) as it:
+            for entry in it:
+                stem, ext = os.path.splitext(entry.name)
+                if ext.lower() in extensions:
+                    stems.setdefault(stem, []).append(entry.name)
+    return stems
+
+def scan_many(jobs, workers=8):
+    """Scan several (directory, extensions) pairs concurrently"""
+    with ThreadPoolExecutor(max_workers=max(1, min(workers, len(jobs)))) as executor:
+        return list(executor.map(lambda job: scan_stems(*job), jobs))
+
+class Plan:
+    """
+    A reviewable list of filesystem operations, stored as JSONL.
+
+    The first line is a header ({"plan": ..., "created": ...}); every other line is one operation
+    ({"id", "op", "src", "dst"}). Nothing touches the filesystem until apply_plan runs it.
+    """
+
+    def __init__(self, name, description=""):
+        self.name = name
+        self.description = description
+        self.ops = []
+
+    def add(self, op, src, dst=None):
+        if op not in OPERATIONS:
+            raise ValueError(f"Unknown operation: {op}")
+        self.ops.append({'id': len(self.ops), 'op': op, 'src': str(src), 'dst': str(dst) if dst else None})
+
+    def __len__(self):
+        return len(self.ops)
+
+    def summary(self):
+        counts = {}
+        for op in self.ops:
+            counts[op['op']] = counts.get(op['op'], 0) + 1
+        return counts
+
+    def write(self, plan_path):
+        plan_path = Path(plan_path)
+        plan_path.parent.mkdir(parents=True, exist_ok=True)
+        with open(plan_path, 'w', encoding='utf-8') as f:
+            f.write(json.dumps({'plan': self.name, 'description': self.description,
+                                'created': time.strftime("%Y-%m-%d %H:%M:%S"), 'operations': len(self.ops)}) + "\n")
+            for op in self.ops:
+                f.write(json.dumps(op) + "\n")
+        return plan_path
+
+    @classmethod
+    def load(cls, plan_path):
+        with open(plan_path, 'r', encoding='utf-8') as f:
+            header = json.loads(f.readline())
+            plan = cls(header['plan'], header.get('description', ""))
+            plan.ops = [json.loads(line) for line in f if line.strip()]
+        return plan
+
+    def print_preview(self, limit=10):
+        counts = ", ".join(f"{count} {op}" for op, count in self.summary().items()) or "nothing to do"
+        print(f"📋 Plan '{self.name}': {counts}")
+        for op in self.ops[:limit]:
+            target = f" -> {op['dst']}" if op['dst'] else ""
+            print(f"   {op['op']:>6}: {op['src']}{target}")
+        if len(self.ops) > limit:
+            print(f"   ... and {len(self.ops) - limit} more")
+
+def default_plan_path(plan, directory):
+    """Where a plan that is applied right away is kept (with its journal): <directory>/.plans/<name>_<time>.jsonl"""
+    return Path(directory) / ".plans" / f"{plan.name}_{time.strftime('%Y%m%d_%H%M%S')}.jsonl"
+
+def _apply_op(op, overwrite=False):
+    """Run one operation; returns 'done', 'skipped' (already applied) or raises"""
+    src, dst = op['src'], op['dst']
+    if op['op'] == 'delete':
+        if not os.path.exists(src):
+            return 'skipped'
+        os.remove(src)
+        return 'done'
+
+    # move / rename
+    if not os.path.exists(src):
+        if os.path.exists(dst):
+            return 'skipped'  # Applied by an earlier (interrupted) run
+        raise FileNotFoundError(src)
+    if os.path.exists(dst) and not overwrite:
+        raise FileExistsError(dst)
+    if op['op'] == 'rename' or os.path.dirname(os.path.abspath(src)) == os.path.dirname(os.path.abspath(dst)):
+        os.replace(src, dst)
+    else:
+        shutil.move(src, dst)
+    return 'done'
+
+def apply_plan(plan, plan_path=None, workers=16, overwrite=False, journal_path=None):
+    """
+    Apply a plan with a worker pool.
+
+    Every finished operation is appended to a journal (<plan>.journal), so an interrupted run can be
+    resumed by applying the same plan again: journaled operations are skipped, and operations whose
+    effect is already on disk count as 'skipped' rather than failing.
+    Returns {'done', 'skipped', 'failed', 'errors'}.
+    """
+    if isinstance(plan, (str, Path)):
+        plan_path, plan = plan, Plan.load(plan)
+    if journal_path is None and plan_path is not None:
+        journal_path = f"{plan_path}.journal"
+
+    finished = set()
+    if journal_path and os.path.exists(journal_path):
+        with open(journal_path, 'r', encoding='utf-8') as f:
+            for line in f:
+                entry = json.loads(line)
+                if entry['status'] in ('done', 'skipped'):
+                    finished.add(entry['id'])
+
+    pending = [op for op in plan.ops if op['id'] not in finished]
+    # Create destination folders up front instead of racing on them from workers
+    for folder in {os.path.dirname(op['dst']) for op in pending if op['dst']}:
+        if folder:
+            os.makedirs(folder, exist_ok=True)
+
+    result = {'done': 0, 'skipped': len(plan.ops) - len(pending), 'failed': 0, 'errors': []}
+    lock = threading.Lock()
+    journal = open(journal_path, 'a', encoding='utf-8') if journal_path else None
+
+    def run(op):
+        try:
+            status, error = _apply_op(op, overwrite), None
+        except Exception as e:
+            status, error = 'failed', f"{type(e).__name__}: {e}"
+        with lock:
+            result[status] += 1
+            if error:
+                result['errors'].append((op['id'], op['src'], error))
+            if journal:
+                journal.write(json.dumps({'id': op['id'], 'status': status, 'error': error}) + "\n")
+                journal.flush()
+
+    try:
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            list(executor.map(run, pending))
+    finally:
+        if journal:
+            journal.close()
+    return result
+
+def print_result(result, plan_path=None):
+    print(f"   ✅ Done: {result['done']} | ⏭️  Skipped: {result['skipped']} | ❌ Failed: {result['failed']}")
+    for op_id, src, error in result['errors'][:10]:
+        print(f"   ❌ #{op_id} {src}: {error}")
+    if len(result['errors']) > 10:
+        print(f"   ... and {len(result['errors']) - 10} more")
+    if plan_path and result['failed']:
+        print(f"   🔁 Resume with: python YOLO_PLAN.py apply {plan_path}")
+
+# ----------------------------------------------------------------------------- planners
+
+def plan_unmatched_images(image_dir, label_dir, dest_dir, workers=8):
+    """Move every image that has no label file to dest_dir"""
+    image_stems, label_stems = scan_many([(image_dir, IMAGE_EXTENSIONS), (label_dir, LABEL_EXTENSIONS)], workers)
+    plan = Plan('unmatched_images', f"Move images without labels from {image_dir} to {dest_dir}")
+    for stem in sorted(set(image_stems) - set(label_stems)):
+        for name in image_stems[stem]:
+            plan.add('move', os.path.join(image_dir, name), os.path.join(dest_dir, name))
+    return plan, len(image_stems), len(set(image_stems) & set(label_stems))
+
+def plan_restore(source_dir, dest_dir):
+    """Move every file from source_dir back to dest_dir"""
+    plan = Plan('restore', f"Move files from {source_dir} back to {dest_dir}")
+    if os.path.isdir(source_dir):
+        with os.scandir(source_dir) as it:
+            for name in sorted(e.name for e in it if e.is_file()):
+                plan.add('move', os.path.join(source_dir, name), os.path.join(dest_dir, name))
+    return plan
+
+def plan_validation_split(train_dir, val_dir, fraction=0.2, seed=0, workers=8):
+    """Move a seeded random fraction of train image/label pairs into a new val split"""
+    train_dir, val_dir = Path(train_dir), Path(val_dir)
+    image_stems, label_stems = scan_many([(train_dir / "images", IMAGE_EXTENSIONS),
+                                          (train_dir / "labels", LABEL_EXTENSIONS)], workers)
+    stems = sorted(image_stems)
+    random.Random(seed).shuffle(stems)
+
+    plan = Plan('validation_split', f"Move {fraction:.0%} of {train_dir} into {val_dir} (seed {seed})")
+    for stem in stems[:max(1, int(len(stems) * fraction))] if stems else []:
+        for name in image_stems[stem]:
+            plan.add('move', train_dir / "images" / name, val_dir / "images" / name)
+        for name in label_stems.get(stem, []):
+            plan.add('move', train_dir / "labels" / name, val_dir / "labels" / name)
+    return plan
+
+def main():
+    parser = argparse.ArgumentParser(description="Plan and apply dataset file operations")
+    sub = parser.add_subparsers(dest='command', required=True)
+
+    unmatched_parser = sub.add_parser('unmatched', help="Plan moving images without labels")
+    unmatched_parser.add_argument('--images', required=True)
+    unmatched_parser.add_argument('--labels', required=True)
+    unmatched_parser.add_argument('--dest', required=True)
+    unmatched_parser.add_argument('-o', '--output', required=True, help="Plan file (.jsonl)")
+
+    split_parser = sub.add_parser('split', help="Plan creating a val split from train")
+    split_parser.add_argument('--train', required=True, help="Train split folder (with images/ and labels/)")
+    split_parser.add_argument('--val', required=True)
+    split_parser.add_argument('--fraction', type=float, default=0.2)
+    split_parser.add_argument('--seed', type=int, default=0)
+    split_parser.add_argument('-o', '--output', required=True)
+
+    restore_parser = sub.add_parser('restore', help="Plan moving files back into a folder")
+    restore_parser.add_argument('--source', required=True)
+    restore_parser.add_argument('--dest', required=True)
+    restore_parser.add_argument('-o', '--output', required=True)
+
+    show_parser = sub.add_parser('show', help="Preview a plan")
+    show_parser.add_argument('plan')
+    show_parser.add_argument('--limit', type=int, default=20)
+
+    apply_parser = sub.add_parser('apply', help="Apply (or resume) a plan")
+    apply_parser.add_argument('plan')
+    apply_parser.add_argument('--workers', type=int, default=16)
+    apply_parser.add_argument('--overwrite', action='store_true', help="Replace existing destination files")
+
+    args = parser.parse_args()
+
+    if args.command in ('unmatched', 'split', 'restore'):
+        if args.command == 'unmatched':
+            plan = plan_unmatched_images(args.images, args.labels, args.dest)[0]
+        elif args.command == 'split':
+            plan = plan_validation_split(args.train, args.val, args.fraction, args.seed)
+        else:
+            plan = plan_restore(args.source, args.dest)
+        plan.print_preview()
+        print(f"💾 Plan written: {plan.write(args.output)}")
+
+    elif args.command == 'show':
+        Plan.load(args.plan).print_preview(args.limit)
+
+    elif args.command == 'apply':
+        start = time.time()
+        result = apply_plan(args.plan, workers=args.workers, overwrite=args.overwrite)
+        print_result(result)
+        print(f"⏱️  {time.time() - start:.1f}s")
+        return 1 if result['failed'] else 0
+
+    return 0
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,314 @@
+import argparse
+import csv
+import json
+import sqlite3
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    session TEXT UNIQUE NOT NULL,
+    created_at TEXT NOT NULL,
+    status TEXT NOT NULL,
+    target_class TEXT,
+    base_model TEXT,
+    run_name TEXT,
+    data_yaml TEXT,
+    dataset_fingerprint TEXT,
+    config_json TEXT,
+    train_images INTEGER,
+    val_images INTEGER,
+    epochs_completed INTEGER,
+    total_time REAL,
+    train_throughput REAL,
+    model_path TEXT,
+    model_size_mb REAL,
+    inference_speed REAL,
+    detection_rate REAL,
+    precision REAL,
+    recall REAL,
+    map50 REAL,
+    map50_95 REAL,
+    report_json TEXT
+);
+CREATE TABLE IF NOT EXISTS epoch_metrics (
+    run_id INTEGER NOT NULL REFERENCES runs(id) ON DELETE CASCADE,
+    epoch INTEGER NOT NULL,
+    map50_95 REAL,
+    metrics_json TEXT NOT NULL,
+    PRIMARY KEY (run_id, epoch)
+);
+CREATE TABLE IF NOT EXISTS dataset_validations (
+    fingerprint TEXT PRIMARY KEY,
+    data_yaml TEXT,
+    validated_at TEXT NOT NULL,
+    result_json TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_runs_class ON runs(target_class, created_at);
+CREATE INDEX IF NOT EXISTS idx_runs_fingerprint ON runs(dataset_fingerprint);
+"""
+
+# Columns shown by `list` and compared by `compare`
+SUMMARY_COLUMNS = ['session', 'status', 'target_class', 'epochs_completed', 'train_throughput',
+                   'inference_speed', 'model_size_mb', 'precision', 'recall', 'map50', 'map50_95']
+
+class RunRegistry:
+    """SQLite index of every training run: config, dataset, epoch metrics, speed, size and eval results"""
+
+    def __init__(self, db_path):
+        self.db_path = Path(db_path)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        with self._connect() as conn:
+            conn.executescript(SCHEMA)
+
+    @contextmanager
+    def _connect(self):
+        """Connection that commits (or rolls back) and is closed on exit, so no file handle outlives a call"""
+        conn = sqlite3.connect(self.db_path)
+        try:
+            conn.row_factory = sqlite3.Row
+            conn.execute("PRAGMA foreign_keys = ON")
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    def record_run(self, session, training_stats, test_stats=None, base_model=None, run_name=None,
+                   data_yaml=None, report_json=None, status='completed', results_csv=None):
+        """Insert or update a run, plus its per-epoch metrics from ultralytics' results.csv"""
+        test_stats = test_stats or {}
+        class_dist = training_stats.get('class_distribution') or {}
+        train_images = class_dist.get('train_images')
+        total_time = training_stats.get('total_time')
+        epochs = training_stats.get('epochs_completed')
+
+        train_throughput = None
+        if train_images and epochs and total_time:
+            train_throughput = train_images * epochs / total_time
+
+        row = {
+            'session': session,
+            'created_at': datetime.now().isoformat(timespec='seconds'),
+            'status': status,
+            'target_class': training_stats.get('target_class'),
+            'base_model': str(base_model) if base_model else None,
+            'run_name': run_name,
+            'data_yaml': str(data_yaml) if data_yaml else None,
+            'dataset_fingerprint': training_stats.get('dataset_fingerprint'),
+            'config_json': json.dumps(training_stats.get('train_config'), default=str, sort_keys=True),
+            'train_images': train_images,
+            'val_images': class_dist.get('val_images'),
+            'epochs_completed': epochs,
+            'total_time': total_time,
+            'train_throughput': train_throughput,
+            'model_path': training_stats.get('model_path'),
+            'model_size_mb': training_stats.get('model_size'),
+            'inference_speed': test_stats.get('inference_speed'),
+            'detection_rate': test_stats.get('detection_rate'),
+            'precision': test_stats.get('precision'),
+            'recall': test_stats.get('recall'),
+            'map50': test_stats.get('map50'),
+            'map50_95': test_stats.get('map50_95'),
+            'report_json': str(report_json) if report_json else None
+        }
+
+        columns = ', '.join(row)
+        placeholders = ', '.join(f":{k}" for k in row)
+        updates = ', '.join(f"{k} = excluded.{k}" for k in row if k not in ('session', 'created_at'))
+
+        with self._connect() as conn:
+            conn.execute(f"INSERT INTO runs ({columns}) VALUES ({placeholders}) "
+                         f"ON CONFLICT(session) DO UPDATE SET {updates}", row)
+            run_id = conn.execute("SELECT id FROM runs WHERE session = ?", (session,)).fetchone()['id']
+
+            if results_csv and Path(results_csv).exists():
+                conn.execute("DELETE FROM epoch_metrics WHERE run_id = ?", (run_id,))
+                conn.executemany(
+                    "INSERT INTO epoch_metrics (run_id, epoch, map50_95, metrics_json) VALUES (?, ?, ?, ?)",
+                    [(run_id, epoch, metrics.get('metrics/mAP50-95(B)'), json.dumps(metrics))
+                     for epoch, metrics in read_results_csv(results_csv)]
+                )
+        return run_id
+
+    def import_report(self, report_path):
+        """Index a training_report_*.json written by OptimizedYOLOTrainer"""
+        with open(report_path, 'r') as f:
+            report = json.load(f)
+        return self.record_run(report['timestamp'], report.get('training_stats') or {}, report.get('test_stats'),
+                               report_json=report_path)
+
+    def runs(self, target_class=None, limit=None):
+        query = "SELECT * FROM runs"
+        params = []
+        if target_class:
+            query += " WHERE target_class = ?"
+            params.append(target_class)
+        query += " ORDER BY created_at DESC, id DESC"
+        if limit:
+            query += " LIMIT ?"
+            params.append(limit)
+        with self._connect() as conn:
+            return [dict(r) for r in conn.execute(query, params)][::-1]  # Oldest first
+
+    def get_run(self, session):
+        with self._connect() as conn:
+            row = conn.execute("SELECT * FROM runs WHERE session = ?", (session,)).fetchone()
+            return dict(row) if row else None
+
+    def epoch_metrics(self, session):
+        with self._connect() as conn:
+            rows = conn.execute(
+                "SELECT e.epoch, e.metrics_json FROM epoch_metrics e JOIN runs r ON r.id = e.run_id "
+                "WHERE r.session = ? ORDER BY e.epoch", (session,)
+            )
+            return [(r['epoch'], json.loads(r['metrics_json'])) for r in rows]
+
+    def find_runs(self, dataset_fingerprint, config_json=None, status='completed'):
+        """Runs trained on the same dataset fingerprint (and optionally identical settings)"""
+        query = "SELECT * FROM runs WHERE dataset_fingerprint = ? AND status = ?"
+        params = [dataset_fingerprint, status]
+        if config_json is not None:
+            query += " AND config_json = ?"
+            params.append(config_json)
+        with self._connect() as conn:
+            return [dict(r) for r in conn.execute(query + " ORDER BY created_at", params)]
+
+    def record_validation(self, fingerprint, data_yaml, result):
+        """Remember a successful dataset validation for this fingerprint"""
+        with self._connect() as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO dataset_validations (fingerprint, data_yaml, validated_at, result_json) "
+                "VALUES (?, ?, ?, ?)",
+                (fingerprint, str(data_yaml), datetime.now().isoformat(timespec='seconds'), json.dumps(result, default=str))
+            )
+
+    def get_validation(self, fingerprint):
+        with self._connect() as conn:
+            row = conn.execute("SELECT * FROM dataset_validations WHERE fingerprint = ?", (fingerprint,)).fetchone()
+        if not row:
+            return None
+        result = json.loads(row['result_json'])
+        result['validated_at'] = row['validated_at']
+        return result
+
+    def regressions(self, target_class=None, throughput_tolerance=0.10, accuracy_tolerance=0.01):
+        """Compare each completed run with the previous one of the same class and flag drops"""
+        flagged = []
+        previous = {}
+        for run in self.runs(target_class):
+            if run['status'] != 'completed':
+                continue
+            key = run['target_class']
+            prev = previous.get(key)
+            previous[key] = run
+            if prev is None:
+                continue
+
+            for metric in ('train_throughput', 'inference_speed'):
+                if prev[metric] and run[metric] is not None and run[metric] < prev[metric] * (1 - throughput_tolerance):
+                    flagged.append((prev['session'], run['session'], metric, prev[metric], run[metric]))
+
+            for metric in ('map50_95', 'map50', 'recall', 'precision'):
+                if prev[metric] is not None and run[metric] is not None and run[metric] < prev[metric] - accuracy_tolerance:
+                    flagged.append((prev['session'], run['session'], metric, prev[metric], run[metric]))
+        return flagged
+
+def read_results_csv(results_csv):
+    """Yield (epoch, metrics) from an ultralytics results.csv"""
+    with open(results_csv, 'r', newline='') as f:
+        for row in csv.DictReader(f):
+            metrics = {}
+            for key, value in row.items():
+                try:
+                    metrics[key.strip()] = float(value)
+                except (TypeError, ValueError):
+                    continue
+            if 'epoch' in metrics:
+                yield int(metrics.pop('epoch')), metrics
+
+def _fmt(value):
+    if value is None:
+        return "-"
+    if isinstance(value, float):
+        return f"{value:.3f}" if abs(value) < 10 else f"{value:.1f}"
+    return str(value)
+
+def main():
+    parser = argparse.ArgumentParser(description="Query the YOLO training run registry")
+    parser.add_argument('--db', required=True, help="Path to run_registry.db")
+    sub = parser.add_subparsers(dest='command', required=True)
+
+    list_parser = sub.add_parser('list', help="List runs")
+    list_parser.add_argument('--class', dest='target_class')
+    list_parser.add_argument('--limit', type=int)
+
+    show_parser = sub.add_parser('show', help="Show one run with its epoch metrics")
+    show_parser.add_argument('session')
+
+    compare_parser = sub.add_parser('compare', help="Compare two runs side by side")
+    compare_parser.add_argument('session_a')
+    compare_parser.add_argument('session_b')
+
+    reg_parser = sub.add_parser('regressions', help="Flag throughput/accuracy drops between consecutive runs")
+    reg_parser.add_argument('--class', dest='target_class')
+    reg_parser.add_argument('--throughput-tolerance', type=float, default=0.10)
+    reg_parser.add_argument('--accuracy-tolerance', type=float, default=0.01)
+
+    import_parser = sub.add_parser('import', help="Index existing training_report_*.json files")
+    import_parser.add_argument('reports_dir')
+
+    args = parser.parse_args()
+    registry = RunRegistry(args.db)
+
+    if args.command == 'list':
+        runs = registry.runs(args.target_class, args.limit)
+        print("  ".join(f"{c:>14}" for c in SUMMARY_COLUMNS))
+        for run in runs:
+            print("  ".join(f"{_fmt(run[c]):>14}" for c in SUMMARY_COLUMNS))
+        print(f"\n📊 {len(runs)} runs")
+
+    elif args.command == 'show':
+        run = registry.get_run(args.session)
+        if not run:
+            print(f"❌ Run not found: {args.session}")
+            return 1
+        for key, value in run.items():
+            if key != 'config_json':
+                print(f"   {key}: {_fmt(value)}")
+        print(f"   config: {run['config_json']}")
+        for epoch, metrics in registry.epoch_metrics(args.session):
+            print(f"   epoch {epoch:>3}: mAP50-95={_fmt(metrics.get('metrics/mAP50-95(B)'))}")
+
+    elif args.command == 'compare':
+        run_a, run_b = registry.get_run(args.session_a), registry.get_run(args.session_b)
+        if not run_a or not run_b:
+            print("❌ Both sessions must exist in the registry")
+            return 1
+        print(f"{'metric':<18} {args.session_a:>16} {args.session_b:>16} {'change':>10}")
+        for column in SUMMARY_COLUMNS[3:]:
+            a, b = run_a[column], run_b[column]
+            change = f"{(b - a) / a:+.1%}" if isinstance(a, (int, float)) and isinstance(b, (int, float)) and a else ""
+            print(f"{column:<18} {_fmt(a):>16} {_fmt(b):>16} {change:>10}")
+        if run_a['dataset_fingerprint'] != run_b['dataset_fingerprint']:
+            print("⚠️  Runs were trained on different datasets")
+
+    elif args.command == 'regressions':
+        flagged = registry.regressions(args.target_class, args.throughput_tolerance, args.accuracy_tolerance)
+        if not flagged:
+            print("✅ No regressions found")
+        for prev, run, metric, old, new in flagged:
+            print(f"❌ {metric}: {_fmt(old)} -> {_fmt(new)} ({prev} -> {run})")
+        return 1 if flagged else 0
+
+    elif args.command == 'import':
+        reports = sorted(Path(args.reports_dir).rglob("training_report*.json"))
+        for report in reports:
+            registry.import_report(report)
+        print(f"✅ Indexed {len(reports)} reports")
+
+    return 0
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,270 @@
+import argparse
+import json
+import os
+import queue
+import socketserver
+import threading
+import time
+import urllib.request
+from collections import deque
+from concurrent.futures import Future
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+import cv2
+import numpy as np
+
+from YOLO11s_v3 import OptimizedYOLOProcessor, get_optimal_batch_size, resolve_model_path
+
+class MicroBatcher:
+    """
+    Coalesces concurrent single-image requests into batches.
+
+    A batch is dispatched as soon as it is full or when the oldest request has waited max_latency_ms,
+    so a lone request is never held longer than the deadline and bursts share one forward pass.
+    """
+
+    def __init__(self, processor, max_batch_size=16, max_latency_ms=10, history=10000):
+        self.processor = processor
+        self.max_batch_size = max_batch_size
+        self.max_latency = max_latency_ms / 1000
+        self.requests = queue.Queue()
+        self.lock = threading.Lock()
+        self.latencies = deque(maxlen=history)
+        self.batch_sizes = deque(maxlen=history)
+        self.counters = {'requests': 0, 'batches': 0, 'errors': 0, 'inference_seconds': 0.0}
+        self.started = time.time()
+        self._stop = threading.Event()
+        self.thread = threading.Thread(target=self._run, daemon=True)
+        self.thread.start()
+
+    def submit(self, image, conf=0.4):
+        """Queue one decoded BGR image; returns a Future resolving to a detections dict"""
+        future = Future()
+        self.requests.put((time.perf_counter(), image, conf, future))
+        return future
+
+    def _collect(self):
+        try:
+            first = self.requests.get(timeout=0.1)
+        except queue.Empty:
+            return []
+        batch = [first]
+        deadline = first[0] + self.max_latency
+        while len(batch) < self.max_batch_size:
+            # Requests that queued up during the previous batch are taken right away, even past the deadline
+            remaining = deadline - time.perf_counter()
+            try:
+                batch.append(self.requests.get(timeout=remaining) if remaining > 0 else self.requests.get_nowait())
+            except queue.Empty:
+                break
+        return batch
+
+    def _run(self):
+        while not self._stop.is_set():
+            batch = self._collect()
+            if not batch:
+                continue
+
+            # One pass at the lowest requested threshold, then filter per request
+            min_conf = min(item[2] for item in batch)
+            start = time.perf_counter()
+            try:
+                results = list(self.processor.model.predict(
+                    source=[item[1] for item in batch], conf=min_conf, save=False, verbose=False,
+                    device=self.processor.device, batch=len(batch)
+                ))
+            except Exception as e:
+                with self.lock:
+                    self.counters['errors'] += len(batch)
+                for item in batch:
+                    item[3].set_exception(e)
+                continue
+            inference_time = time.perf_counter() - start
+
+            done = time.perf_counter()
+            served = []
+            for i, (queued_at, image, conf, future) in enumerate(batch):
+                # A bad result fails its own request only; the batcher thread must keep running
+                try:
+                    if i >= len(results):
+                        raise RuntimeError(f"Model returned {len(results)} results for {len(batch)} images")
+                    future.set_result(self._to_detections(results[i], conf, image.shape, (done - queued_at) * 1000))
+                    served.append(queued_at)
+                except Exception as e:
+                    if not future.done():
+                        future.set_exception(e)
+
+            with self.lock:
+                self.counters['requests'] += len(served)
+                self.counters['errors'] += len(batch) - len(served)
+                self.counters['batches'] += 1
+                self.counters['inference_seconds'] += inference_time
+                self.batch_sizes.append(len(batch))
+                self.latencies.extend((done - queued_at) * 1000 for queued_at in served)
+
+    def _to_detections(self, result, conf, shape, latency_ms):
+        boxes = []
+        if result.boxes is not None and len(result.boxes) > 0:
+            xywhn = result.boxes.xywhn.cpu().numpy()
+            scores = result.boxes.conf.cpu().numpy()
+            classes = result.boxes.cls.cpu().numpy().astype(int)
+            keep = scores >= conf
+            boxes = [[self.processor.class_id] + [round(float(v), 6) for v in box] + [round(float(score), 4), int(cls)]
+                     for box, score, cls in zip(xywhn[keep], scores[keep], classes[keep])]
+        return {'boxes': boxes, 'format': 'label x y w h score model_class', 'width': shape[1],
+                'height': shape[0], 'latency_ms': round(latency_ms, 2)}
+
+    def metrics(self):
+        with self.lock:
+            latencies = np.array(self.latencies) if self.latencies else np.zeros(1)
+            uptime = time.time() - self.started
+            return {
+                **self.counters,
+                'uptime_seconds': round(uptime, 1),
+                'throughput_per_second': round(self.counters['requests'] / uptime, 2) if uptime else 0.0,
+                'queue_depth': self.requests.qsize(),
+                'mean_batch_size': round(float(np.mean(self.batch_sizes)), 2) if self.batch_sizes else 0.0,
+                'latency_ms': {f"p{p}": round(float(np.percentile(latencies, p)), 2) for p in (50, 95, 99)},
+                'max_batch_size': self.max_batch_size,
+                'max_latency_ms': self.max_latency * 1000
+            }
+
+    def stop(self):
+        self._stop.set()
+        self.thread.join(timeout=1)
+
+class InferenceHandler(BaseHTTPRequestHandler):
+    """POST /predict (raw image bytes, ?conf=0.4), GET /metrics, GET /health"""
+
+    batcher = None
+    request_timeout = 30
+
+    def address_string(self):
+        # Unix-socket clients have no (host, port) address
+        return self.client_address[0] if isinstance(self.client_address, tuple) else "unix"
+
+    def log_message(self, format, *args):
+        pass  # Keep the console for startup/shutdown messages
+
+    def _send_json(self, status, payload):
+        body = json.dumps(payload).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        path = urlparse(self.path).path
+        if path == '/metrics':
+            self._send_json(200, self.batcher.metrics())
+        elif path == '/health':
+            self._send_json(200, {'status': 'ok'})
+        else:
+            self._send_json(404, {'error': f"Unknown endpoint: {path}"})
+
+    def do_POST(self):
+        url = urlparse(self.path)
+        if url.path != '/predict':
+            self._send_json(404, {'error': f"Unknown endpoint: {url.path}"})
+            return
+
+        length = int(self.headers.get('Content-Length') or 0)
+        if length <= 0:
+            self._send_json(400, {'error': "Send the encoded image as the request body"})
+            return
+        data = self.rfile.read(length)
+
+        # Decoding happens here, on the request's own thread, so it runs in parallel with inference
+        image = cv2.imdecode(np.frombuffer(data, dtype=np.uint8), cv2.IMREAD_COLOR)
+        if image is None:
+            self._send_json(400, {'error': "Could not decode image"})
+            return
+
+        try:
+            conf = float(parse_qs(url.query).get('conf', ['0.4'])[0])
+            detections = self.batcher.submit(image, conf).result(timeout=self.request_timeout)
+        except ValueError:
+            self._send_json(400, {'error': "conf must be a number"})
+            return
+        except Exception as e:
+            self._send_json(500, {'error': str(e)})
+            return
+        self._send_json(200, detections)
+
+# socketserver only defines UnixStreamServer where AF_UNIX exists (not on Windows)
+HAS_UNIX_SOCKETS = hasattr(socketserver, 'UnixStreamServer')
+
+if HAS_UNIX_SOCKETS:
+    class UnixThreadingHTTPServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+        daemon_threads = True
+
+        def server_bind(self):
+            socketserver.UnixStreamServer.server_bind(self)
+            self.server_name, self.server_port = "unix", 0
+
+def create_server(batcher, host='127.0.0.1', port=8765, unix_socket=None):
+    handler = type('BoundInferenceHandler', (InferenceHandler,), {'batcher': batcher})
+    if unix_socket:
+        if not HAS_UNIX_SOCKETS:
+            raise OSError("Unix sockets are not supported on this platform - use --host/--port")
+        if os.path.exists(unix_socket):
+            os.unlink(unix_socket)
+        return UnixThreadingHTTPServer(unix_socket, handler)
+    return ThreadingHTTPServer((host, port), handler)
+
+def predict_remote(image_path, url="http://127.0.0.1:8765", conf=0.4, timeout=30):
+    """Client helper: send one image file to a running server, get its detections dict"""
+    with open(image_path, 'rb') as f:
+        data = f.read()
+    request = urllib.request.Request(f"{url}/predict?conf={conf}", data=data,
+                                     headers={'Content-Type': 'application/octet-stream'})
+    with urllib.request.urlopen(request, timeout=timeout) as response:
+        return json.loads(response.read())
+
+def main():
+    parser = argparse.ArgumentParser(description="Local YOLO inference server with dynamic micro-batching")
+    parser.add_argument('model', help="Weights (.pt or exported) - or a labeling_model.json manifest")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--unix-socket', help="Serve on a Unix socket instead of TCP")
+    parser.add_argument('--class-id', type=int, default=2, help="Class id written in the returned labels")
+    parser.add_argument('--device', default='auto')
+    parser.add_argument('--batch-size', type=int, help="Max micro-batch size (default: based on GPU memory)")
+    parser.add_argument('--max-latency-ms', type=float, default=10, help="Max time a request waits for a batch to fill")
+    args = parser.parse_args()
+
+    if args.unix_socket and not HAS_UNIX_SOCKETS:
+        print("❌ --unix-socket is not supported on this platform - use --host/--port instead")
+        return 1
+
+    model_path = args.model
+    if model_path.endswith('.json'):
+        manifest_path = model_path
+        model_path = resolve_model_path(None, manifest_path)
+        if model_path is None:
+            print(f"❌ No published model found in manifest: {manifest_path}")
+            return 1
+    batch_size = args.batch_size or get_optimal_batch_size()
+
+    processor = OptimizedYOLOProcessor(model_path, class_id=args.class_id, device=args.device, batch_size=batch_size)
+    batcher = MicroBatcher(processor, batch_size, args.max_latency_ms)
+    server = create_server(batcher, args.host, args.port, args.unix_socket)
+
+    where = args.unix_socket or f"http://{args.host}:{args.port}"
+    print(f"🚀 Serving {model_path} on {where} (batch<={batch_size}, deadline {args.max_latency_ms}ms)")
+    print("   POST /predict?conf=0.4  |  GET /metrics  |  GET /health")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print("\n🛑 Shutting down")
+    finally:
+        server.server_close()
+        batcher.stop()
+        if args.unix_socket and os.path.exists(args.unix_socket):
+            os.unlink(args.unix_socket)
+    return 0
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,303 @@
+import argparse
+import json
+import mmap
+import os
+import tarfile
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import numpy as np
+
+from YOLO_DATASET import IMAGE_EXTENSIONS, SPLITS, split_dirs
+
+INDEX_FILE = "index.npy"
+MANIFEST_FILE = "manifest.json"
+TAR_BLOCK = tarfile.BLOCKSIZE
+
+def index_dtype(name_length):
+    """One row per image: where its bytes and its label's bytes live inside the shards"""
+    return np.dtype([
+        ('name', f'S{max(1, name_length)}'),
+        ('split', 'u1'),
+        ('shard', 'u4'),
+        ('image_offset', 'u8'),
+        ('image_size', 'u8'),
+        ('label_offset', 'u8'),
+        ('label_size', 'i8'),  # -1 = no label file
+    ])
+
+def prefetch(fn, items, workers=16, depth=256):
+    """Ordered executor.map with a bounded number of in-flight reads (keeps memory flat on huge folders)"""
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        pending = deque()
+        for item in items:
+            pending.append(executor.submit(fn, item))
+            if len(pending) >= depth:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+
+class ShardWriter:
+    """
+    Append-only writer for packed shards.
+
+    Images and labels go into plain (uncompressed) tar files of about shard_size_mb each, so the shards
+    stay readable with any tar tool. The byte offset of every member is recorded as it is written and
+    saved as a numpy index that readers memory-map.
+    """
+
+    def __init__(self, output_dir, shard_size_mb=1024):
+        self.output_dir = Path(output_dir)
+        self.output_dir.mkdir(parents=True, exist_ok=True)
+        self.shard_size = shard_size_mb * 1024 * 1024
+        self.shards = []
+        self.rows = []
+        self._tar = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    def _open_shard(self):
+        if self._tar is not None:
+            self._tar.close()
+        name = f"shard-{len(self.shards):05d}.tar"
+        self.shards.append(name)
+        self._tar = tarfile.open(self.output_dir / name, 'w', format=tarfile.GNU_FORMAT)
+
+    def _add_member(self, name, data):
+        info = tarfile.TarInfo(name)
+        info.size = len(data)
+        info.mtime = int(time.time())
+        self._tar.addfile(info, _BytesReader(data))
+        # tar.offset is now past the data's 512-byte padding - step back to the data start
+        return self._tar.offset - ((len(data) + TAR_BLOCK - 1) // TAR_BLOCK) * TAR_BLOCK
+
+    def add(self, split, name, image_bytes, label_bytes=None):
+        if self._tar is None or self._tar.offset >= self.shard_size:
+            self._open_shard()
+
+        image_offset = self._add_member(f"{split}/images/{name}", image_bytes)
+        label_offset, label_size = 0, -1
+        if label_bytes is not None:
+            label_offset = self._add_member(f"{split}/labels/{os.path.splitext(name)[0]}.txt", label_bytes)
+            label_size = len(label_bytes)
+
+        self.rows.append((name.encode('utf-8'), SPLITS.index(split), len(self.shards) - 1,
+                          image_offset, len(image_bytes), label_offset, label_size))
+
+    def close(self):
+        if self._tar is None and not self.rows:
+            return
+        if self._tar is not None:
+            self._tar.close()
+            self._tar = None
+
+        index = np.array(self.rows, dtype=index_dtype(max((len(r[0]) for r in self.rows), default=1)))
+        np.save(self.output_dir / INDEX_FILE, index)
+        counts = np.bincount(index['split'], minlength=len(SPLITS)) if len(index) else np.zeros(len(SPLITS), int)
+        manifest = {
+            'shards': self.shards,
+            'images': len(index),
+            'splits': {split: int(counts[i]) for i, split in enumerate(SPLITS) if counts[i]},
+            'created': time.strftime("%Y-%m-%d %H:%M:%S")
+        }
+        with open(self.output_dir / MANIFEST_FILE, 'w') as f:
+            json.dump(manifest, f, indent=2)
+
+class _BytesReader:
+    """Minimal file object over bytes for tarfile.addfile (avoids an extra BytesIO copy)"""
+
+    def __init__(self, data):
+        self.view = memoryview(data)
+        self.pos = 0
+
+    def read(self, size=-1):
+        end = len(self.view) if size is None or size < 0 else self.pos + size
+        chunk = self.view[self.pos:end]
+        self.pos += len(chunk)
+        return chunk
+
+def _read_pair(pair):
+    image_path, label_path = pair
+    with open(image_path, 'rb') as f:
+        image_bytes = f.read()
+    label_bytes = None
+    if label_path is not None and os.path.exists(label_path):
+        with open(label_path, 'rb') as f:
+            label_bytes = f.read()
+    return image_bytes, label_bytes
+
+def pack_folder(writer, split, image_dir, label_dir=None, workers=16):
+    """Append every image of a folder (and its label, if any) to the shards; returns the image count"""
+    names = []
+    if os.path.isdir(image_dir):
+        with os.scandir(image_dir) as it:
+            names = sorted(e.name for e in it if os.path.splitext(e.name)[1].lower() in IMAGE_EXTENSIONS)
+
+    pairs = [(os.path.join(image_dir, name),
+              os.path.join(label_dir, os.path.splitext(name)[0] + ".txt") if label_dir else None)
+             for name in names]
+    for name, (image_bytes, label_bytes) in zip(names, prefetch(_read_pair, pairs, workers)):
+        writer.add(split, name, image_bytes, label_bytes)
+    return len(names)
+
+def pack_dataset(data_yaml_path, output_dir, shard_size_mb=1024, workers=16):
+    """Pack every split of a YOLO dataset into shards under output_dir"""
+    import yaml
+    with open(data_yaml_path, 'r') as f:
+        data_config = yaml.safe_load(f)
+
+    counts = {}
+    with ShardWriter(output_dir, shard_size_mb) as writer:
+        for split, split_dir in split_dirs(data_config).items():
+            counts[split] = pack_folder(writer, split, split_dir / "images", split_dir / "labels", workers)
+            print(f"   📦 {split}: {counts[split]} images")
+    return counts
+
+class ShardReader:
+    """
+    Read-only access to packed shards through a memory-mapped index and memory-mapped tar files.
+
+    image_bytes() and iter_split() hand out zero-copy memoryviews into the mapped shards; they are only
+    valid until close() (closing while a view is still referenced raises BufferError), so copy with
+    bytes(...) anything that must outlive the reader.
+    """
+
+    def __init__(self, shard_dir):
+        self.shard_dir = Path(shard_dir)
+        with open(self.shard_dir / MANIFEST_FILE, 'r') as f:
+            self.manifest = json.load(f)
+        self.index = np.load(self.shard_dir / INDEX_FILE, mmap_mode='r')
+        self._maps = {}
+
+    def __len__(self):
+        return len(self.index)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    def close(self):
+        for handle, mapped in self._maps.values():
+            mapped.close()
+            handle.close()
+        self._maps = {}
+
+    def _shard(self, shard_id):
+        if shard_id not in self._maps:
+            handle = open(self.shard_dir / self.manifest['shards'][shard_id], 'rb')
+            self._maps[shard_id] = (handle, mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ))
+        return self._maps[shard_id][1]
+
+    def indices(self, split=None):
+        """Row numbers of a split in on-disk order, so iteration reads each shard sequentially"""
+        rows = np.arange(len(self.index)) if split is None else np.flatnonzero(self.index['split'] == SPLITS.index(split))
+        order = np.lexsort((self.index['image_offset'][rows], self.index['shard'][rows]))
+        return rows[order]
+
+    def name(self, i):
+        return self.index['name'][i].decode('utf-8')
+
+    def image_bytes(self, i):
+        """Encoded image as a memoryview into the shard (valid until close())"""
+        row = self.index[i]
+        mapped = self._shard(int(row['shard']))
+        return memoryview(mapped)[int(row['image_offset']):int(row['image_offset']) + int(row['image_size'])]
+
+    def label_text(self, i):
+        """Label file content, or None when the image had no label"""
+        row = self.index[i]
+        if row['label_size'] < 0:
+            return None
+        mapped = self._shard(int(row['shard']))
+        return mapped[int(row['label_offset']):int(row['label_offset']) + int(row['label_size'])].decode('utf-8')
+
+    def read_image(self, i):
+        """Decoded BGR image, like cv2.imread"""
+        import cv2
+        return cv2.imdecode(np.frombuffer(self.image_bytes(i), dtype=np.uint8), cv2.IMREAD_COLOR)
+
+    def iter_split(self, split=None, decode=False, workers=8):
+        """Yield (name, image, label text) in shard order - images are decoded on a thread pool if decode=True"""
+        rows = self.indices(split)
+        if decode:
+            images = prefetch(self.read_image, rows.tolist(), workers, depth=workers * 4)
+        else:
+            images = (self.image_bytes(i) for i in rows.tolist())
+        for i, image in zip(rows.tolist(), images):
+            yield self.name(i), image, self.label_text(i)
+
+    def unpack(self, output_dir, split=None):
+        """Write a split back out as images/ + labels/ folders (e.g. for ultralytics training)"""
+        output_dir = Path(output_dir)
+        image_dir, label_dir = output_dir / "images", output_dir / "labels"
+        image_dir.mkdir(parents=True, exist_ok=True)
+        label_dir.mkdir(parents=True, exist_ok=True)
+        count = 0
+        for name, data, label in self.iter_split(split):
+            with open(image_dir / name, 'wb') as f:
+                f.write(data)
+            if label is not None:
+                with open(label_dir / f"{os.path.splitext(name)[0]}.txt", 'w') as f:
+                    f.write(label)
+            count += 1
+        return count
+
+def main():
+    parser = argparse.ArgumentParser(description="Pack YOLO datasets into memory-mapped tar shards")
+    sub = parser.add_subparsers(dest='command', required=True)
+
+    pack_parser = sub.add_parser('pack', help="Pack a dataset (data.yaml) or a single image folder")
+    pack_parser.add_argument('output_dir')
+    pack_parser.add_argument('--data', help="data.yaml - packs every split")
+    pack_parser.add_argument('--images', help="Image folder (instead of --data)")
+    pack_parser.add_argument('--labels', help="Label folder for --images")
+    pack_parser.add_argument('--split', default='train', choices=SPLITS)
+    pack_parser.add_argument('--shard-size-mb', type=int, default=1024)
+    pack_parser.add_argument('--workers', type=int, default=16)
+
+    info_parser = sub.add_parser('info', help="Show shard contents")
+    info_parser.add_argument('shard_dir')
+
+    unpack_parser = sub.add_parser('unpack', help="Write a split back out as images/ and labels/")
+    unpack_parser.add_argument('shard_dir')
+    unpack_parser.add_argument('output_dir')
+    unpack_parser.add_argument('--split', choices=SPLITS)
+
+    args = parser.parse_args()
+    start = time.time()
+
+    if args.command == 'pack':
+        if args.data:
+            counts = pack_dataset(args.data, args.output_dir, args.shard_size_mb, args.workers)
+            total = sum(counts.values())
+        elif args.images:
+            with ShardWriter(args.output_dir, args.shard_size_mb) as writer:
+                total = pack_folder(writer, args.split, args.images, args.labels, args.workers)
+        else:
+            parser.error("pack needs --data or --images")
+        print(f"✅ Packed {total} images in {time.time() - start:.1f}s -> {args.output_dir}")
+
+    elif args.command == 'info':
+        with ShardReader(args.shard_dir) as reader:
+            labeled = int((reader.index['label_size'] >= 0).sum())
+            print(f"📦 {len(reader.manifest['shards'])} shards, {len(reader)} images ({labeled} labeled)")
+            for split, count in reader.manifest['splits'].items():
+                print(f"   {split}: {count}")
+
+    elif args.command == 'unpack':
+        with ShardReader(args.shard_dir) as reader:
+            count = reader.unpack(args.output_dir, args.split)
+        print(f"✅ Unpacked {count} images in {time.time() - start:.1f}s")
+
+    return 0
+
+if __name__ == "__main__":
+    raise SystemExit(main())
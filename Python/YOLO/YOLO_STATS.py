@@ -0,0 +1,201 @@
+import argparse
+import json
+from pathlib import Path
+
+import numpy as np
+import yaml
+
+from YOLO_DATASET import dataset_fingerprint, load_split_labels, split_dirs
+
+AREA_BINS = np.logspace(-5, 0, 26)        # Normalized box area (w*h), 1e-5 .. 1
+ASPECT_BINS = np.logspace(-2, 2, 33)      # Box w/h, 0.01 .. 100
+MAX_OBJECTS_BIN = 50                      # Objects-per-image histogram, last bin is "50+"
+
+def split_statistics(arrays, num_classes):
+    """Vectorized label statistics for one split"""
+    labels = arrays['labels']
+    image_index = arrays['image_index']
+    num_images = len(arrays['stems'])
+
+    classes = labels[:, 0].astype(np.int64)
+    w, h = labels[:, 3], labels[:, 4]
+    area = w * h
+    aspect = np.divide(w, h, out=np.zeros_like(w), where=h > 0)
+
+    per_image = np.bincount(image_index, minlength=num_images)
+    objects_hist = np.bincount(np.minimum(per_image, MAX_OBJECTS_BIN), minlength=MAX_OBJECTS_BIN + 1)
+
+    stats = {
+        'images': num_images,
+        'objects': int(len(labels)),
+        'empty_images': int((per_image == 0).sum()),
+        'empty_ratio': float((per_image == 0).mean()) if num_images else 0.0,
+        'objects_per_image_mean': float(per_image.mean()) if num_images else 0.0,
+        'objects_per_image_max': int(per_image.max()) if num_images else 0,
+        'objects_per_image_hist': objects_hist.tolist(),
+        'class_counts': np.bincount(classes[classes >= 0], minlength=num_classes).tolist() if len(classes) else [0] * num_classes,
+        'area_hist': np.histogram(area, bins=AREA_BINS)[0].tolist(),
+        'aspect_hist': np.histogram(aspect, bins=ASPECT_BINS)[0].tolist(),
+    }
+    if len(labels):
+        side = np.sqrt(area)
+        stats['box_side_percentiles'] = dict(zip(['p1', 'p5', 'p50', 'p95', 'p99'],
+                                                 np.percentile(side, [1, 5, 50, 95, 99]).round(5).tolist()))
+        stats['aspect_percentiles'] = dict(zip(['p5', 'p50', 'p95'], np.percentile(aspect, [5, 50, 95]).round(3).tolist()))
+    return stats
+
+def suggest_imgsz(box_side_p5, min_pixels=8, low=320, high=1280):
+    """Smallest multiple of 32 where the 5th-percentile box is still at least min_pixels wide"""
+    if not box_side_p5:
+        return 640
+    imgsz = int(np.ceil(min_pixels / box_side_p5 / 32) * 32)
+    return int(np.clip(imgsz, low, high))
+
+def kmeans_boxes(wh, k=9, iterations=30, seed=0):
+    """k-means on box (w, h) with 1 - IoU distance - cluster centers sorted by area (normalized units)"""
+    if len(wh) < k:
+        return wh[np.argsort(wh.prod(axis=1))].astype(float).round(5).tolist()
+    rng = np.random.default_rng(seed)
+    sample = wh[rng.choice(len(wh), size=min(len(wh), 100_000), replace=False)]
+    centers = sample[rng.choice(len(sample), size=k, replace=False)]
+
+    for _ in range(iterations):
+        inter = np.minimum(sample[:, None, 0], centers[None, :, 0]) * np.minimum(sample[:, None, 1], centers[None, :, 1])
+        union = sample.prod(axis=1)[:, None] + centers.prod(axis=1)[None, :] - inter
+        assign = np.argmax(inter / np.maximum(union, 1e-12), axis=1)
+        new_centers = np.array([np.median(sample[assign == i], axis=0) if np.any(assign == i) else centers[i]
+                                for i in range(k)])
+        if np.allclose(new_centers, centers):
+            break
+        centers = new_centers
+    return centers[np.argsort(centers.prod(axis=1))].astype(float).round(5).tolist()
+
+class DatasetStatistics:
+    """Label statistics for a YOLO dataset, cached by dataset fingerprint"""
+
+    def __init__(self, data_yaml_path, cache_dir=None):
+        self.data_yaml_path = Path(data_yaml_path)
+        self.cache_dir = Path(cache_dir) if cache_dir else self.data_yaml_path.parent / ".dataset_cache"
+        with open(self.data_yaml_path, 'r') as f:
+            self.data_config = yaml.safe_load(f)
+
+        names = self.data_config.get('names') or []
+        self.class_names = [names[i] for i in sorted(names)] if isinstance(names, dict) else list(names)
+
+    def compute(self, refresh=False):
+        """Statistics for every split - returned from the JSON cache when the dataset is unchanged"""
+        fingerprint = dataset_fingerprint(self.data_yaml_path, self.data_config)
+        stats_file = self.cache_dir / f"stats_{fingerprint['fingerprint']}.json"
+        if stats_file.exists() and not refresh:
+            with open(stats_file, 'r') as f:
+                return json.load(f)
+
+        num_classes = max(len(self.class_names), int(self.data_config.get('nc') or 0), 1)
+        results = {'fingerprint': fingerprint['fingerprint'], 'data_yaml': str(self.data_yaml_path),
+                   'class_names': self.class_names, 'splits': {}}
+        all_wh = []
+        for split, split_dir in split_dirs(self.data_config).items():
+            split_hash = fingerprint['splits'].get(split, {}).get('hash')
+            arrays = load_split_labels(split_dir, None if refresh else self.cache_dir, split_hash)
+            results['splits'][split] = split_statistics(arrays, num_classes)
+            if split == 'train':
+                all_wh.append(arrays['labels'][:, 3:5])
+
+        train = results['splits'].get('train', {})
+        wh = np.concatenate(all_wh) if all_wh else np.zeros((0, 2), dtype=np.float32)
+        results['suggested_imgsz'] = suggest_imgsz(train.get('box_side_percentiles', {}).get('p5'))
+        results['anchor_clusters'] = kmeans_boxes(wh[(wh > 0).all(axis=1)]) if len(wh) else []
+
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        with open(stats_file, 'w') as f:
+            json.dump(results, f, indent=2)
+        return results
+
+    def render_report(self, results, output_path=None):
+        """One-page PNG summary of the statistics"""
+        import matplotlib.pyplot as plt
+
+        output_path = Path(output_path) if output_path else self.cache_dir / f"stats_{results['fingerprint'][:12]}.png"
+        fig, axes = plt.subplots(2, 3, figsize=(18, 10))
+        fig.suptitle(f"Dataset statistics - {self.data_yaml_path}", fontsize=14)
+
+        labels = self.class_names
+        if not labels and results['splits']:
+            labels = [str(i) for i in range(len(next(iter(results['splits'].values()))['class_counts']))]
+        width = 0.8 / max(len(results['splits']), 1)
+        for i, (split, stats) in enumerate(results['splits'].items()):
+            x = np.arange(len(stats['class_counts']))
+            axes[0, 0].bar(x + i * width, stats['class_counts'], width=width, label=split)
+            axes[0, 1].bar(np.arange(MAX_OBJECTS_BIN + 1), stats['objects_per_image_hist'], alpha=0.5, label=split)
+            axes[0, 2].stairs(stats['area_hist'], AREA_BINS, label=split)
+            axes[1, 0].stairs(stats['aspect_hist'], ASPECT_BINS, label=split)
+
+        axes[0, 0].set_title("Class frequency")
+        if labels:
+            axes[0, 0].set_xticks(np.arange(len(labels)))
+            axes[0, 0].set_xticklabels(labels, rotation=45, ha='right')
+        axes[0, 1].set_title(f"Objects per image ({MAX_OBJECTS_BIN} = {MAX_OBJECTS_BIN}+)")
+        axes[0, 2].set_title("Box area (normalized)")
+        axes[0, 2].set_xscale('log')
+        axes[1, 0].set_title("Box aspect ratio (w/h)")
+        axes[1, 0].set_xscale('log')
+        for ax in (axes[0, 0], axes[0, 1], axes[0, 2], axes[1, 0]):
+            ax.legend()
+
+        clusters = np.array(results['anchor_clusters'])
+        axes[1, 1].set_title("Box size clusters (w, h)")
+        if len(clusters):
+            axes[1, 1].scatter(clusters[:, 0], clusters[:, 1])
+        axes[1, 1].set_xlabel("width")
+        axes[1, 1].set_ylabel("height")
+
+        summary = [f"Suggested imgsz: {results['suggested_imgsz']}", ""]
+        for split, stats in results['splits'].items():
+            summary.append(f"{split}: {stats['images']} images, {stats['objects']} objects")
+            summary.append(f"   empty: {stats['empty_ratio']:.1%}, per image: {stats['objects_per_image_mean']:.2f} "
+                           f"(max {stats['objects_per_image_max']})")
+            if 'box_side_percentiles' in stats:
+                p = stats['box_side_percentiles']
+                summary.append(f"   box side p5/p50/p95: {p['p5']:.3f} / {p['p50']:.3f} / {p['p95']:.3f}")
+        axes[1, 2].axis('off')
+        axes[1, 2].text(0, 1, "\n".join(summary), va='top', family='monospace', fontsize=10)
+
+        plt.tight_layout()
+        output_path.parent.mkdir(parents=True, exist_ok=True)
+        plt.savefig(output_path, dpi=100)
+        plt.close(fig)
+        return output_path
+
+def print_summary(results):
+    print(f"📊 Dataset statistics ({results['fingerprint'][:12]})")
+    for split, stats in results['splits'].items():
+        print(f"\n📁 {split.upper()}: {stats['images']} images, {stats['objects']} objects")
+        print(f"   Empty images: {stats['empty_images']} ({stats['empty_ratio']:.1%})")
+        print(f"   Objects/image: mean {stats['objects_per_image_mean']:.2f}, max {stats['objects_per_image_max']}")
+        names = results['class_names'] or [str(i) for i in range(len(stats['class_counts']))]
+        counts = ", ".join(f"{name}={count}" for name, count in zip(names, stats['class_counts']))
+        print(f"   Classes: {counts}")
+        if 'box_side_percentiles' in stats:
+            p = stats['box_side_percentiles']
+            print(f"   Box side (normalized) p1={p['p1']:.4f} p50={p['p50']:.4f} p99={p['p99']:.4f}")
+    print(f"\n🎯 Suggested imgsz: {results['suggested_imgsz']}")
+    if results['anchor_clusters']:
+        print(f"📐 Box size clusters (w, h): {results['anchor_clusters']}")
+
+def main():
+    parser = argparse.ArgumentParser(description="Label statistics for a YOLO dataset")
+    parser.add_argument('data_yaml')
+    parser.add_argument('--cache-dir', help="Where parsed labels and results are cached (default: <dataset>/.dataset_cache)")
+    parser.add_argument('--refresh', action='store_true', help="Ignore cached results and re-parse labels")
+    parser.add_argument('--report', help="Output PNG path (default: inside the cache dir)")
+    args = parser.parse_args()
+
+    stats = DatasetStatistics(args.data_yaml, args.cache_dir)
+    results = stats.compute(refresh=args.refresh)
+    print_summary(results)
+    report = stats.render_report(results, args.report)
+    print(f"\n🖼️  Report saved: {report}")
+    return 0
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -1,5 +1,6 @@
 from ultralytics import YOLO
 import torch
+import hashlib
 import shutil
 import os
 import time
@@ -10,12 +11,25 @@ import matplotlib.pyplot as plt
 from datetime import datetime
 import cv2
 import numpy as np
+from YOLO_REGISTRY import RunRegistry
+from YOLO_STATS import DatasetStatistics, print_summary
+from YOLO_LEAKAGE import find_leakage, write_report
+from YOLO_SHARDS import ShardReader
+from YOLO_MODEL_POOL import get_model
+from YOLO_PLAN import Plan, apply_plan, plan_validation_split, print_result
+from YOLO_DATASET import IMAGE_EXTENSIONS, dataset_fingerprint, directory_digest, validate_label_lines
+from YOLO_METRICS import box_iou, compute_detection_metrics, match_boxes
+
+# Export formats benchmarked against the .pt checkpoint, and the ones that support INT8
+EXPORT_FORMATS = ('onnx', 'openvino', 'torchscript')
+INT8_FORMATS = {'openvino'}
 
 class OptimizedYOLOTrainer:
-    def __init__(self, base_model_path, project_root, target_class=None):
+    def __init__(self, base_model_path, project_root, target_class=None, auto_fix=None):
         self.base_model_path = base_model_path
         self.project_root = Path(project_root)
         self.target_class = target_class
+        self.auto_fix = auto_fix  # None = ask before fixing the dataset, True/False = decide without prompting
         self.timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
         
         # Setup directories with class-specific naming
@@ -30,6 +44,12 @@ class OptimizedYOLOTrainer:
         # Device optimization
         self.device = self._setup_device()
         
+        # Run registry shared by every class/session under this project
+        self.registry = RunRegistry(self.project_root / "reports" / "run_registry.db")
+        self.run_name = None
+        self.reused_run = False  # True when train_model returned an earlier identical run instead of training
+        self.data_yaml_path = None
+        
         # Training statistics with class info
         self.training_stats = {
             'target_class': self.target_class,
@@ -68,6 +88,10 @@ class OptimizedYOLOTrainer:
         print(f"🔍 COMPREHENSIVE DATASET VALIDATION")
         print("-" * 40)
         
+        # Packed datasets: one sequential pass over the shards instead of a file open per label
+        if data_config.get('shards'):
+            return self._validate_shards(data_config)
+        
         issues_found = []
         fixes_applied = []
         
@@ -121,42 +145,47 @@ class OptimizedYOLOTrainer:
                 with open(label_file, 'r') as f:
                     lines = f.readlines()
                 
-                valid_label = True
-                for line_num, line in enumerate(lines, 1):
-                    line = line.strip()
-                    if not line:
-                        continue
-                    
-                    parts = line.split()
-                    if len(parts) != 5:
-                        invalid_labels.append(f"{label_file.name}:L{line_num} - Expected 5 values, got {len(parts)}")
-                        valid_label = False
-                        continue
-                    
-                    # Check if all parts are numbers
-                    try:
-                        class_id = int(parts[0])
-                        x, y, w, h = map(float, parts[1:5])
-                        
-                        # Check if values are in valid ranges
-                        if not (0 <= x <= 1 and 0 <= y <= 1 and 0 <= w <= 1 and 0 <= h <= 1):
-                            invalid_labels.append(f"{label_file.name}:L{line_num} - Coordinates out of range [0,1]")
-                            valid_label = False
-                        
-                        if class_id >= data_config['nc']:
-                            invalid_labels.append(f"{label_file.name}:L{line_num} - Class ID {class_id} >= num_classes {data_config['nc']}")
-                            valid_label = False
-                            
-                    except ValueError:
-                        invalid_labels.append(f"{label_file.name}:L{line_num} - Non-numeric values")
-                        valid_label = False
-                
-                if valid_label:
+                errors = validate_label_lines(label_file.name, lines, data_config['nc'])
+                invalid_labels.extend(errors)
+                if not errors:
                     valid_pairs += 1
                     
             except Exception as e:
                 invalid_labels.append(f"{label_file.name} - Error reading file: {e}")
         
+        return self._report_validation(issues_found, fixes_applied, valid_pairs, len(train_images),
+                                        missing_labels, invalid_labels)
+    
+    def _validate_shards(self, data_config):
+        """Same checks as _validate_dataset_structure, reading the packed shards sequentially"""
+        shard_dir = Path(data_config['shards'])
+        print(f"📦 Train shards: {shard_dir}")
+        
+        with ShardReader(shard_dir) as reader:
+            rows = reader.indices('train')
+            if len(rows) == 0:
+                return [f"No training images in shards: {shard_dir}"], [], 0, 0
+            
+            print(f"🔍 Checking {len(rows)} training images...")
+            valid_pairs = 0
+            invalid_labels = []
+            missing_labels = []
+            
+            for i in rows.tolist():
+                name, text = reader.name(i), reader.label_text(i)
+                if text is None:
+                    missing_labels.append(name)
+                    continue
+                
+                errors = validate_label_lines(f"{os.path.splitext(name)[0]}.txt", text.splitlines(), data_config['nc'])
+                invalid_labels.extend(errors)
+                if not errors:
+                    valid_pairs += 1
+        
+        return self._report_validation([], [], valid_pairs, len(rows), missing_labels, invalid_labels)
+    
+    def _report_validation(self, issues_found, fixes_applied, valid_pairs, total_images, missing_labels, invalid_labels):
+        """Print validation findings and collect them into issues_found"""
         # Report findings
         print(f"✅ Valid image-label pairs: {valid_pairs}")
         print(f"❌ Images missing labels: {len(missing_labels)}")
@@ -178,61 +207,58 @@ class OptimizedYOLOTrainer:
             if len(invalid_labels) > 10:
                 print(f"   ... and {len(invalid_labels) - 10} more")
         
-        return issues_found, fixes_applied, valid_pairs, len(train_images)
+        return issues_found, fixes_applied, valid_pairs, total_images
     
     def _fix_dataset_issues(self, data_yaml_path):
         """Attempt to fix common dataset issues"""
         print(f"\n🔧 ATTEMPTING TO FIX DATASET ISSUES")
         print("-" * 40)
         
-        # Clear any existing cache files
-        cache_files = list(Path(data_yaml_path).parent.rglob("*.cache"))
-        for cache_file in cache_files:
-            try:
-                cache_file.unlink()
-                print(f"🗑️  Cleared cache: {cache_file}")
-            except:
-                pass
-        
-        # Try to create missing validation split if not exists
         with open(data_yaml_path, 'r') as f:
             data_config = yaml.safe_load(f)
         
+        # Plan every change first (kept in the reports folder for review), then apply it in parallel
+        plan = Plan('fix_dataset', f"Fixes for {data_yaml_path}")
+        
+        # Clear any existing cache files
+        for cache_file in Path(data_yaml_path).parent.rglob("*.cache"):
+            plan.add('delete', cache_file)
+        
+        # Try to create missing validation split if not exists
+        val_path = None
         if 'val' not in data_config:
             train_path = Path(data_config['train']).parent
             val_path = train_path.parent / "val"
             
             if not val_path.exists():
-                # Create validation split from training data
+                # Move 20% of training data (seeded, so the plan is reproducible) to validation
                 print("📁 Creating validation split from training data...")
-                val_images = val_path / "images"
-                val_labels = val_path / "labels"
-                val_images.mkdir(parents=True, exist_ok=True)
-                val_labels.mkdir(parents=True, exist_ok=True)
-                
-                # Move 20% of training data to validation
-                train_images = list((train_path / "images").glob("*"))
-                val_count = max(1, len(train_images) // 5)  # 20% for validation
-                
-                import random
-                random.shuffle(train_images)
-                val_images_to_move = train_images[:val_count]
-                
-                for img_file in val_images_to_move:
-                    # Move image
-                    shutil.move(str(img_file), str(val_images / img_file.name))
-                    
-                    # Move corresponding label if exists
-                    label_file = train_path / "labels" / f"{img_file.stem}.txt"
-                    if label_file.exists():
-                        shutil.move(str(label_file), str(val_labels / label_file.name))
-                
-                # Update data.yaml
-                data_config['val'] = str(val_path / "labels")
-                with open(data_yaml_path, 'w') as f:
-                    yaml.dump(data_config, f, default_flow_style=False)
-                
-                print(f"✅ Created validation split with {val_count} images")
+                split_plan = plan_validation_split(train_path, val_path, fraction=0.2, seed=0)
+                for op in split_plan.ops:
+                    plan.add(op['op'], op['src'], op['dst'])
+            else:
+                val_path = None
+        
+        if not len(plan):
+            return data_config
+        
+        plan_file = plan.write(self.reports_dir / f"fix_plan_{self.timestamp}.jsonl")
+        plan.print_preview(limit=5)
+        result = apply_plan(plan, plan_file)
+        print_result(result)
+        print(f"📋 Plan and journal: {plan_file}")
+        
+        if val_path is not None:
+            (val_path / "images").mkdir(parents=True, exist_ok=True)
+            (val_path / "labels").mkdir(parents=True, exist_ok=True)
+            
+            # Update data.yaml
+            data_config['val'] = str(val_path / "labels")
+            with open(data_yaml_path, 'w') as f:
+                yaml.dump(data_config, f, default_flow_style=False)
+            
+            val_count = sum(1 for op in plan.ops if op['op'] == 'move' and Path(op['dst']).parent.name == "images")
+            print(f"✅ Created validation split with {val_count} images")
         
         return data_config
     
@@ -257,30 +283,58 @@ class OptimizedYOLOTrainer:
         for key, value in data_config.items():
             print(f"   {key}: {value}")
         
-        # Comprehensive dataset validation
-        issues_found, fixes_applied, valid_pairs, total_images = self._validate_dataset_structure(data_config)
+        # Skip the full scan when this exact dataset (file metadata + data.yaml) was validated before
+        fingerprint = dataset_fingerprint(data_yaml_path, data_config)['fingerprint']
+        cached = self.registry.get_validation(fingerprint)
         
-        # If issues found, attempt fixes
-        if issues_found:
-            print(f"\n⚠️  ISSUES FOUND: {len(issues_found)}")
-            for issue in issues_found:
-                print(f"   - {issue}")
+        if cached:
+            print(f"\n⚡ Dataset unchanged (fingerprint {fingerprint[:12]}) - reusing validation from {cached['validated_at']}")
+            valid_pairs, train_count, val_count = cached['valid_pairs'], cached['train_images'], cached['val_images']
+            leaked_pairs = cached.get('leaked_pairs')
+            if leaked_pairs:
+                print(f"⚠️  {leaked_pairs} near-duplicate pairs across splits (see leakage report)")
+        else:
+            # Comprehensive dataset validation
+            issues_found, fixes_applied, valid_pairs, total_images = self._validate_dataset_structure(data_config)
             
-            fix_choice = input(f"\n🔧 Attempt to fix dataset issues? (y/n): ").strip().lower()
-            if fix_choice == 'y':
-                data_config = self._fix_dataset_issues(data_yaml_path)
-                # Re-validate after fixes
-                issues_found, fixes_applied, valid_pairs, total_images = self._validate_dataset_structure(data_config)
-        
-        if valid_pairs == 0:
-            raise RuntimeError(f"No valid image-label pairs found! Please check your dataset structure.")
-        
-        # Final validation counts
-        train_path = Path(data_config['train']).parent / "images"
-        val_path = Path(data_config['val']).parent / "images" if 'val' in data_config else None
+            # If issues found, attempt fixes
+            if issues_found:
+                print(f"\n⚠️  ISSUES FOUND: {len(issues_found)}")
+                for issue in issues_found:
+                    print(f"   - {issue}")
+                
+                if self.auto_fix is None:
+                    fix_choice = input(f"\n🔧 Attempt to fix dataset issues? (y/n): ").strip().lower()
+                else:
+                    fix_choice = 'y' if self.auto_fix else 'n'
+                if fix_choice == 'y':
+                    data_config = self._fix_dataset_issues(data_yaml_path)
+                    # Re-validate after fixes
+                    issues_found, fixes_applied, valid_pairs, total_images = self._validate_dataset_structure(data_config)
+            
+            if valid_pairs == 0:
+                raise RuntimeError(f"No valid image-label pairs found! Please check your dataset structure.")
+            
+            # Final validation counts
+            train_path = Path(data_config['train']).parent / "images"
+            val_path = Path(data_config['val']).parent / "images" if 'val' in data_config else None
+            
+            train_count = len([f for f in train_path.glob("*") if f.suffix.lower() in {'.jpg', '.jpeg', '.png', '.bmp', '.tiff'}]) if train_path.exists() else 0
+            val_count = len([f for f in val_path.glob("*") if f.suffix.lower() in {'.jpg', '.jpeg', '.png', '.bmp', '.tiff'}]) if val_path and val_path.exists() else 0
+            
+            # Re-splitting can put the same face in train and val
+            leaked_pairs = self._check_leakage(data_yaml_path, data_config)
+            
+            # Fixes move files around - fingerprint the dataset as it is now
+            fingerprint = dataset_fingerprint(data_yaml_path, data_config)['fingerprint']
+            if not issues_found:
+                self.registry.record_validation(fingerprint, data_yaml_path, {
+                    'valid_pairs': valid_pairs, 'train_images': train_count, 'val_images': val_count,
+                    'leaked_pairs': leaked_pairs
+                })
         
-        train_count = len([f for f in train_path.glob("*") if f.suffix.lower() in {'.jpg', '.jpeg', '.png', '.bmp', '.tiff'}]) if train_path.exists() else 0
-        val_count = len([f for f in val_path.glob("*") if f.suffix.lower() in {'.jpg', '.jpeg', '.png', '.bmp', '.tiff'}]) if val_path and val_path.exists() else 0
+        self.training_stats['dataset_fingerprint'] = fingerprint
+        self.training_stats['leaked_pairs'] = leaked_pairs
         
         print(f"\n✅ FINAL VALIDATION RESULTS:")
         print(f"   📸 Training images: {train_count}")
@@ -307,6 +361,26 @@ class OptimizedYOLOTrainer:
         
         return data_config, train_count, val_count
     
+    def _check_leakage(self, data_yaml_path, data_config, radius=4):
+        """Report near-duplicate images shared between splits; returns the number of pairs (None on error)"""
+        print(f"\n🔍 Checking for near-duplicates across splits...")
+        try:
+            pairs = find_leakage(data_yaml_path, radius, self.project_root / "reports" / "hash_cache", data_config)
+        except Exception as e:
+            print(f"⚠️  Leakage check failed: {e}")
+            return None
+        
+        if not pairs:
+            print("✅ No near-duplicates across splits")
+            return 0
+        
+        for pair in pairs[:5]:
+            print(f"   ❌ {pair['split_a']}/{pair['image_a']} ~ {pair['split_b']}/{pair['image_b']} (distance {pair['distance']})")
+        report = write_report(pairs, self.reports_dir / f"leakage_{self.timestamp}.csv")
+        print(f"⚠️  {len(pairs)} near-duplicate pairs across splits - validation metrics will be optimistic")
+        print(f"📄 Full list: {report}")
+        return len(pairs)
+    
     def _calculate_optimal_settings(self, train_count, gpu_memory_gb=None):
         """Calculate optimal training settings based on dataset size and hardware"""
         if gpu_memory_gb is None and torch.cuda.is_available():
@@ -347,8 +421,12 @@ class OptimizedYOLOTrainer:
         
         return settings
     
-    def train_model(self, data_yaml_path, custom_settings=None):
-        """Train model with optimizations"""
+    def train_model(self, data_yaml_path, custom_settings=None, reuse_duplicates=None):
+        """
+        Train model with optimizations.
+        reuse_duplicates: what to do when an identical run already exists - None asks (or reuses without
+        asking when auto_fix is set, i.e. non-interactive), True reuses its weights, False trains again.
+        """
         class_info = f" for class '{self.target_class}'" if self.target_class else ""
         print(f"🎯 STARTING OPTIMIZED YOLO FINE-TUNING{class_info}")
         print("="*60)
@@ -391,6 +469,28 @@ class OptimizedYOLOTrainer:
             'plots': True
         }
         
+        self.run_name = train_config['name']
+        self.data_yaml_path = data_yaml_path
+        self.training_stats['train_config'] = {k: v for k, v in train_config.items() if k not in ('data', 'project', 'name')}
+        
+        # Same dataset + same base model + same settings = a run we already have
+        duplicate = self._find_duplicate_run()
+        if duplicate:
+            print(f"\n⚠️  Duplicate training request: run {duplicate['session']} ({duplicate['run_name']}) already "
+                  f"trained {Path(self.base_model_path).name} on this dataset with identical settings")
+            if duplicate['map50_95'] is not None:
+                print(f"   Previous mAP@.5:.95: {duplicate['map50_95']:.3f}")
+            if reuse_duplicates is None:
+                if self.auto_fix is None:
+                    reuse_duplicates = input("🔁 Train again anyway? (y/n): ").strip().lower() != 'y'
+                else:
+                    reuse_duplicates = True
+            if reuse_duplicates and (self.runs_dir / duplicate['run_name'] / "weights" / "best.pt").exists():
+                print(f"♻️  Reusing weights from {duplicate['run_name']}")
+                self.run_name = duplicate['run_name']
+                self.reused_run = True
+                return None, duplicate['run_name']
+        
         print(f"🚀 Training configuration:")
         for key, value in train_config.items():
             if key not in ['data']:  # Don't print long paths
@@ -419,8 +519,21 @@ class OptimizedYOLOTrainer:
             print(f"❌ Training failed: {e}")
             self.training_stats['end_time'] = time.time()
             self.training_stats['total_time'] = self.training_stats['end_time'] - self.training_stats['start_time']
+            self._record_run(status='failed')
             raise
     
+    def _find_duplicate_run(self):
+        """Completed run with the same dataset fingerprint, base model and training settings"""
+        fingerprint = self.training_stats.get('dataset_fingerprint')
+        if not fingerprint:
+            return None
+        
+        config_json = json.dumps(self.training_stats['train_config'], default=str, sort_keys=True)
+        for run in self.registry.find_runs(fingerprint, config_json):
+            if run['base_model'] == str(self.base_model_path) and run['run_name']:
+                return run
+        return None
+    
     def save_best_model(self, run_name):
         """Save and organize the best model"""
         print(f"\n📦 Saving best model...")
@@ -445,14 +558,347 @@ class OptimizedYOLOTrainer:
         # Get model size
         model_size_mb = dst_path.stat().st_size / (1024 * 1024)
         self.training_stats['model_size'] = model_size_mb
+        self.training_stats['model_path'] = str(dst_path)
         
         print(f"✅ Best model saved: {dst_path}")
         print(f"📊 Model size: {model_size_mb:.2f} MB")
         
         return dst_path
+
+    def export_model(self, model_path, formats=EXPORT_FORMATS, imgsz=640, int8=False, data_yaml_path=None, calib_fraction=0.1):
+        """Export the model to deployment formats (optionally with INT8 variants)"""
+        print(f"\n📦 EXPORTING MODEL: {Path(model_path).name}")
+        print("-" * 40)
+
+        if int8 and not data_yaml_path:
+            print("⚠️  INT8 needs a calibration dataset (data_yaml_path) - skipping INT8 exports")
+            int8 = False
+
+        # (format, use_int8) jobs - INT8 only for formats that support it
+        jobs = [(fmt, False) for fmt in formats]
+        if int8:
+            jobs += [(fmt, True) for fmt in formats if fmt in INT8_FORMATS]
+
+        exported = {}
+        model = YOLO(model_path)
+
+        for fmt, use_int8 in jobs:
+            key = f"{fmt}-int8" if use_int8 else fmt
+            export_args = {'format': fmt, 'imgsz': imgsz, 'device': 'cpu', 'half': False}
+            if use_int8:
+                # Calibrate on a subset of the dataset
+                export_args.update({'int8': True, 'data': str(data_yaml_path), 'fraction': calib_fraction})
+
+            try:
+                export_start = time.time()
+                exported[key] = model.export(**export_args)
+                print(f"   ✅ {key}: {exported[key]} ({time.time() - export_start:.1f}s)")
+            except Exception as e:
+                print(f"   ❌ {key} export failed: {e}")
+
+        return exported
+
+    def benchmark_exports(self, model_path, exported, sample_images_dir, imgsz=640, conf_threshold=0.35,
+                          max_images=50, iou_threshold=0.5, parity_tolerance=0.05):
+        """CPU latency/throughput benchmark of every format plus detection parity against the .pt"""
+        print(f"\n⏱️  CPU BENCHMARK")
+        print("-" * 40)
+
+        image_exts = {'.jpg', '.jpeg', '.png', '.bmp'}
+        sample_images = sorted(str(f) for f in Path(sample_images_dir).glob("*") if f.suffix.lower() in image_exts)[:max_images]
+        if not sample_images:
+            print(f"❌ No benchmark images found in: {sample_images_dir}")
+            return []
+
+        print(f"📸 Benchmarking on {len(sample_images)} images (imgsz={imgsz}, conf={conf_threshold})")
+
+        def run_format(path):
+            model = YOLO(str(path), task='detect')
+            model.predict(sample_images[0], imgsz=imgsz, conf=conf_threshold, device='cpu', verbose=False)  # Warm up
+
+            latencies = []
+            detections = []
+            for img_path in sample_images:
+                start = time.perf_counter()
+                result = model.predict(img_path, imgsz=imgsz, conf=conf_threshold, device='cpu', verbose=False)[0]
+                latencies.append((time.perf_counter() - start) * 1000)
+
+                boxes = result.boxes
+                if boxes is not None and len(boxes) > 0:
+                    detections.append((boxes.xyxy.cpu().numpy(), boxes.cls.cpu().numpy()))
+                else:
+                    detections.append((np.zeros((0, 4), dtype=np.float32), np.zeros(0)))
+            return np.array(latencies), detections
+
+        def parity(reference, candidate):
+            # Fraction of boxes matched (same class, IoU >= threshold), averaged over images
+            scores = []
+            for (ref_boxes, ref_cls), (cand_boxes, cand_cls) in zip(reference, candidate):
+                total = max(len(ref_boxes), len(cand_boxes))
+                if total == 0:
+                    scores.append(1.0)
+                    continue
+                iou = box_iou(ref_boxes, cand_boxes)
+                iou[ref_cls[:, None] != cand_cls[None, :]] = 0
+                scores.append(len(match_boxes(iou, iou_threshold)) / total)
+            return float(np.mean(scores))
+
+        reference_latencies, reference_detections = run_format(model_path)
+        candidates = [('pytorch', model_path, reference_latencies, reference_detections)]
+
+        for key, path in exported.items():
+            try:
+                latencies, detections = run_format(path)
+                candidates.append((key, path, latencies, detections))
+            except Exception as e:
+                print(f"   ❌ {key} benchmark failed: {e}")
+
+        benchmarks = []
+        for key, path, latencies, detections in candidates:
+            parity_score = parity(reference_detections, detections)
+            benchmarks.append({
+                'format': key,
+                'path': str(path),
+                'size_mb': self._artifact_size_mb(path),
+                'latency_ms_mean': float(latencies.mean()),
+                'latency_ms_p50': float(np.percentile(latencies, 50)),
+                'latency_ms_p95': float(np.percentile(latencies, 95)),
+                'throughput': 1000 / latencies.mean() if latencies.mean() > 0 else 0,
+                'parity': parity_score,
+                'parity_ok': parity_score >= 1 - parity_tolerance
+            })
+
+        print(f"\n{'Format':<16} {'Size(MB)':>9} {'p50(ms)':>9} {'p95(ms)':>9} {'img/s':>8} {'Parity':>8}")
+        for b in benchmarks:
+            flag = "✅" if b['parity_ok'] else "❌"
+            print(f"{b['format']:<16} {b['size_mb']:>9.1f} {b['latency_ms_p50']:>9.1f} {b['latency_ms_p95']:>9.1f} "
+                  f"{b['throughput']:>8.1f} {b['parity']:>7.1%} {flag}")
+
+        return benchmarks
+
+    def publish_fastest(self, benchmarks):
+        """Publish the fastest artifact within parity tolerance for the labeling scripts"""
+        eligible = [b for b in benchmarks if b['parity_ok']]
+        if not eligible:
+            print("❌ No exported format passed the parity check - nothing published")
+            return None
+
+        fastest = min(eligible, key=lambda b: b['latency_ms_p50'])
+        manifest = {
+            'format': fastest['format'],
+            'path': fastest['path'],
+            'latency_ms_p50': fastest['latency_ms_p50'],
+            'parity': fastest['parity'],
+            'target_class': self.target_class,
+            'session': self.timestamp
+        }
+
+        # Labeling scripts read this manifest instead of a hardcoded weights path
+        manifest_path = self.models_dir / "labeling_model.json"
+        with open(manifest_path, 'w') as f:
+            json.dump(manifest, f, indent=2)
+
+        print(f"🚀 Published fastest model: {fastest['format']} ({fastest['latency_ms_p50']:.1f} ms/img)")
+        print(f"📄 Manifest: {manifest_path}")
+        return manifest_path
+
+    def export_and_benchmark(self, model_path, sample_images_dir, formats=EXPORT_FORMATS, imgsz=640,
+                             int8=False, data_yaml_path=None, parity_tolerance=0.05):
+        """Export stage: convert, benchmark on CPU, check parity and publish the fastest artifact"""
+        exported = self.export_model(model_path, formats, imgsz=imgsz, int8=int8, data_yaml_path=data_yaml_path)
+        benchmarks = self.benchmark_exports(model_path, exported, sample_images_dir, imgsz=imgsz,
+                                            parity_tolerance=parity_tolerance)
+        manifest_path = self.publish_fastest(benchmarks) if benchmarks else None
+
+        self.training_stats['export'] = {
+            'benchmarks': benchmarks,
+            'published': str(manifest_path) if manifest_path else None
+        }
+        return benchmarks, manifest_path
+
+    @staticmethod
+    def _artifact_size_mb(path):
+        """Size of an exported artifact (file or directory such as OpenVINO)"""
+        path = Path(path)
+        if path.is_dir():
+            return sum(f.stat().st_size for f in path.rglob("*") if f.is_file()) / (1024 * 1024)
+        return path.stat().st_size / (1024 * 1024) if path.exists() else 0
+
+    def distill(self, unlabeled_dir, student_model='yolo11n.pt', holdout_images_dir=None, teacher_conf=0.05,
+                label_conf=0.35, val_fraction=0.1, imgsz=640, custom_settings=None):
+        """
+        Knowledge-distillation mode: train a smaller student on the teacher's predictions.
+
+        The teacher (this trainer's base model) runs once over an unlabeled folder and its boxes,
+        scores and classes are cached; the student is then trained on the cached predictions.
+        ultralytics training has no soft-target loss, so the teacher's scores are not used as soft
+        targets: they are cut into hard pseudo-labels at label_conf (changing it needs no new teacher pass).
+        """
+        print(f"\n🎓 DISTILLATION: {Path(self.base_model_path).name} -> {Path(student_model).name}")
+        print("=" * 60)
+        
+        cache = self._cache_teacher_predictions(unlabeled_dir, teacher_conf, imgsz)
+        data_yaml_path = self._build_distillation_dataset(cache, unlabeled_dir, label_conf, val_fraction)
+        
+        # The student is its own training session (and its own registry entry)
+        student_trainer = OptimizedYOLOTrainer(student_model, self.project_root, self.target_class, self.auto_fix)
+        _, run_name = student_trainer.train_model(data_yaml_path, custom_settings=custom_settings)
+        student_path = student_trainer.save_best_model(run_name)
+        if not student_path:
+            print("❌ Student training produced no weights")
+            return None
+        
+        # Speedup on CPU and agreement with the teacher on the same images
+        sample_dir = holdout_images_dir or unlabeled_dir
+        benchmarks = self.benchmark_exports(self.base_model_path, {'student': student_path}, sample_dir,
+                                            imgsz=imgsz, conf_threshold=label_conf)
+        by_format = {b['format']: b for b in benchmarks}
+        teacher_bench, student_bench = by_format.get('pytorch'), by_format.get('student')
+        
+        summary = {
+            'teacher': str(self.base_model_path),
+            'student': str(student_path),
+            'student_session': student_trainer.timestamp,
+            'pseudo_labeled_images': int((cache['counts'] > 0).sum()),
+            'teacher_cache': str(cache['path']),
+            'speedup': teacher_bench['latency_ms_p50'] / student_bench['latency_ms_p50'] if teacher_bench and student_bench else None,
+            'teacher_agreement': student_bench['parity'] if student_bench else None
+        }
+        
+        # Accuracy delta against real labels when a labeled holdout is available
+        if holdout_images_dir and (Path(holdout_images_dir).parent / "labels").exists():
+            teacher_stats, _ = self.test_model(self.base_model_path, holdout_images_dir, conf_threshold=label_conf)
+            student_stats, _ = self.test_model(student_path, holdout_images_dir, conf_threshold=label_conf)
+            if 'map50_95' in teacher_stats and 'map50_95' in student_stats:
+                summary['teacher_map50_95'] = teacher_stats['map50_95']
+                summary['student_map50_95'] = student_stats['map50_95']
+                summary['map50_95_delta'] = student_stats['map50_95'] - teacher_stats['map50_95']
+        
+        self.training_stats['distillation'] = summary
+        
+        print(f"\n🎓 DISTILLATION RESULTS")
+        print(f"   Student: {student_path}")
+        if summary['speedup']:
+            print(f"   CPU speedup: {summary['speedup']:.2f}x "
+                  f"({teacher_bench['latency_ms_p50']:.1f} -> {student_bench['latency_ms_p50']:.1f} ms/img)")
+            print(f"   Agreement with teacher: {summary['teacher_agreement']:.1%}")
+        if 'map50_95_delta' in summary:
+            print(f"   mAP@.5:.95: {summary['teacher_map50_95']:.3f} -> {summary['student_map50_95']:.3f} "
+                  f"({summary['map50_95_delta']:+.3f})")
+        
+        return summary
+    
+    def _cache_teacher_predictions(self, image_dir, conf, imgsz):
+        """Run the teacher once over image_dir and cache boxes/scores/classes; reused while nothing changes"""
+        teacher = Path(self.base_model_path)
+        teacher_stat = teacher.stat()
+        images_digest, image_count = directory_digest(image_dir, IMAGE_EXTENSIONS)
+        key = hashlib.sha256(
+            f"{teacher.resolve()}:{teacher_stat.st_size}:{teacher_stat.st_mtime_ns}:{images_digest}:{conf}:{imgsz}".encode()
+        ).hexdigest()[:16]
+        
+        cache_dir = self.project_root / "distill_cache"
+        cache_dir.mkdir(parents=True, exist_ok=True)
+        cache_path = cache_dir / f"teacher_{teacher.stem}_{key}.npz"
+        
+        if cache_path.exists():
+            print(f"♻️  Reusing cached teacher predictions: {cache_path.name}")
+            with np.load(cache_path) as data:
+                cache = {k: data[k] for k in data.files}
+            cache['path'] = cache_path
+            return cache
+        
+        print(f"🧠 Teacher pass over {image_count} images (conf={conf})...")
+        teacher_model = YOLO(str(teacher))
+        names, counts, boxes, scores, classes = [], [], [], [], []
+        
+        for i, r in enumerate(teacher_model.predict(source=str(image_dir), conf=conf, imgsz=imgsz, stream=True,
+                                                    save=False, device=self.device, verbose=False), 1):
+            names.append(Path(r.path).name)
+            n = len(r.boxes) if r.boxes is not None else 0
+            counts.append(n)
+            if n:
+                boxes.append(r.boxes.xywhn.cpu().numpy().astype(np.float32))
+                scores.append(r.boxes.conf.cpu().numpy().astype(np.float32))
+                classes.append(r.boxes.cls.cpu().numpy().astype(np.int16))
+            if i % 1000 == 0:
+                print(f"   ⚡ {i}/{image_count} images")
+        
+        cache = {
+            'names': np.array(names),
+            'counts': np.array(counts, dtype=np.int32),
+            'boxes': np.concatenate(boxes) if boxes else np.zeros((0, 4), dtype=np.float32),
+            'scores': np.concatenate(scores) if scores else np.zeros(0, dtype=np.float32),
+            'classes': np.concatenate(classes) if classes else np.zeros(0, dtype=np.int16),
+            'class_names': np.array(json.dumps(teacher_model.names))
+        }
+        np.savez(cache_path, **cache)
+        cache['path'] = cache_path
+        print(f"💾 Teacher predictions cached: {cache_path}")
+        return cache
     
-    def test_model(self, model_path, test_images_dir, conf_threshold=0.35):
-        """Test the fine-tuned model"""
+    def _build_distillation_dataset(self, cache, image_dir, label_conf, val_fraction):
+        """
+        Materialize teacher predictions as a YOLO dataset of hard labels (boxes scoring >= label_conf).
+        Images are hard-linked, not copied. val always gets at least one image; with a single
+        pseudo-labeled image, train doubles as val.
+        """
+        out_dir = self.project_root / "distill_data" / Path(cache['path']).stem / f"conf{label_conf}"
+        class_names = {int(k): v for k, v in json.loads(str(cache['class_names'])).items()}
+        
+        offsets = np.concatenate(([0], np.cumsum(cache['counts'])))
+        keep = cache['scores'] >= label_conf
+        
+        # Split only images that get labels, so a small set cannot end up with an empty val split
+        kept_before = np.concatenate(([0], np.cumsum(keep)))
+        labeled = np.flatnonzero(kept_before[offsets[1:]] > kept_before[offsets[:-1]])
+        is_val = np.zeros(len(cache['names']), dtype=bool)
+        if len(labeled) > 1:
+            n_val = min(len(labeled) - 1, max(1, int(round(len(labeled) * val_fraction))))
+            is_val[np.random.default_rng(0).permutation(labeled)[:n_val]] = True
+        
+        for split in ('train', 'val'):
+            (out_dir / split / "images").mkdir(parents=True, exist_ok=True)
+            (out_dir / split / "labels").mkdir(parents=True, exist_ok=True)
+        
+        written = 0
+        for i, name in enumerate(cache['names']):
+            start, end = offsets[i], offsets[i + 1]
+            mask = keep[start:end]
+            if not mask.any():
+                continue
+            
+            split = 'val' if is_val[i] else 'train'
+            src = Path(image_dir) / str(name)
+            dst = out_dir / split / "images" / str(name)
+            if not dst.exists():
+                try:
+                    os.link(src, dst)
+                except OSError:
+                    shutil.copy2(src, dst)
+            
+            lines = [f"{c} {x:.6f} {y:.6f} {w:.6f} {h:.6f}\n"
+                     for c, (x, y, w, h) in zip(cache['classes'][start:end][mask], cache['boxes'][start:end][mask])]
+            with open(out_dir / split / "labels" / f"{Path(str(name)).stem}.txt", 'w') as f:
+                f.writelines(lines)
+            written += 1
+        
+        data_config = {
+            'train': str(out_dir / "train" / "images"),
+            'val': str(out_dir / ("val" if is_val.any() else "train") / "images"),
+            'nc': len(class_names),
+            'names': [class_names[i] for i in sorted(class_names)]
+        }
+        data_yaml_path = out_dir / "data.yaml"
+        with open(data_yaml_path, 'w') as f:
+            yaml.dump(data_config, f, default_flow_style=False)
+        
+        print(f"🏷️  Pseudo-labeled {written}/{len(cache['names'])} images (score >= {label_conf}) -> {out_dir}")
+        return data_yaml_path
+    
+    def test_model(self, model_path, test_images_dir, conf_threshold=0.35, labels_dir=None, save_images=False,
+                   eval_conf=0.001, batch_size=16):
+        """Evaluate the fine-tuned model: precision/recall/mAP against ground truth plus latency breakdown"""
         class_info = f" for class '{self.target_class}'" if self.target_class else ""
         print(f"\n🧪 TESTING FINE-TUNED MODEL{class_info}")
         print("="*40)
@@ -461,22 +907,29 @@ class OptimizedYOLOTrainer:
             print(f"❌ Test images directory not found: {test_images_dir}")
             return None
         
+        # Ground truth lives next to the images folder unless given explicitly
+        labels_dir = Path(labels_dir) if labels_dir else Path(test_images_dir).parent / "labels"
+        has_labels = labels_dir.exists()
+        
         # Count test images
         test_images = list(Path(test_images_dir).glob("*"))
         test_count = len([f for f in test_images if f.suffix.lower() in {'.jpg', '.jpeg', '.png', '.bmp'}])
         
         print(f"📸 Testing on {test_count} images")
         print(f"🎯 Confidence threshold: {conf_threshold}")
+        print(f"🏷️  Ground truth: {labels_dir if has_labels else 'not found - mAP skipped'}")
         
-        # Load model and run inference
-        model = YOLO(model_path)
+        # Pooled model (reused across test_model calls) and streamed predictions - nothing is kept in memory but per-box arrays
+        model = get_model(model_path, self.device)
         
         test_start = time.time()
         
         results = model.predict(
             source=test_images_dir,
-            conf=conf_threshold,
-            save=True,
+            conf=min(conf_threshold, eval_conf),  # Low threshold so mAP sees the full PR curve
+            stream=True,
+            batch=batch_size,
+            save=save_images,
             show=False,
             project=str(self.runs_dir),
             name=f"test_{self.target_class}_{self.timestamp}" if self.target_class else f"test_{self.timestamp}",
@@ -484,12 +937,48 @@ class OptimizedYOLOTrainer:
             verbose=False
         )
         
+        iou_thresholds = np.linspace(0.5, 0.95, 10)
+        speeds = {'preprocess': [], 'inference': [], 'postprocess': []}
+        tp_list, conf_list, pred_cls_list, target_cls_list = [], [], [], []
+        per_image = []
+        total_detections = 0
+        images_with_detections = 0
+        processed = 0
+        
+        for r in results:
+            processed += 1
+            for stage in speeds:
+                speeds[stage].append(r.speed.get(stage, 0.0))
+            
+            if r.boxes is not None and len(r.boxes) > 0:
+                pred_xyxy = r.boxes.xyxy.cpu().numpy()
+                pred_conf = r.boxes.conf.cpu().numpy()
+                pred_cls = r.boxes.cls.cpu().numpy().astype(int)
+            else:
+                pred_xyxy = np.zeros((0, 4), dtype=np.float32)
+                pred_conf = np.zeros(0, dtype=np.float32)
+                pred_cls = np.zeros(0, dtype=int)
+            
+            # Detection stats at the user's confidence threshold
+            n_confident = int((pred_conf >= conf_threshold).sum())
+            total_detections += n_confident
+            images_with_detections += n_confident > 0
+            
+            gt_cls, gt_xyxy = self._load_ground_truth(labels_dir / f"{Path(r.path).stem}.txt", r.orig_shape) if has_labels else (np.zeros(0, dtype=int), np.zeros((0, 4)))
+            per_image.append({'image': Path(r.path).name, 'detections': n_confident, 'ground_truth': len(gt_cls)})
+            
+            if has_labels:
+                tp_list.append(self._match_predictions(pred_xyxy, pred_cls, gt_xyxy, gt_cls, iou_thresholds))
+                conf_list.append(pred_conf)
+                pred_cls_list.append(pred_cls)
+                target_cls_list.append(gt_cls)
+            
+            if processed % 1000 == 0:
+                print(f"   ⚡ Evaluated {processed}/{test_count} images")
+        
         test_time = time.time() - test_start
         
         # Analyze results
-        total_detections = sum(len(r.boxes) if r.boxes is not None else 0 for r in results)
-        images_with_detections = sum(1 for r in results if r.boxes is not None and len(r.boxes) > 0)
-        
         detection_rate = (images_with_detections / test_count) * 100 if test_count > 0 else 0
         avg_detections_per_image = total_detections / test_count if test_count > 0 else 0
         inference_speed = test_count / test_time if test_time > 0 else 0
@@ -501,16 +990,66 @@ class OptimizedYOLOTrainer:
             'detection_rate': detection_rate,
             'avg_detections_per_image': avg_detections_per_image,
             'inference_time': test_time,
-            'inference_speed': inference_speed
+            'inference_speed': inference_speed,
+            'latency_ms': {
+                stage: {
+                    'p50': float(np.percentile(values, 50)),
+                    'p95': float(np.percentile(values, 95)),
+                    'p99': float(np.percentile(values, 99))
+                } for stage, values in speeds.items() if values
+            }
         }
         
+        if has_labels and tp_list:
+            test_stats.update(compute_detection_metrics(
+                np.concatenate(tp_list), np.concatenate(conf_list), np.concatenate(pred_cls_list),
+                np.concatenate(target_cls_list), conf_threshold
+            ))
+        
         print(f"📊 Test Results:")
         print(f"   Detection rate: {detection_rate:.1f}%")
         print(f"   Total detections: {total_detections}")
         print(f"   Avg detections/image: {avg_detections_per_image:.2f}")
+        if 'map50_95' in test_stats:
+            print(f"   Precision: {test_stats['precision']:.3f} | Recall: {test_stats['recall']:.3f}")
+            print(f"   mAP@.5: {test_stats['map50']:.3f} | mAP@.5:.95: {test_stats['map50_95']:.3f}")
         print(f"   Inference speed: {inference_speed:.1f} images/sec")
+        for stage, pct in test_stats['latency_ms'].items():
+            print(f"   {stage.capitalize():<12} p50 {pct['p50']:.1f} ms | p95 {pct['p95']:.1f} ms | p99 {pct['p99']:.1f} ms")
         
-        return test_stats, results
+        return test_stats, per_image
+    
+    @staticmethod
+    def _load_ground_truth(label_file, orig_shape):
+        """Read a YOLO label file as (classes, pixel xyxy boxes)"""
+        if not label_file.exists():
+            return np.zeros(0, dtype=int), np.zeros((0, 4))
+        
+        try:
+            labels = np.loadtxt(label_file, ndmin=2)
+        except ValueError:
+            return np.zeros(0, dtype=int), np.zeros((0, 4))
+        if labels.size == 0 or labels.shape[1] != 5:
+            return np.zeros(0, dtype=int), np.zeros((0, 4))
+        
+        h, w = orig_shape
+        xywh = labels[:, 1:5] * np.array([w, h, w, h])
+        xyxy = np.concatenate([xywh[:, :2] - xywh[:, 2:] / 2, xywh[:, :2] + xywh[:, 2:] / 2], axis=1)
+        return labels[:, 0].astype(int), xyxy
+    
+    @staticmethod
+    def _match_predictions(pred_xyxy, pred_cls, gt_xyxy, gt_cls, iou_thresholds):
+        """True-positive matrix (n_pred, n_iou) from class-aware one-to-one IoU matching"""
+        tp = np.zeros((len(pred_cls), len(iou_thresholds)), dtype=bool)
+        if len(pred_cls) == 0 or len(gt_cls) == 0:
+            return tp
+        
+        iou = box_iou(gt_xyxy, pred_xyxy)
+        iou[gt_cls[:, None] != pred_cls[None, :]] = 0
+        for i, threshold in enumerate(iou_thresholds):
+            matches = match_boxes(iou, threshold)
+            tp[matches[:, 1], i] = True
+        return tp
     
     def generate_comprehensive_report(self, test_stats=None):
         """Generate comprehensive training and testing report"""
@@ -542,15 +1081,9 @@ class OptimizedYOLOTrainer:
         # Generate text report with class-specific naming
         txt_report_path = self.reports_dir / f"training_report{class_suffix}_{self.timestamp}.txt"
         
-        with open(txt_report_path, 'w') as f:
-            class_title = f" - {self.target_class.upper()}" if self.target_class else ""
-            
-            # 1. Define the report file path FIRST
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        report_file = f"comprehensive_report_{timestamp}.txt"
-    
-            # 2. Then open and write to the file
-        with open(report_file, 'w', encoding='utf-8') as f:
+        class_title = f" - {self.target_class.upper()}" if self.target_class else ""
+        
+        with open(txt_report_path, 'w', encoding='utf-8') as f:
             f.write(f"🎯 YOLO FINE-TUNING COMPREHENSIVE REPORT{class_title}\n")
                 
             f.write("="*60 + "\n\n")
@@ -602,6 +1135,37 @@ class OptimizedYOLOTrainer:
                 f.write(f"Total Detections: {test_stats['total_detections']}\n")
                 f.write(f"Avg Detections/Image: {test_stats['avg_detections_per_image']:.2f}\n")
                 f.write(f"Inference Speed: {test_stats['inference_speed']:.1f} images/sec\n")
+                if 'map50_95' in test_stats:
+                    f.write(f"Precision: {test_stats['precision']:.3f}\n")
+                    f.write(f"Recall: {test_stats['recall']:.3f}\n")
+                    f.write(f"mAP@.5: {test_stats['map50']:.3f}\n")
+                    f.write(f"mAP@.5:.95: {test_stats['map50_95']:.3f}\n")
+                for stage, pct in test_stats.get('latency_ms', {}).items():
+                    f.write(f"{stage.capitalize()} latency: p50 {pct['p50']:.1f} ms, p95 {pct['p95']:.1f} ms, p99 {pct['p99']:.1f} ms\n")
+                f.write("\n")
+            
+            # Export Benchmark
+            export_stats = self.training_stats.get('export')
+            if export_stats and export_stats['benchmarks']:
+                f.write("📦 EXPORT BENCHMARK (CPU)\n")
+                f.write("-" * 30 + "\n")
+                for b in export_stats['benchmarks']:
+                    f.write(f"{b['format']}: p50 {b['latency_ms_p50']:.1f} ms, {b['throughput']:.1f} img/s, "
+                            f"{b['size_mb']:.1f} MB, parity {b['parity']:.1%}\n")
+                f.write(f"Published: {export_stats['published']}\n")
+                f.write("\n")
+            
+            # Distillation
+            distillation = self.training_stats.get('distillation')
+            if distillation:
+                f.write("🎓 DISTILLATION\n")
+                f.write("-" * 30 + "\n")
+                f.write(f"Student: {distillation['student']}\n")
+                if distillation['speedup']:
+                    f.write(f"CPU Speedup: {distillation['speedup']:.2f}x\n")
+                    f.write(f"Agreement with Teacher: {distillation['teacher_agreement']:.1%}\n")
+                if 'map50_95_delta' in distillation:
+                    f.write(f"mAP@.5:.95 Delta: {distillation['map50_95_delta']:+.3f}\n")
                 f.write("\n")
             
             # Performance Summary
@@ -611,11 +1175,28 @@ class OptimizedYOLOTrainer:
                 f.write(f"Overall Success: {'✅ Excellent' if test_stats['detection_rate'] > 90 else '🔄 Needs Improvement'}\n")
                 f.write(f"Training Efficiency: {test_stats['test_images']/(self.training_stats['total_time']/3600):.1f} test_images per training hour\n")
         
+        # Index the run so it can be compared across sessions (a reused run is already in the registry)
+        if not self.reused_run:
+            self._record_run(test_stats, json_report_path)
+        
         print(f"📊 Reports saved:")
         print(f"   JSON: {json_report_path}")
         print(f"   Text: {txt_report_path}")
+        print(f"   Registry: {self.registry.db_path}")
         
         return json_report_path, txt_report_path
+    
+    def _record_run(self, test_stats=None, report_json=None, status='completed'):
+        """Write this session to the run registry (never fails the pipeline)"""
+        results_csv = self.runs_dir / self.run_name / "results.csv" if self.run_name else None
+        try:
+            self.registry.record_run(
+                self.timestamp, self.training_stats, test_stats,
+                base_model=self.base_model_path, run_name=self.run_name, data_yaml=self.data_yaml_path,
+                report_json=report_json, status=status, results_csv=results_csv
+            )
+        except Exception as e:
+            print(f"⚠️  Could not update run registry: {e}")
 
 def quick_dataset_check(data_yaml_path):
     """Quick dataset structure checker - run this first!"""
@@ -701,6 +1282,13 @@ def main():
             print("🛑 Training cancelled. Please fix dataset issues first.")
             return
     
+    stats_choice = input(f"\n❓ Compute label statistics (class balance, box sizes)? (y/n): ").strip().lower()
+    if stats_choice == 'y':
+        dataset_stats = DatasetStatistics(data_yaml_path)
+        stats_results = dataset_stats.compute()
+        print_summary(stats_results)
+        print(f"🖼️  Statistics report: {dataset_stats.render_report(stats_results)}")
+    
     # Custom settings optimized for single-class training
     """custom_settings = None"""
     # In your main() function, replace custom_settings with:
@@ -775,6 +1363,17 @@ def main():
                 conf_threshold=0.35
             )
             
+            # Optional export stage: ONNX / OpenVINO / TorchScript with CPU benchmark
+            export_choice = input(f"\n📦 Export and benchmark deployment formats? (y/n): ").strip().lower()
+            if export_choice == 'y':
+                trainer.export_and_benchmark(
+                    best_model_path,
+                    test_images_dir,
+                    imgsz=custom_settings.get('imgsz', 640) if custom_settings else 640,
+                    int8=True,
+                    data_yaml_path=data_yaml_path
+                )
+            
             # Generate comprehensive report
             json_report, txt_report = trainer.generate_comprehensive_report(test_stats)
             
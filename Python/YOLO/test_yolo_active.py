@@ -0,0 +1,87 @@
+import json
+import os
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+
+from YOLO_ACTIVE import ActiveLearningSelector, box_count_entropy
+
+class FakeTensor:
+    """Just enough of a torch tensor for ActiveLearningSelector.record"""
+
+    def __init__(self, values):
+        self.values = np.asarray(values, dtype=np.float32)
+
+    def cpu(self):
+        return self
+
+    def numpy(self):
+        return self.values
+
+class FakeBoxes:
+
+    def __init__(self, scores):
+        self.conf = FakeTensor(scores)
+        self.xywhn = FakeTensor(np.tile([0.5, 0.5, 0.2, 0.2], (len(scores), 1)))
+
+    def __len__(self):
+        return len(self.conf.values)
+
+def fake_result(path, scores):
+    return SimpleNamespace(path=str(path), boxes=FakeBoxes(scores))
+
+class TestBoxCountEntropy:
+
+    def test_certain_counts_have_zero_entropy(self):
+        assert box_count_entropy(np.zeros(0)) == 0.0
+        assert box_count_entropy(np.array([1.0, 1.0])) == 0.0
+        assert box_count_entropy(np.array([0.0])) == 0.0
+
+    def test_coin_flip_is_maximal(self):
+        assert box_count_entropy(np.array([0.5])) == pytest.approx(1.0)
+
+    def test_hand_computed(self):
+        # Two boxes at 0.5: count is 0/1/2 with p = 1/4, 1/2, 1/4 -> 1.5 bits, normalized by log2(3)
+        assert box_count_entropy(np.array([0.5, 0.5])) == pytest.approx(1.5 / np.log2(3))
+
+    def test_confident_boxes_are_less_uncertain(self):
+        assert box_count_entropy(np.array([0.95, 0.9])) < box_count_entropy(np.array([0.5, 0.3]))
+
+class TestActiveLearningSelector:
+
+    @pytest.fixture
+    def selector(self, tmp_path):
+        selector = ActiveLearningSelector(initial_conf=0.4, retry_conf=0.08)
+        for name, scores in (('confident', [0.95, 0.9]), ('borderline', [0.45, 0.2, 0.1]),
+                             ('retry_only', [0.3]), ('empty', [])):
+            (tmp_path / f"{name}.jpg").write_bytes(b"x" * 1024)
+            selector.record(fake_result(tmp_path / f"{name}.jpg", scores))
+        return selector
+
+    def test_record_signals(self, selector, tmp_path):
+        borderline = selector.records[str(tmp_path / "borderline.jpg")]
+        assert borderline['boxes_initial'] == 1 and borderline['boxes_retry'] == 3
+        assert borderline['disagreement'] == pytest.approx(2 / 3)
+        assert borderline['max_conf'] == pytest.approx(0.45)
+        confident = selector.records[str(tmp_path / "confident.jpg")]
+        assert confident['disagreement'] == 0.0
+
+    def test_rank_most_uncertain_first(self, selector):
+        ranked = [os.path.basename(r['path']) for r in selector.rank()]
+        assert ranked[0] == 'retry_only.jpg'
+        assert ranked[-1] == 'confident.jpg'
+        scores = [r['score'] for r in selector.rank()]
+        assert scores == sorted(scores, reverse=True)
+
+    def test_record_again_replaces_entry(self, selector, tmp_path):
+        selector.record(fake_result(tmp_path / "empty.jpg", [0.99]))
+        assert len(selector.records) == 4
+        assert selector.records[str(tmp_path / "empty.jpg")]['max_conf'] == pytest.approx(0.99)
+
+    def test_export_respects_budget_and_size(self, selector, tmp_path):
+        output = tmp_path / "review.json"
+        assert selector.export_label_studio(output, budget=3, max_megabytes=2 / 1024) == 2
+        tasks = json.loads(output.read_text())
+        assert len(tasks) == 2
+        assert tasks[0]['data']['al_score'] >= tasks[1]['data']['al_score']
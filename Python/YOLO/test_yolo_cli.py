@@ -0,0 +1,103 @@
+import json
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+YOLO_DIR = Path(__file__).resolve().parent
+# Wall-clock startup limit in ms; only enforced when set, since timings are noisy on loaded machines
+STARTUP_BUDGET_MS = float(os.environ['YOLO_CLI_STARTUP_BUDGET_MS']) if os.environ.get('YOLO_CLI_STARTUP_BUDGET_MS') else None
+
+# Runs in a fresh interpreter: time the import, run one command, report which heavy modules got loaded
+PROBE = """
+import json, sys, time
+start = time.perf_counter()
+import YOLO_CLI
+import_ms = (time.perf_counter() - start) * 1000
+start = time.perf_counter()
+code = YOLO_CLI.main(sys.argv[1:]) if len(sys.argv) > 1 else 0
+command_ms = (time.perf_counter() - start) * 1000
+heavy = sorted(m for m in YOLO_CLI.HEAVY_MODULES if m in sys.modules)
+print(json.dumps({'import_ms': import_ms, 'command_ms': command_ms, 'code': code, 'heavy': heavy}))
+"""
+
+def run_probe(*args):
+    result = subprocess.run([sys.executable, "-c", PROBE, *map(str, args)], cwd=YOLO_DIR,
+                            capture_output=True, text=True, timeout=60)
+    assert result.returncode == 0, result.stderr
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+def check_startup_time(label, elapsed_ms):
+    print(f"{label}: {elapsed_ms:.1f} ms")
+    if STARTUP_BUDGET_MS is not None:
+        assert elapsed_ms < STARTUP_BUDGET_MS
+
+class TestYoloCli:
+
+    @pytest.fixture
+    def dataset(self, tmp_path):
+        """Tiny train/val dataset with one image missing its label"""
+        for split, count in (('train', 8), ('val', 2)):
+            (tmp_path / split / "images").mkdir(parents=True)
+            (tmp_path / split / "labels").mkdir(parents=True)
+            for i in range(count):
+                (tmp_path / split / "images" / f"{i}.jpg").write_bytes(b"jpg")
+                if i != 0:
+                    (tmp_path / split / "labels" / f"{i}.txt").write_text("0 0.5 0.5 0.2 0.2\n")
+        data_yaml = tmp_path / "data.yaml"
+        data_yaml.write_text(f"train: {tmp_path / 'train' / 'images'}\nval: {tmp_path / 'val' / 'images'}\n"
+                             f"nc: 1\nnames: ['face']\n")
+        return tmp_path, data_yaml
+
+    def test_import_is_fast_and_light(self):
+        """Importing the CLI must not pull in torch/ultralytics/cv2/matplotlib/numpy"""
+        probe = run_probe()
+        assert probe['heavy'] == []
+        check_startup_time("import", probe['import_ms'])
+
+    def test_index_starts_fast(self, dataset):
+        _, data_yaml = dataset
+        probe = run_probe("index", data_yaml)
+        assert probe['code'] == 0
+        assert probe['heavy'] == []
+        check_startup_time("import + index", probe['import_ms'] + probe['command_ms'])
+
+    @pytest.mark.parametrize("command", ["validate", "cut", "split", "merge"])
+    def test_file_only_commands_stay_light(self, dataset, command):
+        root, data_yaml = dataset
+        args = {
+            'validate': ["validate", data_yaml],
+            'cut': ["cut", "--images", root / "train" / "images", "--labels", root / "train" / "labels",
+                    "--dest", root / "unlabeled", "--plan", root / "cut_plan.jsonl"],
+            'split': ["split", "--train", root / "train", "--val", root / "val2", "--plan", root / "split_plan.jsonl"],
+            'merge': ["merge", root / "merged", root / "train" / "images", root / "val" / "images"],
+        }[command]
+        probe = run_probe(*args)
+        assert probe['heavy'] == []
+
+    def test_validate_reports_missing_labels(self, dataset):
+        _, data_yaml = dataset
+        assert run_probe("validate", data_yaml)['code'] == 1
+
+    def test_cut_plan_is_not_applied(self, dataset):
+        root, _ = dataset
+        plan_file = root / "cut_plan.jsonl"
+        run_probe("cut", "--images", root / "train" / "images", "--labels", root / "train" / "labels",
+                  "--dest", root / "unlabeled", "--plan", plan_file)
+
+        lines = plan_file.read_text().splitlines()
+        assert json.loads(lines[0])['plan'] == 'unmatched_images'
+        assert [json.loads(line)['src'] for line in lines[1:]] == [str(root / "train" / "images" / "0.jpg")]
+        assert (root / "train" / "images" / "0.jpg").exists()
+
+    def test_cut_yes_applies_with_journal(self, dataset):
+        root, _ = dataset
+        probe = run_probe("cut", "--images", root / "train" / "images", "--labels", root / "train" / "labels",
+                          "--dest", root / "unlabeled", "--yes")
+        assert probe['code'] == 0
+        assert (root / "unlabeled" / "0.jpg").exists()
+        journals = list((root / "unlabeled" / ".plans").glob("*.jsonl.journal"))
+        assert len(journals) == 1
+        assert json.loads(journals[0].read_text().splitlines()[0])['status'] == 'done'
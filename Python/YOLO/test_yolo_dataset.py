@@ -0,0 +1,57 @@
+import os
+
+import pytest
+
+from YOLO_DATASET import dataset_fingerprint
+
+class TestDatasetFingerprint:
+
+    @pytest.fixture
+    def dataset(self, tmp_path):
+        """Tiny train/val dataset"""
+        for split, count in (('train', 4), ('val', 2)):
+            (tmp_path / split / "images").mkdir(parents=True)
+            (tmp_path / split / "labels").mkdir(parents=True)
+            for i in range(count):
+                (tmp_path / split / "images" / f"{i}.jpg").write_bytes(b"jpg")
+                (tmp_path / split / "labels" / f"{i}.txt").write_text("0 0.5 0.5 0.2 0.2\n")
+        data_yaml = tmp_path / "data.yaml"
+        data_yaml.write_text(f"train: {tmp_path / 'train' / 'images'}\nval: {tmp_path / 'val' / 'images'}\n"
+                             f"nc: 1\nnames: ['face']\n")
+        return tmp_path, data_yaml
+
+    def test_stable_and_counts(self, dataset):
+        _, data_yaml = dataset
+        first = dataset_fingerprint(data_yaml)
+        assert dataset_fingerprint(data_yaml) == first
+        assert first['splits']['train']['images'] == 4
+        assert first['splits']['val']['labels'] == 2
+
+    def test_touched_file_changes_only_its_split(self, dataset):
+        root, data_yaml = dataset
+        before = dataset_fingerprint(data_yaml)
+        label = root / "train" / "labels" / "0.txt"
+        st = label.stat()
+        os.utime(label, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000_000))
+        after = dataset_fingerprint(data_yaml)
+        assert after['fingerprint'] != before['fingerprint']
+        assert after['splits']['train']['hash'] != before['splits']['train']['hash']
+        assert after['splits']['val'] == before['splits']['val']
+
+    def test_added_and_removed_files(self, dataset):
+        root, data_yaml = dataset
+        before = dataset_fingerprint(data_yaml)
+        (root / "val" / "images" / "new.jpg").write_bytes(b"jpg")
+        added = dataset_fingerprint(data_yaml)
+        assert added['fingerprint'] != before['fingerprint']
+        assert added['splits']['val']['images'] == 3
+        (root / "val" / "images" / "new.jpg").unlink()
+        # Files of other types are ignored
+        (root / "val" / "images" / "notes.md").write_text("ignored")
+        assert dataset_fingerprint(data_yaml)['fingerprint'] == before['fingerprint']
+
+    def test_data_yaml_change(self, dataset):
+        _, data_yaml = dataset
+        before = dataset_fingerprint(data_yaml)
+        data_yaml.write_text(data_yaml.read_text().replace("'face'", "'person'"))
+        assert dataset_fingerprint(data_yaml)['fingerprint'] != before['fingerprint']
@@ -0,0 +1,49 @@
+import numpy as np
+import pytest
+
+from YOLO_LEAKAGE import MultiIndexHash, popcount64
+
+def brute_force(queries, hashes, radius):
+    pairs = set()
+    for q, query in enumerate(queries.tolist()):
+        for t, value in enumerate(hashes.tolist()):
+            distance = bin(query ^ value).count('1')
+            if distance <= radius:
+                pairs.add((q, t, distance))
+    return pairs
+
+class TestMultiIndexHash:
+
+    @pytest.fixture
+    def codes(self):
+        """Random 64-bit codes plus queries planted at 0..10 bit flips from some of them"""
+        rng = np.random.default_rng(0)
+        hashes = rng.integers(0, 2**64, size=300, dtype=np.uint64)
+        queries = []
+        for flips in range(11):
+            for target in rng.choice(len(hashes), size=4, replace=False):
+                bits = rng.choice(64, size=flips, replace=False)
+                queries.append(int(hashes[target]) ^ sum(1 << int(b) for b in bits))
+        queries.extend(int(v) for v in rng.integers(0, 2**64, size=50, dtype=np.uint64))
+        return hashes, np.array(queries, dtype=np.uint64)
+
+    @pytest.mark.parametrize("radius", [0, 1, 3, 4, 6, 8])
+    @pytest.mark.parametrize("chunks", [2, 4])
+    def test_query_matches_brute_force(self, codes, radius, chunks):
+        hashes, queries = codes
+        index = MultiIndexHash(hashes, chunks=chunks)
+        q_idx, t_idx, distance = index.query(queries, radius, batch_size=17)
+        found = list(zip(q_idx.tolist(), t_idx.tolist(), distance.tolist()))
+        assert len(found) == len(set(found))
+        assert set(found) == brute_force(queries, hashes, radius)
+
+    def test_duplicate_codes_and_empty_result(self):
+        hashes = np.array([5, 5, 1 << 63], dtype=np.uint64)
+        q_idx, t_idx, distance = MultiIndexHash(hashes).query(np.array([5], dtype=np.uint64), 0)
+        assert sorted(t_idx.tolist()) == [0, 1] and distance.tolist() == [0, 0]
+        q_idx, _, _ = MultiIndexHash(hashes).query(np.array([(1 << 40) - 1], dtype=np.uint64), 2)
+        assert len(q_idx) == 0
+
+    def test_popcount64(self):
+        values = np.array([0, 1, 2**64 - 1, 0xF0F0], dtype=np.uint64)
+        assert popcount64(values).tolist() == [0, 1, 64, 8]
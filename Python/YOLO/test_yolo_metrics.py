@@ -0,0 +1,67 @@
+import numpy as np
+import pytest
+
+from YOLO_METRICS import box_iou, compute_detection_metrics, match_boxes
+
+class TestBoxMatching:
+
+    def test_box_iou_hand_computed(self):
+        gt = [[0, 0, 10, 10], [20, 20, 30, 30]]
+        pred = [[0, 0, 10, 10], [5, 0, 15, 10], [100, 100, 110, 110]]
+        iou = box_iou(gt, pred)
+        assert iou.shape == (2, 3)
+        assert iou[0, 0] == pytest.approx(1.0)
+        assert iou[0, 1] == pytest.approx(50 / 150)
+        assert iou[1].tolist() == [0, 0, 0]
+        assert iou[:, 2].tolist() == [0, 0]
+
+    def test_box_iou_empty_and_degenerate(self):
+        assert box_iou(np.zeros((0, 4)), [[0, 0, 1, 1]]).shape == (0, 1)
+        assert box_iou([[5, 5, 5, 5]], [[5, 5, 5, 5]])[0, 0] == 0
+
+    def test_match_boxes_is_one_to_one_best_first(self):
+        iou = np.array([[0.9, 0.6, 0.0],
+                        [0.8, 0.0, 0.0],
+                        [0.0, 0.55, 0.4]])
+        pairs = match_boxes(iou, 0.5)
+        assert sorted(map(tuple, pairs.tolist())) == [(0, 0), (2, 1)]
+        assert len(set(pairs[:, 0])) == len(pairs) and len(set(pairs[:, 1])) == len(pairs)
+
+    def test_match_boxes_threshold(self):
+        iou = np.array([[0.5, 0.2]])
+        assert match_boxes(iou, 0.5).tolist() == [[0, 0]]
+        assert len(match_boxes(iou, 0.75)) == 0
+
+class TestDetectionMetrics:
+
+    def test_perfect_detections(self):
+        tp = np.ones((3, 10), dtype=bool)
+        metrics = compute_detection_metrics(tp, np.array([0.9, 0.8, 0.7]), np.zeros(3), np.zeros(3), 0.5)
+        assert metrics['precision'] == 1.0 and metrics['recall'] == 1.0
+        assert metrics['map50'] == pytest.approx(1.0)
+        assert metrics['map50_95'] == pytest.approx(1.0)
+
+    def test_hand_computed_ap(self):
+        """2 ground-truth boxes; predictions TP, FP, TP by confidence, the last one only at IoU < .75"""
+        tp = np.zeros((3, 10), dtype=bool)
+        tp[0] = True
+        tp[2, :5] = True
+        # Deliberately out of confidence order
+        conf = np.array([0.7, 0.9, 0.8])
+        tp = tp[[2, 0, 1]]
+        metrics = compute_detection_metrics(tp, conf, np.zeros(3), np.zeros(2), 0.75)
+
+        # 101-point interpolation: precision 1 up to recall .5 (51 points), then 2/3 (or 0 at strict IoU)
+        ap_loose = (51 + 50 * 2 / 3) / 101
+        ap_strict = 51 / 101
+        assert metrics['map50'] == pytest.approx(ap_loose)
+        assert metrics['map50_95'] == pytest.approx((ap_loose + ap_strict) / 2)
+        assert metrics['precision'] == pytest.approx(0.5)
+        assert metrics['recall'] == pytest.approx(0.5)
+        assert metrics['ground_truth_boxes'] == 2
+
+    def test_classes_averaged_and_missed_class_scores_zero(self):
+        tp = np.ones((1, 10), dtype=bool)
+        metrics = compute_detection_metrics(tp, np.array([0.9]), np.array([0]), np.array([0, 1]), 0.5)
+        assert metrics['map50'] == pytest.approx(0.5)
+        assert metrics['recall'] == pytest.approx(0.5)
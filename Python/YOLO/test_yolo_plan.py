@@ -0,0 +1,95 @@
+import json
+import os
+
+import pytest
+
+from YOLO_PLAN import Plan, apply_plan, default_plan_path, plan_restore, plan_unmatched_images
+
+class TestApplyPlan:
+
+    @pytest.fixture
+    def workspace(self, tmp_path):
+        """A plan moving four images and deleting one file"""
+        src, dst = tmp_path / "images", tmp_path / "unmatched"
+        src.mkdir()
+        for i in range(4):
+            (src / f"{i}.jpg").write_bytes(b"jpg")
+        (src / "junk.tmp").write_text("junk")
+        plan = Plan('test')
+        for i in range(4):
+            plan.add('move', src / f"{i}.jpg", dst / f"{i}.jpg")
+        plan.add('delete', src / "junk.tmp")
+        plan_path = plan.write(tmp_path / "plan.jsonl")
+        return src, dst, plan_path
+
+    def test_plan_round_trip(self, workspace):
+        _, _, plan_path = workspace
+        plan = Plan.load(plan_path)
+        assert len(plan) == 5
+        assert plan.summary() == {'move': 4, 'delete': 1}
+        with pytest.raises(ValueError):
+            plan.add('copy', "a", "b")
+
+    def test_apply(self, workspace):
+        src, dst, plan_path = workspace
+        result = apply_plan(plan_path, workers=4)
+        assert (result['done'], result['skipped'], result['failed']) == (5, 0, 0)
+        assert sorted(os.listdir(dst)) == ['0.jpg', '1.jpg', '2.jpg', '3.jpg']
+        assert os.listdir(src) == []
+
+    def test_resume_skips_journaled_and_already_applied(self, workspace):
+        src, dst, plan_path = workspace
+        dst.mkdir()
+        # An interrupted run: #0 finished and was journaled, #1 ran but crashed before journaling,
+        # #2 failed and must be retried
+        os.replace(src / "0.jpg", dst / "0.jpg")
+        os.replace(src / "1.jpg", dst / "1.jpg")
+        with open(f"{plan_path}.journal", 'w', encoding='utf-8') as f:
+            f.write(json.dumps({'id': 0, 'status': 'done', 'error': None}) + "\n")
+            f.write(json.dumps({'id': 2, 'status': 'failed', 'error': "PermissionError"}) + "\n")
+        # A new file at #0's source proves the journaled operation is not run again
+        (src / "0.jpg").write_bytes(b"new")
+
+        result = apply_plan(plan_path, workers=4)
+        assert (result['done'], result['skipped'], result['failed']) == (3, 2, 0)
+        assert (src / "0.jpg").read_bytes() == b"new"
+        assert sorted(os.listdir(dst)) == ['0.jpg', '1.jpg', '2.jpg', '3.jpg']
+        assert not (src / "junk.tmp").exists()
+
+        # Everything is journaled now, so a third run does nothing
+        again = apply_plan(plan_path, workers=4)
+        assert (again['done'], again['skipped'], again['failed']) == (0, 5, 0)
+
+    def test_existing_destination_fails_without_overwrite(self, workspace):
+        _, dst, plan_path = workspace
+        dst.mkdir()
+        (dst / "3.jpg").write_bytes(b"other")
+        result = apply_plan(plan_path, workers=4)
+        assert result['failed'] == 1
+        assert result['errors'][0][0] == 3 and 'FileExistsError' in result['errors'][0][2]
+        assert (dst / "3.jpg").read_bytes() == b"other"
+
+    def test_default_plan_path_keeps_journal_out_of_restore(self, tmp_path):
+        images, dest = tmp_path / "images", tmp_path / "unlabeled"
+        images.mkdir()
+        (images / "a.jpg").write_bytes(b"img")
+        plan, _, _ = plan_unmatched_images(images, tmp_path / "labels", dest)
+        plan_path = plan.write(default_plan_path(plan, dest))
+        assert plan_path.parent == dest / ".plans"
+        assert apply_plan(plan, plan_path)['done'] == 1
+        assert os.path.exists(f"{plan_path}.journal")
+        # The .plans folder is not moved back by a restore
+        assert [os.path.basename(op['src']) for op in plan_restore(dest, images).ops] == ['a.jpg']
+
+    def test_plan_unmatched_images(self, tmp_path):
+        images, labels = tmp_path / "images", tmp_path / "labels"
+        images.mkdir()
+        labels.mkdir()
+        for name in ("a.jpg", "b.png", "c.jpg"):
+            (images / name).write_bytes(b"img")
+        (labels / "a.txt").write_text("0 0.5 0.5 0.1 0.1\n")
+        plan, total, matched = plan_unmatched_images(images, labels, tmp_path / "unmatched")
+        assert (total, matched) == (3, 1)
+        assert sorted(os.path.basename(op['src']) for op in plan.ops) == ['b.png', 'c.jpg']
+        # Planning never touches the filesystem
+        assert sorted(os.listdir(images)) == ['a.jpg', 'b.png', 'c.jpg']
@@ -0,0 +1,71 @@
+import sqlite3
+
+import pytest
+
+from YOLO_REGISTRY import RunRegistry
+
+def training_stats(train_images=100, total_time=50.0, **extra):
+    return {'target_class': 'happy', 'total_time': total_time, 'epochs_completed': 10,
+            'dataset_fingerprint': 'abc123', 'train_config': {'epochs': 10, 'imgsz': 640},
+            'class_distribution': {'train_images': train_images, 'val_images': 20}, **extra}
+
+class TestRunRegistry:
+
+    @pytest.fixture
+    def registry(self, tmp_path):
+        return RunRegistry(tmp_path / "reports" / "run_registry.db")
+
+    def test_round_trip_with_epoch_metrics(self, registry, tmp_path):
+        results_csv = tmp_path / "results.csv"
+        results_csv.write_text("  epoch,  metrics/mAP50-95(B),  train/box_loss\n"
+                               "1,0.20,1.5\n2,0.35,1.1\n")
+        registry.record_run("20240101_120000", training_stats(), {'map50_95': 0.4, 'inference_speed': 90.0},
+                            base_model="yolo11s.pt", run_name="finetune_happy", results_csv=results_csv)
+
+        run = registry.get_run("20240101_120000")
+        assert run['status'] == 'completed'
+        assert run['base_model'] == "yolo11s.pt"
+        assert run['train_throughput'] == pytest.approx(100 * 10 / 50.0)
+        assert run['map50_95'] == pytest.approx(0.4)
+        epochs = registry.epoch_metrics("20240101_120000")
+        assert [epoch for epoch, _ in epochs] == [1, 2]
+        assert epochs[1][1]['metrics/mAP50-95(B)'] == pytest.approx(0.35)
+
+        config_json = run['config_json']
+        assert [r['session'] for r in registry.find_runs('abc123', config_json)] == ["20240101_120000"]
+        assert registry.find_runs('abc123', '{}') == []
+
+    def test_record_run_updates_existing_session(self, registry):
+        registry.record_run("s1", training_stats(), status='failed')
+        registry.record_run("s1", training_stats(), {'map50_95': 0.5})
+        runs = registry.runs()
+        assert len(runs) == 1
+        assert runs[0]['status'] == 'completed' and runs[0]['map50_95'] == pytest.approx(0.5)
+
+    def test_regressions(self, registry):
+        registry.record_run("s1", training_stats(), {'map50_95': 0.50, 'inference_speed': 100.0})
+        registry.record_run("s2", training_stats(), {'map50_95': 0.505, 'inference_speed': 95.0})
+        registry.record_run("s3", training_stats(total_time=80.0), {'map50_95': 0.45, 'inference_speed': 96.0})
+        registry.record_run("s4", training_stats(), {'map50_95': 0.10}, status='failed')
+
+        flagged = {(prev, cur, metric) for prev, cur, metric, _, _ in registry.regressions()}
+        assert flagged == {("s2", "s3", 'train_throughput'), ("s2", "s3", 'map50_95')}
+
+    def test_validation_cache(self, registry):
+        assert registry.get_validation('abc123') is None
+        registry.record_validation('abc123', 'data.yaml', {'train_images': 100})
+        result = registry.get_validation('abc123')
+        assert result['train_images'] == 100
+        assert 'validated_at' in result
+
+    def test_connections_are_closed(self, registry, monkeypatch):
+        opened = []
+        connect = sqlite3.connect
+        monkeypatch.setattr(sqlite3, 'connect', lambda *args, **kwargs: opened.append(connect(*args, **kwargs)) or opened[-1])
+        registry.record_run("s1", training_stats())
+        registry.runs()
+        registry.get_validation('abc123')
+        assert len(opened) == 3
+        for conn in opened:
+            with pytest.raises(sqlite3.ProgrammingError):
+                conn.execute("SELECT 1")
@@ -0,0 +1,78 @@
+import os
+import tarfile
+
+import pytest
+
+from YOLO_SHARDS import ShardReader, ShardWriter, pack_folder
+
+class TestShards:
+
+    @pytest.fixture
+    def samples(self):
+        """(split, name, image bytes, label bytes or None) with sizes that straddle tar block boundaries"""
+        return [
+            ('train', 'a.jpg', os.urandom(700), b"0 0.5 0.5 0.2 0.2\n"),
+            ('train', 'b.png', os.urandom(512), None),
+            ('val', 'c.jpg', os.urandom(1500), b"0 0.1 0.1 0.1 0.1\n0 0.9 0.9 0.1 0.1\n"),
+            ('train', 'd.jpg', os.urandom(1), b""),
+            ('test', 'e.jpg', os.urandom(2048), b"0 0.3 0.3 0.3 0.3\n"),
+        ]
+
+    def test_round_trip_across_shards(self, tmp_path, samples):
+        # ~2 KB shards force several tar files
+        with ShardWriter(tmp_path / "shards", shard_size_mb=2 / 1024) as writer:
+            for split, name, image, label in samples:
+                writer.add(split, name, image, label)
+
+        with ShardReader(tmp_path / "shards") as reader:
+            assert len(reader) == len(samples)
+            assert len(reader.manifest['shards']) > 1
+            assert reader.manifest['splits'] == {'train': 3, 'val': 1, 'test': 1}
+            for i, (_, name, image, label) in enumerate(samples):
+                assert reader.name(i) == name
+                assert bytes(reader.image_bytes(i)) == image
+                assert reader.label_text(i) == (label.decode() if label is not None else None)
+
+            train = [(name, bytes(data), text) for name, data, text in reader.iter_split('train')]
+            assert [name for name, _, _ in train] == ['a.jpg', 'b.png', 'd.jpg']
+            assert train[1] == ('b.png', samples[1][2], None)
+
+    def test_shards_are_plain_tar(self, tmp_path, samples):
+        with ShardWriter(tmp_path / "shards") as writer:
+            for split, name, image, label in samples:
+                writer.add(split, name, image, label)
+        with tarfile.open(tmp_path / "shards" / "shard-00000.tar") as tar:
+            assert tar.extractfile("val/images/c.jpg").read() == samples[2][2]
+            assert tar.extractfile("val/labels/c.txt").read() == samples[2][3]
+
+    def test_pack_folder_and_unpack(self, tmp_path, samples):
+        image_dir, label_dir = tmp_path / "src" / "images", tmp_path / "src" / "labels"
+        image_dir.mkdir(parents=True)
+        label_dir.mkdir(parents=True)
+        for _, name, image, label in samples:
+            (image_dir / name).write_bytes(image)
+            if label is not None:
+                (label_dir / f"{os.path.splitext(name)[0]}.txt").write_bytes(label)
+        (image_dir / "notes.txt").write_text("not an image")
+
+        with ShardWriter(tmp_path / "shards") as writer:
+            assert pack_folder(writer, 'train', image_dir, label_dir, workers=2) == len(samples)
+
+        with ShardReader(tmp_path / "shards") as reader:
+            assert reader.unpack(tmp_path / "out", 'train') == len(samples)
+        for _, name, image, label in samples:
+            assert (tmp_path / "out" / "images" / name).read_bytes() == image
+            label_path = tmp_path / "out" / "labels" / f"{os.path.splitext(name)[0]}.txt"
+            assert label_path.exists() == (label is not None)
+
+    def test_views_are_only_valid_until_close(self, tmp_path, samples):
+        with ShardWriter(tmp_path / "shards") as writer:
+            writer.add(*samples[0])
+        reader = ShardReader(tmp_path / "shards")
+        view = reader.image_bytes(0)
+        copied = bytes(view)
+        with pytest.raises(BufferError):
+            reader.close()
+        view.release()
+        reader.close()
+        assert copied == samples[0][2]